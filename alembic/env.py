@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -20,6 +21,19 @@ from app.models.contacts import Contact
 
 target_metadata = Base.metadata
 
+# Секції contacts_p00..contacts_p15 (міграція f1b6e0d4a873) існують лише в
+# PostgreSQL і не мають моделей - без цього фільтра autogenerate пропонує їх
+# видалити разом з індексами. Первинний ключ (owner_id, id) секціонованої
+# таблиці модель не описує: SQLite генерує id лише для одноколонкового
+# INTEGER PRIMARY KEY, а autogenerate первинні ключі не порівнює.
+CONTACT_PARTITION_NAME = re.compile(r"^contacts_p\d{2}$")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not CONTACT_PARTITION_NAME.match(name)
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -42,6 +56,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -65,7 +80,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
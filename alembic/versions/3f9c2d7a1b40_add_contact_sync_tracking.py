@@ -0,0 +1,54 @@
+"""Add contact change tracking for delta sync
+
+Revision ID: 3f9c2d7a1b40
+Revises: ca1e9a07c99d
+Create Date: 2025-10-02 10:14:32.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d7a1b40'
+down_revision: Union[str, None] = 'ca1e9a07c99d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('sync_seq', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_contacts_owner_sync_seq', 'contacts', ['owner_id', 'sync_seq'], unique=False)
+
+    op.create_table(
+        'contact_sync_state',
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    op.create_table(
+        'contact_tombstones',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('sync_seq', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_contact_tombstones_owner_sync_seq', 'contact_tombstones', ['owner_id', 'sync_seq'], unique=False)
+
+    # Існуючі контакти вважаємо першою зміною кожного власника
+    op.execute("UPDATE contacts SET sync_seq = 1")
+    op.execute("""
+        INSERT INTO contact_sync_state (owner_id, change_seq)
+        SELECT DISTINCT owner_id, 1 FROM contacts
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_tombstones_owner_sync_seq', table_name='contact_tombstones')
+    op.drop_table('contact_tombstones')
+    op.drop_table('contact_sync_state')
+    op.drop_index('ix_contacts_owner_sync_seq', table_name='contacts')
+    op.drop_column('contacts', 'sync_seq')
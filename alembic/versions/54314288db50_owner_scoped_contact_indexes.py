@@ -0,0 +1,46 @@
+"""Replace single-column contact indexes with owner-scoped composites
+
+Revision ID: 54314288db50
+Revises: 8e41b6c05d2f
+Create Date: 2025-10-20 09:31:47.402611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '54314288db50'
+down_revision: Union[str, None] = '8e41b6c05d2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS - база, ініціалізована свіжим init.sql, вже має ці індекси.
+    # Вирази днів народження мають збігатися з тими, що генерує extract()
+    # у _upcoming_birthdays_filter, інакше планувальник індекс не візьме
+    op.execute("CREATE INDEX IF NOT EXISTS ix_contacts_owner_name ON contacts (owner_id, last_name, first_name, id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_contacts_owner_id ON contacts (owner_id, id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_contacts_owner_birthday "
+        "ON contacts (owner_id, EXTRACT(month FROM birth_date), EXTRACT(day FROM birth_date))"
+    )
+
+    # Пошук іде по ILIKE '%...%' в межах власника - ці індекси його не обслуговують
+    op.drop_index('ix_contacts_first_name', table_name='contacts')
+    op.drop_index('ix_contacts_last_name', table_name='contacts')
+    # Дублює первинний ключ
+    op.drop_index('ix_contacts_id', table_name='contacts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_contacts_id', 'contacts', ['id'], unique=False)
+    op.create_index('ix_contacts_last_name', 'contacts', ['last_name'], unique=False)
+    op.create_index('ix_contacts_first_name', 'contacts', ['first_name'], unique=False)
+
+    op.drop_index('ix_contacts_owner_birthday', table_name='contacts')
+    op.drop_index('ix_contacts_owner_id', table_name='contacts')
+    op.drop_index('ix_contacts_owner_name', table_name='contacts')
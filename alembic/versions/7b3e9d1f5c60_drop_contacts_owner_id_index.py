@@ -0,0 +1,29 @@
+"""Drop redundant (owner_id, id) contact index
+
+Revision ID: 7b3e9d1f5c60
+Revises: d2c6f09b7e3a
+Create Date: 2025-11-05 10:41:09.263518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d1f5c60'
+down_revision: Union[str, None] = 'd2c6f09b7e3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Секціонована таблиця має первинний ключ (owner_id, id), звичайна - id:
+    # get_contact знаходить рядок по ключу, а список власника читається з
+    # ix_contacts_owner_name. На секціонованій таблиці DROP прибирає і індекси секцій
+    op.execute("DROP INDEX IF EXISTS ix_contacts_owner_id")
+
+
+def downgrade() -> None:
+    op.create_index('ix_contacts_owner_id', 'contacts', ['owner_id', 'id'], unique=False)
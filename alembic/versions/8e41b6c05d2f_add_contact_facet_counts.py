@@ -0,0 +1,52 @@
+"""Add per-owner contact facet counters
+
+Revision ID: 8e41b6c05d2f
+Revises: 3f9c2d7a1b40
+Create Date: 2025-10-06 15:42:08.530117
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.contacts import contact_initial
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41b6c05d2f'
+down_revision: Union[str, None] = '3f9c2d7a1b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.create_table(
+        'contact_facet_counts',
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('initial', sa.String(length=1), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    # Початкове заповнення лічильників з існуючих контактів. Літеру рахує
+    # contact_initial, як і CRUD: upper() у SQL інакше обробляє "ß" і не-ASCII
+    counts = Counter()
+    rows = op.get_bind().execute(
+        sa.text("SELECT owner_id, last_name FROM contacts").execution_options(yield_per=BATCH_SIZE)
+    )
+    for owner_id, last_name in rows:
+        counts[(owner_id, contact_initial(last_name))] += 1
+
+    facets = sa.table('contact_facet_counts', sa.column('owner_id'), sa.column('initial'), sa.column('count'))
+    if counts:
+        op.bulk_insert(facets, [
+            {'owner_id': owner_id, 'initial': initial, 'count': count}
+            for (owner_id, initial), count in sorted(counts.items())
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('contact_facet_counts')
@@ -0,0 +1,28 @@
+"""Track pruned contact tombstones for delta sync
+
+Revision ID: a4d7e2c95b18
+Revises: f1b6e0d4a873
+Create Date: 2025-11-03 09:27:51.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e2c95b18'
+down_revision: Union[str, None] = 'f1b6e0d4a873'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tombstones старші за термін зберігання видаляються; клієнт з since
+    # нижче pruned_seq отримує 410 і синхронізується повністю
+    op.add_column('contact_sync_state', sa.Column('pruned_seq', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('contact_sync_state', 'pruned_seq')
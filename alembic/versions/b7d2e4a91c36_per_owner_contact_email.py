@@ -0,0 +1,33 @@
+"""Make contact email unique per owner, case-insensitive
+
+Revision ID: b7d2e4a91c36
+Revises: 54314288db50
+Create Date: 2025-10-21 14:08:19.662047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4a91c36'
+down_revision: Union[str, None] = '54314288db50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ціль ON CONFLICT у create_contact/create_contacts - вираз має збігатися дослівно
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_contacts_owner_email "
+        "ON contacts (owner_id, lower(email))"
+    )
+    op.drop_index('ix_contacts_email', table_name='contacts')
+
+
+def downgrade() -> None:
+    # Впаде, якщо той самий email вже є у кількох власників
+    op.create_index('ix_contacts_email', 'contacts', ['email'], unique=True)
+    op.drop_index('uq_contacts_owner_email', table_name='contacts')
@@ -0,0 +1,33 @@
+"""Add owner shard assignments for contact sharding
+
+Revision ID: c3a8f51e7d92
+Revises: e5a1c8f04b27
+Create Date: 2025-10-23 10:14:37.661902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a8f51e7d92'
+down_revision: Union[str, None] = 'e5a1c8f04b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Явні розміщення власників; решту шардів визначає кільце хешів
+    op.create_table(
+        'owner_shard_assignments',
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('shard', sa.String(length=50), nullable=False),
+        sa.Column('moving', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('owner_shard_assignments')
@@ -0,0 +1,31 @@
+"""Allocate contact ids globally for shards
+
+Revision ID: d2c6f09b7e3a
+Revises: a4d7e2c95b18
+Create Date: 2025-11-04 13:05:22.719384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c6f09b7e3a'
+down_revision: Union[str, None] = 'a4d7e2c95b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Рядок лічильника створює перше виділення ID з урахуванням наявних на шардах
+    op.create_table(
+        'contact_id_allocator',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('contact_id_allocator')
@@ -0,0 +1,55 @@
+"""Store user tokens as SHA-256 digests behind partial indexes
+
+Revision ID: e5a1c8f04b27
+Revises: b7d2e4a91c36
+Create Date: 2025-10-22 11:26:53.207418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c8f04b27'
+down_revision: Union[str, None] = 'b7d2e4a91c36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_COLUMNS = ('verification_token', 'reset_password_token')
+
+
+def upgrade() -> None:
+    # Дайджест токена з уже відправленого листа - посилання продовжують працювати
+    for column in TOKEN_COLUMNS:
+        op.execute(
+            f"UPDATE users SET {column} = encode(sha256(convert_to({column}, 'UTF8')), 'hex') "
+            f"WHERE {column} IS NOT NULL"
+        )
+        op.alter_column('users', column, type_=sa.String(length=64), existing_type=sa.String(length=255))
+
+    op.create_index(
+        'ix_users_verification_token', 'users', ['verification_token'],
+        postgresql_where=sa.text('verification_token IS NOT NULL')
+    )
+    op.create_index(
+        'ix_users_reset_password_token', 'users', ['reset_password_token'],
+        postgresql_where=sa.text('reset_password_token IS NOT NULL')
+    )
+    # Для прибиральника прострочених токенів
+    op.create_index(
+        'ix_users_reset_password_expires', 'users', ['reset_password_expires'],
+        postgresql_where=sa.text('reset_password_token IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_reset_password_expires', table_name='users')
+    op.drop_index('ix_users_reset_password_token', table_name='users')
+    op.drop_index('ix_users_verification_token', table_name='users')
+
+    # Дайджести не обертаються назад у токени - видані посилання стають недійсними
+    for column in TOKEN_COLUMNS:
+        op.alter_column('users', column, type_=sa.String(length=255), existing_type=sa.String(length=64))
+        op.execute(f"UPDATE users SET {column} = NULL WHERE {column} IS NOT NULL")
@@ -0,0 +1,48 @@
+"""Recount contact facet counters with contact_initial
+
+Revision ID: e8c4a1f7b92d
+Revises: 7b3e9d1f5c60
+Create Date: 2025-11-18 10:21:47.305216
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.contacts import contact_initial
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4a1f7b92d'
+down_revision: Union[str, None] = '7b3e9d1f5c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    # Перше заповнення (8e41b6c05d2f) рахувало літеру через upper() у SQL, що
+    # розходиться з contact_initial для "ß" і не-ASCII прізвищ (SQLite) -
+    # перераховуємо лічильники тією ж функцією, що й CRUD
+    counts = Counter()
+    rows = op.get_bind().execute(
+        sa.text("SELECT owner_id, last_name FROM contacts").execution_options(yield_per=BATCH_SIZE)
+    )
+    for owner_id, last_name in rows:
+        counts[(owner_id, contact_initial(last_name))] += 1
+
+    facets = sa.table('contact_facet_counts', sa.column('owner_id'), sa.column('initial'), sa.column('count'))
+    op.execute(facets.delete())
+    if counts:
+        op.bulk_insert(facets, [
+            {'owner_id': owner_id, 'initial': initial, 'count': count}
+            for (owner_id, initial), count in sorted(counts.items())
+        ])
+
+
+def downgrade() -> None:
+    # Перераховані лічильники коректні і для попередньої ревізії
+    pass
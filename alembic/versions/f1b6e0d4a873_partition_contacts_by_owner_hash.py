@@ -0,0 +1,143 @@
+"""Hash-partition contacts by owner_id
+
+Revision ID: f1b6e0d4a873
+Revises: c3a8f51e7d92
+Create Date: 2025-10-24 09:52:11.084317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6e0d4a873'
+down_revision: Union[str, None] = 'c3a8f51e7d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTACT_PARTITIONS = 16
+COPY_BATCH_SIZE = 50000
+
+COLUMNS = (
+    'first_name', 'last_name', 'email', 'phone_number',
+    'birth_date', 'additional_data', 'sync_seq'
+)
+
+# Ті самі індекси, що в моделі Contact (owner_id у кожному - запити йдуть в одну секцію)
+INDEXES = {
+    'ix_contacts_owner_sync_seq': 'INDEX {name} ON {table} (owner_id, sync_seq)',
+    'ix_contacts_owner_name': 'INDEX {name} ON {table} (owner_id, last_name, first_name, id)',
+    'ix_contacts_owner_id': 'INDEX {name} ON {table} (owner_id, id)',
+    'uq_contacts_owner_email': 'UNIQUE INDEX {name} ON {table} (owner_id, lower(email))',
+    'ix_contacts_owner_birthday': (
+        'INDEX {name} ON {table} '
+        '(owner_id, EXTRACT(month FROM birth_date), EXTRACT(day FROM birth_date))'
+    ),
+}
+
+
+def _create_indexes(table: str, suffix: str) -> None:
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE {definition.format(name=name + suffix, table=table)}")
+
+
+def _swap_in(new_table: str, suffix: str) -> None:
+    """Замінює contacts на new_table (виконується під ACCESS EXCLUSIVE)"""
+    # Послідовність ID переходить до нової таблиці, інакше DROP її видалить
+    op.execute(f"ALTER SEQUENCE contacts_id_seq OWNED BY {new_table}.id")
+    op.execute("DROP TABLE contacts")
+    op.execute(f"ALTER TABLE {new_table} RENAME TO contacts")
+    op.execute(f"ALTER TABLE contacts RENAME CONSTRAINT {new_table}_pkey TO contacts_pkey")
+    op.execute(f"ALTER TABLE contacts RENAME CONSTRAINT {new_table}_owner_id_fkey TO contacts_owner_id_fkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name}{suffix} RENAME TO {name}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        # Секціонування - можливість PostgreSQL, SQLite лишається з однією таблицею
+        return
+
+    # Первинний ключ секціонованої таблиці мусить містити ключ секціонування
+    op.execute("""
+        CREATE TABLE contacts_partitioned (
+            LIKE contacts INCLUDING DEFAULTS,
+            CONSTRAINT contacts_partitioned_pkey PRIMARY KEY (owner_id, id),
+            CONSTRAINT contacts_partitioned_owner_id_fkey FOREIGN KEY (owner_id) REFERENCES users (id)
+        ) PARTITION BY HASH (owner_id)
+    """)
+    for remainder in range(CONTACT_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE contacts_p{remainder:02d} PARTITION OF contacts_partitioned "
+            f"FOR VALUES WITH (MODULUS {CONTACT_PARTITIONS}, REMAINDER {remainder})"
+        )
+    # Індекси на порожній таблиці - пізніше CREATE INDEX блокував би дзеркальні записи
+    _create_indexes('contacts_partitioned', '_p')
+
+    # Поки йде копіювання, застосунок пише в contacts, а тригер дзеркалить зміни.
+    # Видалені ID запам'ятовуються: пакет, прочитаний до видалення, може
+    # повернути рядок - такі рядки прибираються під час заміни
+    op.execute("CREATE UNLOGGED TABLE contacts_partition_deleted (id integer PRIMARY KEY)")
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS)
+    op.execute(f"""
+        CREATE FUNCTION contacts_mirror_to_partitioned() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM contacts_partitioned WHERE owner_id = OLD.owner_id AND id = OLD.id;
+                INSERT INTO contacts_partition_deleted (id) VALUES (OLD.id) ON CONFLICT DO NOTHING;
+                RETURN OLD;
+            END IF;
+            INSERT INTO contacts_partitioned SELECT NEW.*
+            ON CONFLICT (owner_id, id) DO UPDATE SET {assignments};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER contacts_mirror_to_partitioned
+        AFTER INSERT OR UPDATE OR DELETE ON contacts
+        FOR EACH ROW EXECUTE FUNCTION contacts_mirror_to_partitioned()
+    """)
+
+    bind = op.get_bind()
+    # Кожен пакет - окрема транзакція: таблиця не блокується на весь перенос
+    with op.get_context().autocommit_block():
+        low, high = bind.execute(sa.text("SELECT min(id), max(id) FROM contacts")).one()
+        if low is not None:
+            for start in range(low, high + 1, COPY_BATCH_SIZE):
+                bind.execute(sa.text(
+                    "INSERT INTO contacts_partitioned SELECT * FROM contacts "
+                    "WHERE id >= :start AND id < :stop ON CONFLICT DO NOTHING"
+                ), {"start": start, "stop": start + COPY_BATCH_SIZE})
+
+    # Коротка заміна: записи чекають лише на неї
+    op.execute("LOCK TABLE contacts IN ACCESS EXCLUSIVE MODE")
+    op.execute("""
+        DELETE FROM contacts_partitioned p
+        USING contacts_partition_deleted d
+        WHERE p.id = d.id
+    """)
+    op.execute("DROP TRIGGER contacts_mirror_to_partitioned ON contacts")
+    op.execute("DROP FUNCTION contacts_mirror_to_partitioned()")
+    op.execute("DROP TABLE contacts_partition_deleted")
+    _swap_in('contacts_partitioned', '_p')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("LOCK TABLE contacts IN ACCESS EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TABLE contacts_plain (
+            LIKE contacts INCLUDING DEFAULTS,
+            CONSTRAINT contacts_plain_pkey PRIMARY KEY (id),
+            CONSTRAINT contacts_plain_owner_id_fkey FOREIGN KEY (owner_id) REFERENCES users (id)
+        )
+    """)
+    op.execute("INSERT INTO contacts_plain SELECT * FROM contacts")
+    _create_indexes('contacts_plain', '_plain')
+    # Секції видаляються разом з батьківською таблицею
+    _swap_in('contacts_plain', '_plain')
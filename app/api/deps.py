@@ -1,11 +1,44 @@
+from typing import Generator, Optional
+from fastapi import Request
+from sqlalchemy import event
+from app.database.connection import SessionLocal, replicas
+from app.database.replicas import pin_primary_reads, reads_pinned_to_primary
+from app.utils.auth import verify_token
 
-from typing import Generator
-from app.database.connection import SessionLocal
 
+def request_subject(request: Request) -> Optional[str]:
+    """Email з Bearer токена запиту (без звернення до бази)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return verify_token(token)
 
-def get_db() -> Generator:
+
+def get_db(request: Request) -> Generator:
     db = SessionLocal()
+    if replicas:
+        # Після запису автора його читання на час вікна йдуть на primary
+        subject = request_subject(request)
+        if subject:
+            event.listen(db, "after_commit", lambda session: pin_primary_reads(subject))
     try:
         yield db
     finally: 
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db(request: Request) -> Generator:
+    """Сесія для читаючих endpoints: репліка, якщо вона є і автор нещодавно не писав"""
+    connection = None
+    if replicas and not reads_pinned_to_primary(request_subject(request)):
+        connection = replicas.connect()
+    
+    db = SessionLocal(bind=connection) if connection is not None else SessionLocal()
+    # Репліка може відставати від версії кешу - endpoints не кешують таких читань
+    db.info["replica"] = connection is not None
+    try:
+        yield db
+    finally:
+        db.close()
+        if connection is not None:
+            connection.close()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 
 from app.api.deps import get_db
@@ -7,20 +8,56 @@ from app.schemas.users import UserCreate, UserLogin, Token, UserResponse
 from app.models.users import UserRole
 from app.crud.users import (
     get_user_by_email, 
-    get_user_by_username,
-    create_user, 
+    register_user,
+    registration_conflict,
     authenticate_user,
-    verify_user_email
+    verify_user_email,
+    refresh_verification_token
 )
-from app.utils.auth import create_access_token
-from app.services.email import send_verification_email
+from app.utils.auth import create_access_token, generate_verification_token, get_password_hash
 from app.config import settings
+from app.database.replicas import pin_primary_reads
 from app.schemas.users import PasswordResetRequest, PasswordResetConfirm, PasswordResetResponse
 from app.crud.users import create_password_reset_token, reset_user_password, verify_reset_token
-from app.services.email import send_password_reset_email
 
 router = APIRouter()
 
+# fastapi_mail імпортується лише при першій відправці - в фоновій задачі, не при старті
+async def send_verification_email(email: str, token: str):
+    from app.services import email
+    await email.send_verification_email(email, token)
+
+async def send_password_reset_email(email: str, token: str):
+    from app.services import email
+    await email.send_password_reset_email(email, token)
+
+async def _register(user: UserCreate, background_tasks: BackgroundTasks, db: Session):
+    """Спільна реєстрація: bcrypt у пулі потоків, у базу - один INSERT"""
+    # bcrypt навмисно повільний - не тримаємо ним event loop
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
+    # У базі зберігається тільки дайджест, тож сирий токен для листа лишається тут
+    verification_token = generate_verification_token()
+    
+    db_user = register_user(db, user, hashed_password, verification_token)
+    if db_user is None:
+        conflict = registration_conflict(db, user.email, user.username)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username already taken" if conflict == "username" else "Email already registered"
+        )
+    
+    # Новий користувач може ще не дійти до реплік, коли прийде його перший запит
+    pin_primary_reads(db_user.email)
+    
+    # Відправка email для верифікації в фоновому режимі
+    background_tasks.add_task(
+        send_verification_email, 
+        db_user.email, 
+        verification_token
+    )
+    
+    return db_user
+
 @router.post("/register", response_model=UserResponse, status_code=201)
 async def register(
     user: UserCreate, 
@@ -28,35 +65,11 @@ async def register(
     db: Session = Depends(get_db)
 ):
     """Реєстрація нового користувача"""
-    # Перевірка чи користувач вже існує
-    if get_user_by_email(db, email=user.email):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
-    
-    if get_user_by_username(db, username=user.username):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Username already taken"
-        )
-    
     # Заборона створення адміністраторів через публічну реєстрацію
     if user.role == UserRole.ADMIN:
         user.role = UserRole.USER
     
-    # Створення користувача
-    db_user = create_user(db=db, user=user)
-    
-    # Відправка email для верифікації в фоновому режимі
-    if db_user.verification_token:
-        background_tasks.add_task(
-            send_verification_email, 
-            db_user.email, 
-            db_user.verification_token
-        )
-    
-    return db_user
+    return await _register(user, background_tasks, db)
 
 @router.post("/register-admin", response_model=UserResponse, status_code=201)
 async def register_admin(
@@ -65,34 +78,10 @@ async def register_admin(
     db: Session = Depends(get_db)
 ):
     """Реєстрація адміністратора (спеціальний endpoint)"""
-    # Перевірка чи користувач вже існує
-    if get_user_by_email(db, email=user.email):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered"
-        )
-    
-    if get_user_by_username(db, username=user.username):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Username already taken"
-        )
-    
     # Примусово встановлюємо роль admin
     user.role = UserRole.ADMIN
     
-    # Створення користувача-адміністратора
-    db_user = create_user(db=db, user=user)
-    
-    # Відправка email для верифікації в фоновому режимі
-    if db_user.verification_token:
-        background_tasks.add_task(
-            send_verification_email, 
-            db_user.email, 
-            db_user.verification_token
-        )
-    
-    return db_user
+    return await _register(user, background_tasks, db)
 
 @router.post("/login", response_model=Token)
 def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
@@ -116,12 +105,16 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 @router.get("/verify-email")
 def verify_email(token: str, db: Session = Depends(get_db)):
     """Верифікація email користувача"""
-    if not verify_user_email(db, token):
+    user = verify_user_email(db, token)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired verification token"
         )
     
+    # Запит без Bearer токена - get_db не закріпить читання сам, а репліка
+    # ще може віддавати неверифікованого користувача в get_current_user
+    pin_primary_reads(user.email)
     return {"message": "Email verified successfully"}
 
 @router.post("/resend-verification")
@@ -141,12 +134,13 @@ async def resend_verification_email(
             detail="Email already verified"
         )
     
-    if user.verification_token:
-        background_tasks.add_task(
-            send_verification_email,
-            user.email,
-            user.verification_token
-        )
+    # Старий токен не відновити з дайджесту - видаємо новий
+    verification_token = refresh_verification_token(db, user)
+    background_tasks.add_task(
+        send_verification_email,
+        user.email,
+        verification_token
+    )
     
     return {"message": "If email exists, verification email has been sent"}
 
@@ -158,14 +152,15 @@ async def forgot_password(
 ):
     """Запит скидання пароля"""
     # Створюємо токен скидання пароля
-    user = create_password_reset_token(db, password_reset.email)
+    issued = create_password_reset_token(db, password_reset.email)
     
-    # Відправляємо email навіть якщо користувач не знайдений (для безпеки)
-    if user and user.reset_password_token:
+    # Відповідь однакова, навіть якщо користувач не знайдений (для безпеки)
+    if issued:
+        user, reset_token = issued
         background_tasks.add_task(
             send_password_reset_email,
             user.email,
-            user.reset_password_token
+            reset_token
         )
     
     # Завжди повертаємо успішну відповідь (не розкриваємо чи email існує)
@@ -188,6 +183,8 @@ def reset_password(
             detail="Invalid or expired reset token"
         )
     
+    # Як і у verify-email: наступні запити користувача читають його з реплік
+    pin_primary_reads(user.email)
     return PasswordResetResponse(message="Password reset successfully")
 
 @router.get("/verify-reset-token")
@@ -1,22 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
+from datetime import date
+from urllib.parse import urlencode
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.crud.contacts import (  # виправлено імпорт
     get_contact,
-    get_contacts,
     create_contact,
+    create_contacts,
     update_contact,
     delete_contact,
-    get_contacts_with_upcoming_birthdays
+    get_contact_changes,
+    get_contact_rows,
+    get_upcoming_birthday_rows,
+    get_contact_facets,
+    count_contacts,
+    CONTACT_RESPONSE_FIELDS
 )
 from app.middleware.auth import get_current_verified_user
 from app.models.users import User
-from app.schemas.contacts import ContactCreate, ContactUpdate, ContactResponse
+from app.schemas.contacts import (
+    CONTACT_FIELD_NORMALIZERS,
+    ContactCreate,
+    ContactUpdate,
+    ContactResponse,
+    ContactPartialResponse,
+    ContactChangesResponse,
+    ContactBulkCreate,
+    ContactBulkResponse
+)
+from app.services.cache_utils import contacts_cache_key
+from app.services.redis import redis_service
+from app.utils.serialization import ORJSONResponse, rows_to_json
 
 router = APIRouter()
 
+def parse_contact_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Розбір параметра fields= (id повертається завжди, порядок як у ContactResponse)"""
+    if not fields:
+        return None
+    
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(CONTACT_RESPONSE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    
+    requested.add("id")
+    return tuple(field for field in CONTACT_RESPONSE_FIELDS if field in requested)
+
 @router.post("/", response_model=ContactResponse, status_code=201)
 def create_contact_endpoint(
     contact: ContactCreate, 
@@ -24,33 +60,100 @@ def create_contact_endpoint(
     current_user: User= Depends(get_current_verified_user) 
 ):
     """Створити новий контакт"""
-    try:
-        return create_contact(db=db, contact=contact, owner_id=current_user.id)
-    except Exception as e:
-        if "unique constraint" in str(e).lower():
-            raise HTTPException(status_code=400, detail="Email is already in the system")
-        raise HTTPException(status_code=400, detail="Error creating contact")
+    db_contact = create_contact(db=db, contact=contact, owner_id=current_user.id)
+    if db_contact is None:
+        raise HTTPException(status_code=400, detail="Email is already in the system")
+    return db_contact
+
+@router.post("/bulk", response_model=ContactBulkResponse, status_code=201)
+def create_contacts_endpoint(
+    payload: ContactBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_verified_user)
+):
+    """Створити пакет контактів (email-и, що вже є у власника, повертаються в duplicates)"""
+    created, duplicates = create_contacts(db, contacts=payload.contacts, owner_id=current_user.id)
+    return {
+        "created": [dict(zip(CONTACT_RESPONSE_FIELDS, row)) for row in created],
+        "duplicates": duplicates
+    }
 
-@router.get("/", response_model=List[ContactResponse])
+@router.get("/", response_model=List[ContactPartialResponse])
 def read_contacts(
     skip: int = Query(0, ge=0, description="Amount of queries for skipping"),
     limit: int = Query(100, ge=1, le=500, description="Max amount of records"),
     search: Optional[str] = Query(None, description="Search with a name or email"),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated subset of contact fields to return, e.g. first_name,last_name (id is always included)"
+    ),
+    include_total: bool = Query(False, description="Add X-Total-Count header"),
+    include_facets: bool = Query(False, description="Add X-Facet-Counts header with per-initial counts (URL-encoded, e.g. A=3&B=1)"),
+    db: Session = Depends(get_read_db),
     current_user: User= Depends(get_current_verified_user) 
 ):
     """Отримати список контактів"""
-    contacts = get_contacts(db, owner_id=current_user.id, skip=skip, limit=limit, search=search)
-    return contacts
+    selected_fields = parse_contact_fields(fields)
+    cache_key = contacts_cache_key(
+        current_user.id, "list",
+        skip=skip, limit=limit, search=search, fields=",".join(selected_fields or ())
+    )
+    payload = redis_service.get_response_cache(cache_key) if cache_key else None
+    
+    if payload is None:
+        rows = get_contact_rows(
+            db, owner_id=current_user.id, skip=skip, limit=limit, search=search, fields=selected_fields
+        )
+        payload = rows_to_json(rows, selected_fields or CONTACT_RESPONSE_FIELDS, CONTACT_FIELD_NORMALIZERS)
+        # Відстала репліка поклала б старі рядки під ключ нової версії
+        if cache_key and not db.info.get("replica"):
+            redis_service.set_response_cache(cache_key, payload)
+    
+    response = ORJSONResponse(payload)
+    if include_total:
+        total, exact = count_contacts(db, owner_id=current_user.id, search=search)
+        response.headers["X-Total-Count"] = str(total)
+        if not exact:
+            response.headers["X-Total-Count-Estimated"] = "true"
+    if include_facets:
+        facets = get_contact_facets(db, owner_id=current_user.id)
+        # Заголовки тільки latin-1, тому літери (кирилиця) кодуються як query string
+        response.headers["X-Facet-Counts"] = urlencode(facets)
+    return response
 
 @router.get("/birthdays/", response_model=List[ContactResponse])
-def read_upcoming_birthdays(db: Session = Depends(get_db), current_user: User= Depends(get_current_verified_user) ):
+def read_upcoming_birthdays(db: Session = Depends(get_read_db), current_user: User= Depends(get_current_verified_user) ):
     """Отримати контакти з днями народження на найближчі 7 днів"""
-    contacts = get_contacts_with_upcoming_birthdays(db, owner_id=current_user.id)
-    return contacts
+    cache_key = contacts_cache_key(current_user.id, "birthdays", day=date.today().isoformat())
+    if cache_key:
+        cached = redis_service.get_response_cache(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
+    
+    rows = get_upcoming_birthday_rows(db, owner_id=current_user.id)
+    payload = rows_to_json(rows, CONTACT_RESPONSE_FIELDS, CONTACT_FIELD_NORMALIZERS)
+    if cache_key and not db.info.get("replica"):
+        redis_service.set_response_cache(cache_key, payload)
+    return ORJSONResponse(payload)
+
+@router.get("/changes", response_model=ContactChangesResponse)
+def read_contact_changes(
+    since: int = Query(0, ge=0, description="Last change sequence known to the client (0 = full sync)"),
+    db: Session = Depends(get_read_db),
+    current_user: User= Depends(get_current_verified_user)
+):
+    """Отримати зміни контактів після номера since (дельта-синхронізація)"""
+    changes = get_contact_changes(db, owner_id=current_user.id, since=since)
+    if changes is None:
+        raise HTTPException(
+            status_code=410,
+            detail="Changes since this sequence are no longer available, sync with since=0"
+        )
+    current_seq, upserts, deleted_ids = changes
+    return {"current_seq": current_seq, "upserts": upserts, "deleted_ids": deleted_ids}
 
 @router.get("/{contact_id}", response_model=ContactResponse)
-def read_contact(contact_id: int, db: Session = Depends(get_db), current_user: User= Depends(get_current_verified_user)):
+def read_contact(contact_id: int, db: Session = Depends(get_read_db), current_user: User= Depends(get_current_verified_user)):
     """Отримати контакт за ID"""
     db_contact = get_contact(db, contact_id=contact_id, owner_id=current_user.id)
     if db_contact is None:
@@ -65,12 +168,15 @@ def update_contact_endpoint(
     current_user: User= Depends(get_current_verified_user)
 ):
     """Оновити контакт"""
-    db_contact = update_contact(
-        db, 
-        contact_id=contact_id, 
-        contact_update=contact_update,
-        owner_id=current_user.id
-        )
+    try:
+        db_contact = update_contact(
+            db, 
+            contact_id=contact_id, 
+            contact_update=contact_update,
+            owner_id=current_user.id
+            )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Email is already in the system")
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found!")
     return db_contact
@@ -1,12 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.middleware.auth import (
     get_current_verified_user, 
     get_current_admin_user
 )
-from app.middleware.rate_limiter import limiter, get_rate_limit_for_me
 from app.schemas.users import UserResponse, UserUpdate, UserRoleUpdate
 from app.crud.users import (
     update_user, 
@@ -21,17 +20,25 @@ from app.models.users import User, UserRole
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-@limiter.limit(get_rate_limit_for_me())
 def read_users_me(
-    request: Request,
     current_user: User = Depends(get_current_verified_user)
 ):
-    """Отримання інформації про поточного користувача (з rate limiting)"""
+    """Отримання інформації про поточного користувача (rate limit - RateLimitMiddleware)"""
     return current_user
 
 
 # === Маршрути ТІЛЬКИ ДЛЯ АДМІНІСТРАТОРІВ ===
 
+@router.get("/", response_model=List[UserResponse])
+def read_users(
+    skip: int = Query(0, ge=0, description="Amount of users for skipping"),
+    limit: int = Query(100, ge=1, le=500, description="Max amount of users"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Список користувачів (тільки для адміністраторів)"""
+    return get_all_users(db, skip=skip, limit=limit)
+
 @router.post("/me/avatar", response_model=UserResponse)
 async def upload_user_avatar(
     file: UploadFile = File(...),
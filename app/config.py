@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings 
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # Database
@@ -8,6 +8,19 @@ class Settings(BaseSettings):
     db_name: str = "contacts_db"
     db_user: str = "contacts_user"
     db_password: str = "contacts_password"
+    db_pool_size: int = 5  # Постійних з'єднань у пулі engine
+    db_max_overflow: int = 10  # Додаткових з'єднань понад db_pool_size під навантаженням
+    db_pool_min_size: int = 0  # Скільки з'єднань відкрити під час прогріву при старті
+    
+    # Read replicas (ті ж облікові дані, що й у primary)
+    db_replica_hosts: str = ""  # "host:port,host:port" - порожньо означає читати з primary
+    db_replica_retry_seconds: int = 30  # Скільки недоступна репліка виключена з ротації
+    read_your_writes_seconds: int = 5  # Вікно читань з primary після запису того ж користувача
+    
+    # Шардинг контактів за owner_id
+    contact_shards: str = ""  # "name=url,name=url" - порожньо означає контакти в основній базі
+    contact_shard_vnodes: int = 64  # Віртуальних вузлів на шард у кільці хешів
+    contact_shard_drain_seconds: float = 2.0  # Пауза перенесення власника на завершення запитів
     
     # Application
     app_name: str = "Contact Management API"
@@ -33,14 +46,83 @@ class Settings(BaseSettings):
     
     # Rate Limiting (додаємо нове поле)
     rate_limit_me_endpoint: int = 10
+    rate_limit_enabled: bool = True
+    rate_limit_policies: str = ""  # "[METHOD ]path[*]=N/period,..." - додатково до /users/me
 
     # Redis Configuration
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_password: Optional[str] = None
+    redis_max_connections: int = 50  # Розмір пулу з'єднань Redis
+    redis_pool_min_size: int = 0  # Скільки з'єднань Redis відкрити під час прогріву
+    redis_retry_seconds: int = 30  # Пауза перед повторним підключенням до недоступного Redis
     cache_expire_minutes: int = 15  # Час життя кешу користувача
-    
+    contacts_cache_expire_seconds: int = 300  # Час життя кешу списків контактів
+
+    # Metrics
+    metrics_enabled: bool = True  # Prometheus метрики та ендпоінт /metrics
+
+    # Adaptive concurrency limit (AIMD)
+    concurrency_limit_enabled: bool = True
+    concurrency_initial_limit: int = 50  # Стартовий ліміт одночасних запитів на процес
+    concurrency_min_limit: int = 5
+    concurrency_max_limit: int = 500
+    concurrency_latency_target_ms: int = 1000  # Повільніші відповіді зменшують ліміт
+    concurrency_backoff_ratio: float = 0.9  # Множник ліміту при перевантаженні
+    concurrency_retry_after_seconds: int = 1
+    concurrency_priority_paths: str = "/health,/metrics"  # Не обмежуються
+    concurrency_route_budgets: str = "/api/v1/contacts/bulk=0.2,/api/v1/users/me/avatar=0.2"  # Частка ліміту для важких маршрутів
+
+    # Response compression
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd,br,gzip"  # Порядок переваги; br і zstd - якщо встановлені brotli/zstandard
+    compression_minimum_size: int = 1024  # Менші відповіді не стискаються (байт)
+    compression_content_types: str = "application/json,text/,application/xml"  # Префікси media type
+    compression_gzip_level: int = 6  # 1-9
+    compression_brotli_quality: int = 4  # 0-11
+    compression_zstd_level: int = 3  # 1-22
+    compression_thread_threshold: int = 65536  # Більші тіла стискаються в пулі потоків (байт)
+
+    # HTTP caching
+    http_cache_enabled: bool = True
+    http_cache_paths: str = "/,/health,/openapi.json,/docs,/redoc"  # Рендеряться один раз при старті
+    http_cache_revalidate_paths: str = "/health"  # Cache-Control: no-cache (перевірка ETag на кожен запит)
+    http_cache_max_age: int = 300  # max-age інших кешованих шляхів (секунд)
+
+    # SQL Profiling
+    sql_profiling_enabled: bool = False  # Профілювати SQL кожного запиту
+    sql_profiling_header_enabled: bool = False  # Дозволити профілювання за заголовком X-Profile-SQL
+    sql_profiling_n_plus_one_threshold: int = 3  # Скільки повторів однієї форми запиту вважати N+1
+
+    # Tracing (OpenTelemetry)
+    tracing_enabled: bool = False
+    tracing_exporter: str = "memory"  # memory | file | console | otlp
+    tracing_file_path: str = "traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_sample_ratio: float = 0.1  # Частка запитів, що трасуються
+    tracing_service_name: str = "contacts-api"
+
+    # Token sweeper
+    reset_token_sweep_interval_seconds: int = 3600  # Як часто очищати прострочені токени скидання (0 - вимкнено)
+    reset_token_sweep_batch_size: int = 1000  # Рядків users в одному UPDATE прибиральника
+
+    # Delta sync
+    contact_tombstone_retention_days: int = 90  # Скільки зберігати tombstones видалених контактів (0 - без обмеження)
+
+    # Production server (serve.py: gunicorn + uvicorn workers)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0  # 0 - 2 * CPU + 1
+    server_keepalive_seconds: int = 5  # Скільки тримати keep-alive з'єднання без запитів
+    server_backlog: int = 2048  # Черга з'єднань, що очікують accept
+    server_max_requests: int = 10000  # Перезапуск воркера після N запитів (0 - ніколи)
+    server_max_requests_jitter: int = 1000  # Випадковий додаток, щоб воркери не перезапускались разом
+    server_graceful_timeout_seconds: int = 30  # Час на завершення запитів при зупинці воркера
+    server_timeout_seconds: int = 60  # Завислий воркер перезапускається після цього часу
+    server_preload_app: bool = False  # Імпортувати застосунок у master до fork
+    prometheus_multiproc_dir: str = ""  # Каталог метрик воркерів (порожньо - тимчасовий)
+
     @property
     def redis_url(self) -> str:
         if self.redis_password:
@@ -51,6 +133,23 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
+    @property
+    def contact_shard_urls(self) -> Dict[str, str]:
+        shards = {}
+        for entry in filter(None, (entry.strip() for entry in self.contact_shards.split(","))):
+            name, _, url = entry.partition("=")
+            shards[name.strip()] = url.strip()
+        return shards
+    
+    @property
+    def database_replica_urls(self) -> List[str]:
+        urls = []
+        for host in filter(None, (entry.strip() for entry in self.db_replica_hosts.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.db_port}"
+            urls.append(f"postgresql://{self.db_user}:{self.db_password}@{host}/{self.db_name}")
+        return urls
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
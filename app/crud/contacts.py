@@ -1,10 +1,83 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, extract
-from app.models.contacts import Contact
+from sqlalchemy import or_, and_, extract, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app.models.contacts import (
+    Contact,
+    ContactSyncState,
+    ContactTombstone,
+    ContactFacetCount,
+    contact_initial
+)
+from app.config import settings
 from app.schemas.contacts import ContactCreate, ContactUpdate
-from datetime import date, timedelta
+from app.database.sharding import owner_sharded, shard_contact_ids
+from app.services.cache_utils import invalidate_contacts_cache
+from app.services.tracing import traced
+from datetime import date, datetime, timedelta, timezone
+import json
 
+def _dialect_insert(db: Session):
+    """insert() діалекту сесії - з ON CONFLICT (PostgreSQL і SQLite)"""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+def _next_change_seq(db: Session, owner_id: int, count: int = 1) -> int:
+    """
+    Видає наступний номер зміни власника (рядок лічильника блокується до commit).
+    
+    З count > 1 резервує count номерів поспіль і повертає останній з них.
+    Перший запис власника - той самий upsert, тож два паралельні перші
+    записи не падають з IntegrityError: другий чекає commit першого.
+    """
+    return db.execute(
+        _dialect_insert(db)(ContactSyncState).values(
+            owner_id=owner_id, change_seq=count
+        ).on_conflict_do_update(
+            index_elements=[ContactSyncState.owner_id],
+            set_={"change_seq": ContactSyncState.change_seq + count}
+        ).returning(ContactSyncState.change_seq)
+    ).scalar_one()
+
+def _prune_tombstones(db: Session, owner_id: int):
+    """
+    Видаляє tombstones власника, старші за contact_tombstone_retention_days.
+    
+    Найбільший видалений номер зміни зберігається в pruned_seq: клієнт з
+    since < pruned_seq міг пропустити видалення і має синхронізуватись повністю.
+    """
+    retention_days = settings.contact_tombstone_retention_days
+    if retention_days <= 0:
+        return
+    
+    pruned_seq = db.query(func.max(ContactTombstone.sync_seq)).filter(
+        ContactTombstone.owner_id == owner_id,
+        ContactTombstone.deleted_at < datetime.now(timezone.utc) - timedelta(days=retention_days)
+    ).scalar()
+    if pruned_seq is None:
+        return
+    
+    db.query(ContactTombstone).filter(
+        ContactTombstone.owner_id == owner_id,
+        ContactTombstone.sync_seq <= pruned_seq
+    ).delete(synchronize_session=False)
+    db.query(ContactSyncState).filter(
+        ContactSyncState.owner_id == owner_id
+    ).update({ContactSyncState.pruned_seq: pruned_seq}, synchronize_session=False)
+
+def _adjust_facet_count(db: Session, owner_id: int, initial: str, delta: int):
+    """Змінює лічильник фасету власника на delta (upsert, рядок блокується до commit)"""
+    db.execute(
+        _dialect_insert(db)(ContactFacetCount).values(
+            owner_id=owner_id, initial=initial, count=delta
+        ).on_conflict_do_update(
+            index_elements=[ContactFacetCount.owner_id, ContactFacetCount.initial],
+            set_={"count": ContactFacetCount.count + delta}
+        )
+    )
+
+@traced()
+@owner_sharded()
 def get_contact(db: Session, contact_id: int, owner_id: int) -> Optional[Contact]:
     """Отримання контакту за ID (тільки власника)"""
     return db.query(Contact).filter(
@@ -12,15 +85,26 @@ def get_contact(db: Session, contact_id: int, owner_id: int) -> Optional[Contact
         Contact.owner_id == owner_id
     ).first()
 
-def get_contacts(
-    db: Session, 
-    owner_id: int,
-    skip: int = 0, 
-    limit: int = 100, 
-    search: Optional[str] = None
-) -> List[Contact]:
-    """Отримання контактів користувача"""
-    query = db.query(Contact).filter(Contact.owner_id == owner_id)
+# Колонки у порядку полів ContactResponse (для швидкої серіалізації кортежів)
+CONTACT_RESPONSE_COLUMNS = (
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone_number,
+    Contact.birth_date,
+    Contact.additional_data,
+    Contact.id,
+    Contact.owner_id
+)
+CONTACT_RESPONSE_FIELDS = tuple(column.key for column in CONTACT_RESPONSE_COLUMNS)
+
+# Порядок списку контактів - збігається з індексом ix_contacts_owner_name,
+# тож сторінка читається з індексу без сортування
+CONTACT_LIST_ORDER = (Contact.last_name, Contact.first_name, Contact.id)
+
+def _contacts_query(db: Session, owner_id: int, search: Optional[str], *entities):
+    """Запит контактів власника з необов'язковим пошуком"""
+    query = db.query(*entities).filter(Contact.owner_id == owner_id)
     
     if search:
         search_filter = or_(
@@ -30,23 +114,148 @@ def get_contacts(
         )
         query = query.filter(search_filter)
     
-    return query.offset(skip).limit(limit).all()
+    return query
 
-def create_contact(db: Session, contact: ContactCreate, owner_id: int) -> Contact:
-    """Створення нового контакту"""
-    db_contact = Contact(**contact.model_dump(), owner_id=owner_id)
-    db.add(db_contact)
+@traced()
+@owner_sharded()
+def get_contacts(
+    db: Session, 
+    owner_id: int,
+    skip: int = 0, 
+    limit: int = 100, 
+    search: Optional[str] = None
+) -> List[Contact]:
+    """Отримання контактів користувача (за прізвищем та ім'ям)"""
+    query = _contacts_query(db, owner_id, search, Contact)
+    return query.order_by(*CONTACT_LIST_ORDER).offset(skip).limit(limit).all()
+
+@traced()
+@owner_sharded()
+def get_contact_rows(
+    db: Session,
+    owner_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
+) -> List[tuple]:
+    """
+    Контакти користувача як кортежі колонок (без ORM об'єктів).
+    
+    Без fields повертаються всі колонки CONTACT_RESPONSE_COLUMNS, інакше
+    тільки вказані - вибірка колонок відбувається в самому SQL.
+    """
+    columns = [getattr(Contact, field) for field in fields] if fields else CONTACT_RESPONSE_COLUMNS
+    query = _contacts_query(db, owner_id, search, *columns)
+    return query.order_by(*CONTACT_LIST_ORDER).offset(skip).limit(limit).all()
+
+def _insert_contacts(db: Session):
+    """
+    INSERT контактів, що мовчки пропускає дублікати (owner_id, lower(email)).
+    
+    Конфлікт вирішує сама база в тому ж запиті - без винятку, повторного
+    запиту та відкату. Пропущені рядки просто не потрапляють у RETURNING.
+    """
+    return _dialect_insert(db)(Contact).on_conflict_do_nothing(
+        index_elements=[Contact.owner_id, func.lower(Contact.email)]
+    )
+
+@traced()
+@owner_sharded(write=True)
+def create_contact(db: Session, contact: ContactCreate, owner_id: int) -> Optional[Contact]:
+    """Створення нового контакту (None, якщо у власника вже є контакт з таким email)"""
+    values = contact.model_dump()
+    ids = shard_contact_ids(db, 1)
+    if ids:
+        values["id"] = ids[0]
+    values.update(owner_id=owner_id, sync_seq=_next_change_seq(db, owner_id))
+    db_contact = db.scalars(_insert_contacts(db).values(**values).returning(Contact)).first()
+    
+    if db_contact is None:
+        # Знімаємо блокування та незбережений номер зміни
+        db.rollback()
+        return None
+    
+    _adjust_facet_count(db, owner_id, contact_initial(db_contact.last_name), 1)
     db.commit()
-    db.refresh(db_contact)
+    invalidate_contacts_cache(owner_id)
     return db_contact
 
+@traced()
+@owner_sharded(write=True)
+def create_contacts(
+    db: Session,
+    contacts: Sequence[ContactCreate],
+    owner_id: int
+) -> Tuple[List[tuple], List[str]]:
+    """
+    Масове створення контактів одним INSERT ... ON CONFLICT DO NOTHING.
+    
+    Номери змін резервуються на весь пакет, тож пропущені дублікати лишають
+    у послідовності пропуски - дельта-синхронізації вони не заважають.
+    
+    Returns:
+        Tuple[List[tuple], List[str]]: створені контакти як кортежі
+        CONTACT_RESPONSE_COLUMNS та email-и пропущених дублікатів
+        (як у власника, так і всередині пакета)
+    """
+    rows, seen = [], set()
+    for contact in contacts:
+        key = contact.email.lower()
+        if key not in seen:
+            seen.add(key)
+            rows.append(contact.model_dump())
+    
+    ids = shard_contact_ids(db, len(rows))
+    if ids:
+        for row, contact_id in zip(rows, ids):
+            row["id"] = contact_id
+    
+    last_seq = _next_change_seq(db, owner_id, count=len(rows))
+    for offset, row in enumerate(rows, start=last_seq - len(rows) + 1):
+        row.update(owner_id=owner_id, sync_seq=offset)
+    
+    created = db.execute(_insert_contacts(db).returning(*CONTACT_RESPONSE_COLUMNS), rows).all()
+    # Створеним вважається тільки перше входження email у пакеті
+    pending = {row.email.lower() for row in created}
+    duplicates = []
+    for contact in contacts:
+        key = contact.email.lower()
+        if key in pending:
+            pending.discard(key)
+        else:
+            duplicates.append(contact.email)
+    
+    if not created:
+        db.rollback()
+        return [], duplicates
+    
+    facets: Dict[str, int] = {}
+    for row in created:
+        initial = contact_initial(row.last_name)
+        facets[initial] = facets.get(initial, 0) + 1
+    # Сталий порядок блокувань - паралельні пакети не зациклюються один на одному
+    for initial, delta in sorted(facets.items()):
+        _adjust_facet_count(db, owner_id, initial, delta)
+    
+    db.commit()
+    invalidate_contacts_cache(owner_id)
+    return created, duplicates
+
+@traced()
+@owner_sharded(write=True)
 def update_contact(
     db: Session, 
     contact_id: int, 
     contact_update: ContactUpdate, 
     owner_id: int
 ) -> Optional[Contact]:
-    """Оновлення контакту"""
+    """
+    Оновлення контакту.
+    
+    Raises:
+        IntegrityError: У власника вже є контакт з новим email (транзакцію відкочено)
+    """
     db_contact = db.query(Contact).filter(
         Contact.id == contact_id,
         Contact.owner_id == owner_id
@@ -55,14 +264,29 @@ def update_contact(
     if not db_contact:
         return None
     
+    old_initial = contact_initial(db_contact.last_name)
     update_data = contact_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_contact, field, value)
+    try:
+        for field, value in update_data.items():
+            setattr(db_contact, field, value)
+        db_contact.sync_seq = _next_change_seq(db, owner_id)
+        
+        new_initial = contact_initial(db_contact.last_name)
+        if new_initial != old_initial:
+            _adjust_facet_count(db, owner_id, old_initial, -1)
+            _adjust_facet_count(db, owner_id, new_initial, 1)
 
-    db.commit()
+        db.commit()
+    except IntegrityError:
+        # Дублікат (owner_id, lower(email)) - знімаємо блокування лічильників
+        db.rollback()
+        raise
+    invalidate_contacts_cache(owner_id)
     db.refresh(db_contact)
     return db_contact
 
+@traced()
+@owner_sharded(write=True)
 def delete_contact(db: Session, contact_id: int, owner_id: int) -> bool:
     """Видалення контакту"""
     db_contact = db.query(Contact).filter(
@@ -73,48 +297,149 @@ def delete_contact(db: Session, contact_id: int, owner_id: int) -> bool:
     if not db_contact:
         return False
     
+    db.add(ContactTombstone(
+        owner_id=owner_id,
+        contact_id=db_contact.id,
+        sync_seq=_next_change_seq(db, owner_id)
+    ))
+    _adjust_facet_count(db, owner_id, contact_initial(db_contact.last_name), -1)
+    _prune_tombstones(db, owner_id)
     db.delete(db_contact)
     db.commit()
+    invalidate_contacts_cache(owner_id)
     return True
 
-def get_contacts_with_upcoming_birthdays(db: Session, owner_id: int) -> List[Contact]:
-    """Отримання контактів з днями народження на найближчі 7 днів"""
-    today = date.today()
-    next_week = today + timedelta(days=7)
+@traced()
+@owner_sharded()
+def get_contact_facets(db: Session, owner_id: int) -> Dict[str, int]:
+    """Кількість контактів власника за першою літерою прізвища (з таблиці лічильників)"""
+    return {
+        initial: count
+        for initial, count in db.query(ContactFacetCount.initial, ContactFacetCount.count).filter(
+            ContactFacetCount.owner_id == owner_id,
+            ContactFacetCount.count > 0
+        ).order_by(ContactFacetCount.initial)
+    }
+
+@traced()
+@owner_sharded()
+def count_contacts(db: Session, owner_id: int, search: Optional[str] = None) -> Tuple[int, bool]:
+    """
+    Кількість контактів власника: (кількість, чи точна).
+    
+    Без пошуку - сума лічильників фасетів (точно, без сканування контактів).
+    З пошуком на PostgreSQL - оцінка планувальника з EXPLAIN (вона
+    спирається на статистику pg_class/pg_statistic), тому список власника
+    не сканується. На інших базах (SQLite у розробці) - точний COUNT.
+    """
+    if not search:
+        total = db.query(func.coalesce(func.sum(ContactFacetCount.count), 0)).filter(
+            ContactFacetCount.owner_id == owner_id
+        ).scalar()
+        return int(total), True
+    
+    query = _contacts_query(db, owner_id, search, Contact.id)
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        return query.count(), True
+    
+    compiled = query.statement.compile(dialect=dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"]), False
+
+@traced()
+@owner_sharded()
+def get_contact_changes(
+    db: Session,
+    owner_id: int,
+    since: int = 0
+) -> Optional[Tuple[int, List[Contact], List[int]]]:
+    """
+    Зміни контактів власника після номера since: (поточний номер, змінені, ID видалених).
+    
+    None, якщо tombstones після since вже видалені за терміном зберігання -
+    клієнт має повторити повну синхронізацію (since=0).
+    """
+    state = db.query(ContactSyncState).filter(ContactSyncState.owner_id == owner_id).first()
+    current_seq = state.change_seq if state else 0
+    
+    if since <= 0:
+        # Повна синхронізація: всі поточні контакти, tombstones не потрібні
+        return current_seq, db.query(Contact).filter(Contact.owner_id == owner_id).all(), []
     
-    query = db.query(Contact).filter(Contact.owner_id == owner_id)
+    if since >= current_seq:
+        return current_seq, [], []
+    
+    if since < state.pruned_seq:
+        return None
+    
+    upserts = db.query(Contact).filter(
+        Contact.owner_id == owner_id,
+        Contact.sync_seq > since
+    ).order_by(Contact.sync_seq).all()
+    
+    deleted_ids = [
+        contact_id for (contact_id,) in db.query(ContactTombstone.contact_id).filter(
+            ContactTombstone.owner_id == owner_id,
+            ContactTombstone.sync_seq > since
+        ).order_by(ContactTombstone.sync_seq)
+    ]
+    
+    return current_seq, upserts, deleted_ids
+
+def _upcoming_birthdays_filter(today: date):
+    """Умова "день народження протягом 7 днів від today" """
+    next_week = today + timedelta(days=7)
     
     if today.year == next_week.year:
-        return query.filter(
-            and_(
-                extract('month', Contact.birth_date) >= today.month,
-                extract('month', Contact.birth_date) <= next_week.month,
-                or_(
-                    extract('month', Contact.birth_date) > today.month,
-                    and_(
-                        extract('month', Contact.birth_date) == today.month, 
-                        extract('day', Contact.birth_date) >= today.day 
-                    )
-                ),
-                or_(
-                    extract('month', Contact.birth_date) < next_week.month, 
-                    and_(
-                        extract('month', Contact.birth_date) == next_week.month,
-                        extract('day', Contact.birth_date) <= next_week.day 
-                    )
-                )
-            )
-        ).all()
-    else:
-        return query.filter(
+        return and_(
+            extract('month', Contact.birth_date) >= today.month,
+            extract('month', Contact.birth_date) <= next_week.month,
             or_(
+                extract('month', Contact.birth_date) > today.month,
                 and_(
-                    extract('month', Contact.birth_date) == today.month,
-                    extract('day', Contact.birth_date) >= today.day
-                ), 
+                    extract('month', Contact.birth_date) == today.month, 
+                    extract('day', Contact.birth_date) >= today.day 
+                )
+            ),
+            or_(
+                extract('month', Contact.birth_date) < next_week.month, 
                 and_(
                     extract('month', Contact.birth_date) == next_week.month,
-                    extract('day', Contact.birth_date) <= next_week.day
+                    extract('day', Contact.birth_date) <= next_week.day 
                 )
             )
-        ).all()
\ No newline at end of file
+        )
+    
+    return or_(
+        and_(
+            extract('month', Contact.birth_date) == today.month,
+            extract('day', Contact.birth_date) >= today.day
+        ), 
+        and_(
+            extract('month', Contact.birth_date) == next_week.month,
+            extract('day', Contact.birth_date) <= next_week.day
+        )
+    )
+
+@traced()
+@owner_sharded()
+def get_contacts_with_upcoming_birthdays(db: Session, owner_id: int) -> List[Contact]:
+    """Отримання контактів з днями народження на найближчі 7 днів"""
+    return db.query(Contact).filter(
+        Contact.owner_id == owner_id,
+        _upcoming_birthdays_filter(date.today())
+    ).all()
+
+@traced()
+@owner_sharded()
+def get_upcoming_birthday_rows(db: Session, owner_id: int) -> List[tuple]:
+    """Контакти з днями народження на найближчі 7 днів як кортежі CONTACT_RESPONSE_COLUMNS"""
+    return db.query(*CONTACT_RESPONSE_COLUMNS).filter(
+        Contact.owner_id == owner_id,
+        _upcoming_birthdays_filter(date.today())
+    ).all()
@@ -5,12 +5,14 @@ CRUD операції для управління користувачами.
 користувачів в системі управління контактами.
 """
 
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models.users import User
 from app.schemas.users import UserCreate, UserRoleUpdate, UserUpdate
-from app.utils.auth import get_password_hash, verify_password, generate_verification_token
-from datetime import datetime, timedelta
+from app.utils.auth import get_password_hash, verify_password, generate_verification_token, hash_token
+from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -21,6 +23,7 @@ from app.models.users import User, UserRole
 from app.services.redis import redis_service
 from app.services.cache_utils import invalidate_user_cache
 import logging
+from app.services.tracing import traced
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -226,6 +229,7 @@ def invalidate_user_cache(user_email: str):
     redis_service.delete_user_cache(user_email)
     logger.debug(f"Cache invalidated for user {user_email}")
 
+@traced()
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """
     Отримує користувача за email адресою.
@@ -244,6 +248,7 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """
     return db.query(User).filter(User.email == email).first()
 
+@traced()
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """
     Отримує користувача за іменем користувача.
@@ -262,6 +267,7 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """
     return db.query(User).filter(User.username == username).first()
 
+@traced()
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """
     Отримує користувача за ID.
@@ -280,6 +286,7 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """
     return db.query(User).filter(User.id == user_id).first()
 
+@traced()
 def get_all_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
     """
     Отримує всіх користувачів (тільки для адмінів).
@@ -299,13 +306,17 @@ def get_all_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
     """
     return db.query(User).offset(skip).limit(limit).all()
 
-def create_user(db: Session, user: UserCreate) -> User:
+@traced()
+def create_user(db: Session, user: UserCreate, verification_token: Optional[str] = None) -> User:
     """
     Створює нового користувача в системі.
     
     Args:
         db (Session): Сесія бази даних
         user (UserCreate): Дані нового користувача
+        verification_token (str, optional): Токен для листа верифікації.
+            Зберігається тільки його дайджест; без токена генерується
+            випадковий (новий лист - через refresh_verification_token)
         
     Returns:
         User: Створений користувач
@@ -316,25 +327,97 @@ def create_user(db: Session, user: UserCreate) -> User:
         ...     email='new@example.com',
         ...     password='password123'
         ... )
-        >>> new_user = create_user(db, user_data)
-        >>> new_user.email
-        'new@example.com'
+        >>> token = generate_verification_token()
+        >>> new_user = create_user(db, user_data, verification_token=token)
+        >>> new_user.verification_token == hash_token(token)
+        True
     """
     hashed_password = get_password_hash(user.password)
-    verification_token = generate_verification_token()
     
     db_user = User(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password,
         role=user.role,
-        verification_token=verification_token
+        verification_token=hash_token(verification_token or generate_verification_token())
     )
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
+@traced()
+def register_user(
+    db: Session,
+    user: UserCreate,
+    hashed_password: str,
+    verification_token: str
+) -> Optional[User]:
+    """
+    Реєструє користувача одним INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    
+    Унікальність email та username перевіряє сама база в тому ж запиті,
+    тож реєстрація - один запит замість двох перевірок, вставки та refresh.
+    Пароль хешується заздалегідь, поза потоком запиту.
+    
+    Args:
+        db (Session): Сесія бази даних
+        user (UserCreate): Дані нового користувача
+        hashed_password (str): bcrypt хеш пароля
+        verification_token (str): Токен для листа верифікації (зберігається дайджест)
+        
+    Returns:
+        Optional[User]: Створений користувач або None, якщо email чи username
+        зайняті (яке саме - registration_conflict)
+        
+    Example:
+        >>> hashed = get_password_hash('password123')
+        >>> register_user(db, user_data, hashed, generate_verification_token()).email
+        'new@example.com'
+    """
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    db_user = db.scalars(
+        dialect_insert(User).values(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password,
+            role=user.role,
+            verification_token=hash_token(verification_token)
+        ).on_conflict_do_nothing().returning(User)
+    ).first()
+    
+    if db_user is None:
+        db.rollback()
+        return None
+    
+    # RETURNING вже заповнив усі колонки - від'єднаний об'єкт не прострочується
+    # комітом, і відповідь не робить ще один SELECT
+    db.expunge(db_user)
+    db.commit()
+    return db_user
+
+@traced()
+def registration_conflict(db: Session, email: str, username: str) -> Optional[str]:
+    """
+    Визначає, що саме завадило реєстрації (тільки для невдалої спроби).
+    
+    Returns:
+        Optional[str]: "email", "username" або None, якщо обидва вже вільні
+        
+    Example:
+        >>> registration_conflict(db, 'taken@example.com', 'newuser')
+        'email'
+    """
+    taken = db.execute(
+        select(User.email, User.username).where(or_(User.email == email, User.username == username))
+    ).all()
+    if any(row.email == email for row in taken):
+        return "email"
+    if taken:
+        return "username"
+    return None
+
+@traced()
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """
     Аутентифікує користувача за email та паролем.
@@ -359,7 +442,8 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     return user
 
-def verify_user_email(db: Session, token: str) -> bool:
+@traced()
+def verify_user_email(db: Session, token: str) -> Optional[User]:
     """
     Верифікує email користувача за токеном.
     
@@ -368,22 +452,48 @@ def verify_user_email(db: Session, token: str) -> bool:
         token (str): Токен верифікації
         
     Returns:
-        bool: True якщо верифікація успішна, False інакше
+        Optional[User]: Верифікований користувач або None якщо токен невалідний
         
     Example:
-        >>> success = verify_user_email(db, 'verification_token_123')
-        >>> success
+        >>> user = verify_user_email(db, 'verification_token_123')
+        >>> user.is_verified if user else False
         True
     """
-    user = db.query(User).filter(User.verification_token == token).first()
+    user = db.query(User).filter(User.verification_token == hash_token(token)).first()
     if not user:
-        return False
+        return None
     
     user.is_verified = True
     user.verification_token = None
     db.commit()
-    return True
+    return user
+
+@traced()
+def refresh_verification_token(db: Session, user: User) -> str:
+    """
+    Видає новий токен верифікації (попереднє посилання перестає діяти).
+    
+    У базі зберігається тільки дайджест, тож повторно відправити старий
+    токен неможливо - кожен лист отримує новий.
+    
+    Args:
+        db (Session): Сесія бази даних
+        user (User): Неверифікований користувач
+        
+    Returns:
+        str: Токен для посилання в листі
+        
+    Example:
+        >>> token = refresh_verification_token(db, user)
+        >>> user.verification_token == hash_token(token)
+        True
+    """
+    token = generate_verification_token()
+    user.verification_token = hash_token(token)
+    db.commit()
+    return token
 
+@traced()
 def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
     """
     Оновлює дані користувача.
@@ -414,6 +524,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
     db.refresh(user)
     return user
 
+@traced()
 def update_user_role(db: Session, user_id: int, role_update: UserRoleUpdate) -> Optional[User]:
     """
     Оновлює роль користувача (тільки для адмінів).
@@ -441,6 +552,7 @@ def update_user_role(db: Session, user_id: int, role_update: UserRoleUpdate) ->
     db.refresh(user)
     return user
 
+@traced()
 def update_user_avatar(db: Session, user_id: int, avatar_url: str) -> Optional[User]:
     """
     Оновлює аватар користувача.
@@ -467,7 +579,8 @@ def update_user_avatar(db: Session, user_id: int, avatar_url: str) -> Optional[U
     db.refresh(user)
     return user
 
-def create_password_reset_token(db: Session, email: str) -> Optional[User]:
+@traced()
+def create_password_reset_token(db: Session, email: str) -> Optional[Tuple[User, str]]:
     """
     Створює токен для скидання пароля.
     
@@ -476,11 +589,12 @@ def create_password_reset_token(db: Session, email: str) -> Optional[User]:
         email (str): Email користувача
         
     Returns:
-        Optional[User]: Користувач з токеном скидання або None якщо не знайдено
+        Optional[Tuple[User, str]]: Користувач і токен для листа (у базі - лише
+        його дайджест) або None якщо користувача не знайдено
         
     Example:
-        >>> user = create_password_reset_token(db, 'user@example.com')
-        >>> user.reset_password_token is not None if user else False
+        >>> user, token = create_password_reset_token(db, 'user@example.com')
+        >>> user.reset_password_token == hash_token(token)
         True
     """
     from app.utils.auth import generate_reset_password_token
@@ -491,15 +605,23 @@ def create_password_reset_token(db: Session, email: str) -> Optional[User]:
     
     # Генеруємо токен та встановлюємо час закінчення (1 година)
     reset_token = generate_reset_password_token()
-    expires_at = datetime.now(datetime.timezone.utc()) + timedelta(hours=1)
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
     
-    user.reset_password_token = reset_token
+    user.reset_password_token = hash_token(reset_token)
     user.reset_password_expires = expires_at
     
     db.commit()
     db.refresh(user)
-    return user
+    return user, reset_token
+
+def _valid_reset_token_query(db: Session, token: str):
+    """Користувач з дійсним (не простроченим) токеном скидання"""
+    return db.query(User).filter(
+        User.reset_password_token == hash_token(token),
+        User.reset_password_expires > datetime.now(timezone.utc)
+    )
 
+@traced()
 def reset_user_password(db: Session, token: str, new_password: str) -> Optional[User]:
     """
     Скидає пароль користувача за токеном.
@@ -517,10 +639,7 @@ def reset_user_password(db: Session, token: str, new_password: str) -> Optional[
         >>> user.reset_password_token is None if user else False
         True
     """
-    user = db.query(User).filter(
-        User.reset_password_token == token,
-        User.reset_password_expires > datetime.utcnow()
-    ).first()
+    user = _valid_reset_token_query(db, token).first()
     
     if not user:
         return None
@@ -534,6 +653,7 @@ def reset_user_password(db: Session, token: str, new_password: str) -> Optional[
     db.refresh(user)
     return user
 
+@traced()
 def verify_reset_token(db: Session, token: str) -> Optional[User]:
     """
     Перевіряє валідність токена скидання пароля.
@@ -550,7 +670,43 @@ def verify_reset_token(db: Session, token: str) -> Optional[User]:
         >>> user.email if user else None
         'user@example.com'
     """
-    return db.query(User).filter(
-        User.reset_password_token == token,
-        User.reset_password_expires > datetime.utcnow()
-    ).first()
\ No newline at end of file
+    return _valid_reset_token_query(db, token).first()
+
+@traced()
+def clear_expired_reset_tokens(db: Session, batch_size: int = 1000) -> int:
+    """
+    Очищає прострочені токени скидання пароля пакетами.
+    
+    Кожен пакет - окрема коротка транзакція, тож великий прибиральник не
+    тримає блокування рядків users. Кандидати шукаються по частковому
+    індексу ix_users_reset_password_expires (тільки рядки з токеном).
+    
+    Args:
+        db (Session): Сесія бази даних
+        batch_size (int): Максимум рядків в одному UPDATE
+        
+    Returns:
+        int: Кількість очищених токенів
+        
+    Example:
+        >>> clear_expired_reset_tokens(db, batch_size=500)
+        3
+    """
+    cleared = 0
+    while True:
+        expired_ids = select(User.id).where(
+            User.reset_password_token.isnot(None),
+            User.reset_password_expires <= datetime.now(timezone.utc)
+        ).limit(batch_size).scalar_subquery()
+        
+        result = db.execute(
+            update(User)
+            .where(User.id.in_(expired_ids))
+            .values(reset_password_token=None, reset_password_expires=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        cleared += result.rowcount
+        
+        if result.rowcount < batch_size:
+            return cleared
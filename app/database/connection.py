@@ -4,19 +4,50 @@ Database connection setup for Contact Management API
 Provides database session management and dependency injection
 """
 
-from sqlalchemy import create_engine
+import logging
+from time import perf_counter
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
+from app.database.query_stats import current_query_stats
+from app.database.replicas import ReplicaSet
 
+logger = logging.getLogger(__name__)
 
 # Database Engine
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
     pool_recycle=300,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     echo=settings.debug  # SQL logging in debug mode
 )
 
+# Read Replicas - leer, wenn DB_REPLICA_HOSTS nicht gesetzt ist
+replicas = ReplicaSet(
+    settings.database_replica_urls,
+    retry_seconds=settings.db_replica_retry_seconds,
+    pool_pre_ping=True,
+    pool_recycle=300
+)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Merkt die Startzeit der Abfrage im Execution Context"""
+    if context is not None:
+        context._query_started = perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Zählt die Abfrage in der Statistik des aktuellen HTTP Requests"""
+    stats = current_query_stats.get()
+    if stats is not None and context is not None:
+        stats.record(statement, perf_counter() - context._query_started)
+
+
 # Session Factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -57,6 +88,26 @@ def get_db_session() -> Session:
     return SessionLocal()
 
 
+def prewarm_pool(size: int) -> int:
+    """
+    Öffnet beim Start bis zu size Verbindungen, damit die ersten Requests
+    nicht auf den Verbindungsaufbau warten
+
+    Returns:
+        int: Anzahl geöffneter Verbindungen
+    """
+    connections = []
+    try:
+        for _ in range(min(size, settings.db_pool_size)):
+            connections.append(engine.connect())
+    except Exception as e:
+        logger.warning(f"Pool prewarm stopped at {len(connections)} connections: {e}")
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
 def create_tables():
     """
     Erstellt alle Tabellen basierend auf SQLAlchemy Models
@@ -0,0 +1,76 @@
+"""
+Статистика SQL запитів у межах одного HTTP запиту.
+
+Обробники подій SQLAlchemy (див. ``app.database.connection``) додають
+кожен виконаний запит до об'єкта ``QueryStats`` поточного HTTP запиту.
+Об'єкт передається через ``ContextVar``, тож він доступний і в
+синхронних ендпоінтах, які FastAPI виконує в threadpool
+(контекст копіюється разом з посиланням на той самий об'єкт).
+"""
+
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Розгорнуті списки IN (?, ?, ?) / (%(p_1)s, %(p_2)s) - одна форма незалежно від довжини
+_PLACEHOLDER_LIST_RE = re.compile(r"\((?:\s*(?:\?|%\([^)]+\)s|%s|:\w+)\s*,)+\s*(?:\?|%\([^)]+\)s|%s|:\w+)\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Форма SQL запиту без різниці у пробілах та довжині списків параметрів.
+
+    Example:
+        >>> statement_shape("SELECT * FROM contacts\\n WHERE id IN (?, ?, ?)")
+        'SELECT * FROM contacts WHERE id IN (?...)'
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST_RE.sub("(?...)", shape)
+
+
+class QueryStats:
+    """
+    Лічильники SQL запитів одного HTTP запиту.
+
+    Якщо ``statements`` не None (режим профілювання), зберігається
+    також кожен запит з тривалістю.
+
+    Attributes:
+        count (int): Кількість виконаних запитів
+        duration (float): Сумарний час виконання у секундах
+        statements (list, optional): Пари (запит, тривалість) у порядку виконання
+    """
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[List[Tuple[str, float]]] = [] if record_statements else None
+
+    def record(self, statement: str, duration: float):
+        """Додає виконаний запит до статистики"""
+        self.count += 1
+        self.duration += duration
+        if self.statements is not None:
+            self.statements.append((statement, duration))
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Форми запитів, виконані щонайменше threshold разів (ймовірний N+1).
+
+        Returns:
+            List[Tuple[str, int]]: Пари (форма, кількість), найчастіші першими
+        """
+        if not self.statements:
+            return []
+        shapes = Counter(statement_shape(statement) for statement, _ in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+# Статистика поточного HTTP запиту (None поза запитом, наприклад у скриптах)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
@@ -0,0 +1,86 @@
+"""
+Маршрутизація читань на репліки PostgreSQL.
+
+Читаючі залежності отримують з'єднання з наступної репліки по колу.
+Репліка, до якої не вдалося підключитися, виключається з ротації на
+``db_replica_retry_seconds``; якщо здорових реплік немає, читання йдуть
+на primary. Після запису користувача його читання ще
+``read_your_writes_seconds`` йдуть на primary, щоб не побачити відставання
+реплікації.
+"""
+
+import itertools
+import logging
+from time import monotonic
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.config import settings
+from app.services.redis import redis_service
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """
+    Набір реплік з round-robin вибором і виключенням недоступних.
+
+    Example:
+        >>> replicas = ReplicaSet(["postgresql://.../replica1", "postgresql://.../replica2"])
+        >>> connection = replicas.connect()  # None - читати з primary
+    """
+
+    def __init__(self, urls: Sequence[str], retry_seconds: float = 30, **engine_options):
+        self.engines: List[Engine] = [create_engine(url, **engine_options) for url in urls]
+        self.retry_seconds = retry_seconds
+        self._down_until: Dict[int, float] = {}
+        self._turn = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def healthy(self) -> List[int]:
+        """Індекси реплік, що зараз у ротації"""
+        now = monotonic()
+        return [index for index in range(len(self.engines)) if self._down_until.get(index, 0) <= now]
+
+    def mark_down(self, index: int):
+        """Виключає репліку з ротації на retry_seconds"""
+        self._down_until[index] = monotonic() + self.retry_seconds
+
+    def connect(self) -> Optional[Connection]:
+        """З'єднання з наступною здоровою реплікою або None, якщо таких немає"""
+        healthy = self.healthy()
+        if not healthy:
+            return None
+
+        start = next(self._turn)
+        for offset in range(len(healthy)):
+            index = healthy[(start + offset) % len(healthy)]
+            try:
+                return self.engines[index].connect()
+            except DBAPIError as e:
+                logger.warning(f"Replica {index} unavailable, failing over: {e}")
+                self.mark_down(index)
+        return None
+
+    def dispose(self, close: bool = True):
+        """Закриває пули з'єднань (close=False - лише відкидає успадковані після fork)"""
+        for engine in self.engines:
+            engine.dispose(close=close)
+
+
+def pin_primary_reads(subject: Optional[str]):
+    """Відправляє читання користувача на primary на вікно read-your-writes"""
+    if subject and settings.read_your_writes_seconds > 0:
+        redis_service.set_primary_pin(subject, settings.read_your_writes_seconds)
+
+
+def reads_pinned_to_primary(subject: Optional[str]) -> bool:
+    """Чи мають читання користувача йти на primary (без Redis - так, надійніше)"""
+    if not subject or settings.read_your_writes_seconds <= 0:
+        return False
+    return redis_service.has_primary_pin(subject) is not False
@@ -0,0 +1,357 @@
+"""
+Горизонтальний шардинг контактів за owner_id.
+
+Усі запити контактів обмежені власником, тож власник - природний ключ
+шарда. Контакти, лічильники синхронізації, tombstones та фасети власника
+лежать на одному з шардів ``CONTACT_SHARDS``; users та розміщення власників
+(``owner_shard_assignments``) - в основній базі.
+
+Шард власника визначає кільце consistent hashing (додавання шарда
+переносить лише частину власників), а явний рядок
+``owner_shard_assignments`` має пріоритет - так власника переносять між
+шардами командою ``shard_contacts.py move``.
+
+Без ``CONTACT_SHARDS`` CRUD працює з переданою сесією, як і раніше.
+"""
+
+import bisect
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from contextlib import closing
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import ForeignKeyConstraint, MetaData, case, create_engine, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.models.contacts import (
+    Contact,
+    ContactFacetCount,
+    ContactIdAllocator,
+    ContactSyncState,
+    ContactTombstone,
+    OwnerShardAssignment
+)
+import app.models.users  # noqa: F401 - users потрібні в metadata для зовнішніх ключів
+from app.services.cache_utils import invalidate_contacts_cache
+
+logger = logging.getLogger(__name__)
+
+# Таблиці, рядки яких належать власнику і переїжджають разом з ним
+SHARDED_MODELS = (ContactSyncState, Contact, ContactTombstone, ContactFacetCount)
+
+# ID в одному запиті перевірки зайнятих ID на цільовому шарді
+MOVE_ID_BATCH = 1000
+
+
+class OwnerMigrating(Exception):
+    """Контакти власника зараз переносяться між шардами - запис слід повторити"""
+
+    def __init__(self, owner_id: int):
+        self.owner_id = owner_id
+        super().__init__(f"Contacts of owner {owner_id} are being moved between shards")
+
+
+def _ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Кільце consistent hashing з віртуальними вузлами.
+
+    Example:
+        >>> ring = HashRing(["shard0", "shard1"])
+        >>> ring.shard_for(42)
+        'shard1'
+    """
+
+    def __init__(self, names: Sequence[str], vnodes: int = 64):
+        points = sorted(
+            (_ring_hash(f"{name}#{vnode}"), name) for name in names for vnode in range(vnodes)
+        )
+        self._keys = [key for key, _ in points]
+        self._names = [name for _, name in points]
+
+    def shard_for(self, owner_id: int) -> str:
+        index = bisect.bisect(self._keys, _ring_hash(str(owner_id))) % len(self._keys)
+        return self._names[index]
+
+
+class ShardRouter:
+    """
+    Engines шардів і вибір шарда для власника.
+
+    Сесії шардів не прострочують об'єкти при commit - CRUD повертає
+    контакти вже після закриття сесії шарда.
+    """
+
+    def __init__(self, urls: Dict[str, str], vnodes: int = 64, **engine_options):
+        self.engines: Dict[str, Engine] = {
+            name: create_engine(url, **engine_options) for name, url in urls.items()
+        }
+        self.ring = HashRing(list(self.engines), vnodes) if self.engines else None
+        self._sessions = {
+            name: sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            for name, engine in self.engines.items()
+        }
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def locate(self, db: Session, owner_id: int) -> Tuple[str, bool]:
+        """Шард власника та чи йде зараз його перенесення"""
+        assignment = db.execute(
+            select(OwnerShardAssignment.shard, OwnerShardAssignment.moving).where(
+                OwnerShardAssignment.owner_id == owner_id
+            )
+        ).first()
+        if assignment is None:
+            return self.ring.shard_for(owner_id), False
+        if assignment.shard not in self.engines:
+            raise ValueError(f"Owner {owner_id} is assigned to unknown shard '{assignment.shard}'")
+        return assignment.shard, assignment.moving
+
+    def session(self, shard: str) -> Session:
+        return self._sessions[shard]()
+
+    def dispose(self, close: bool = True):
+        """Закриває пули з'єднань (close=False - лише відкидає успадковані після fork)"""
+        for engine in self.engines.values():
+            engine.dispose(close=close)
+
+
+shards = ShardRouter(
+    settings.contact_shard_urls,
+    vnodes=settings.contact_shard_vnodes,
+    pool_pre_ping=True,
+    pool_recycle=300
+)
+
+
+def owner_sharded(write: bool = False):
+    """
+    Виконує CRUD функцію контактів у сесії шарда її owner_id.
+
+    Args:
+        write (bool): Функція змінює дані - під час перенесення власника
+            вона відхиляється з OwnerMigrating
+
+    Example:
+        >>> @owner_sharded()
+        ... def get_contact(db, contact_id, owner_id): ...
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(db: Session, *args, **kwargs):
+            if not shards:
+                return func(db, *args, **kwargs)
+
+            owner_id = signature.bind(db, *args, **kwargs).arguments["owner_id"]
+            shard, moving = shards.locate(db, owner_id)
+            if moving and write:
+                raise OwnerMigrating(owner_id)
+
+            with closing(shards.session(shard)) as shard_db:
+                # ID нових контактів видає лічильник основної бази (shard_contact_ids)
+                shard_db.info["contact_id_bind"] = db.get_bind()
+                return func(shard_db, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _seed_contact_ids(bind: Engine):
+    """Створює (або піднімає) лічильник ID не нижче найбільшого ID на шардах"""
+    last_id = 0
+    for engine in shards.engines.values():
+        with engine.connect() as conn:
+            last_id = max(last_id, conn.scalar(select(func.max(Contact.id))) or 0)
+
+    dialect_insert = postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+    with bind.begin() as conn:
+        conn.execute(
+            dialect_insert(ContactIdAllocator).values(id=1, last_id=last_id).on_conflict_do_update(
+                index_elements=[ContactIdAllocator.id],
+                set_={"last_id": case(
+                    (ContactIdAllocator.last_id < last_id, last_id),
+                    else_=ContactIdAllocator.last_id
+                )}
+            )
+        )
+
+
+def allocate_contact_ids(bind: Engine, count: int) -> List[int]:
+    """
+    Резервує count глобально унікальних ID контактів в основній базі.
+
+    Виділення - окрема коротка транзакція, тож рядок лічильника не
+    блокується на час запису на шард. ID відхилених дублікатів просто
+    лишаються невикористаними.
+    """
+    with bind.begin() as conn:
+        last_id = conn.scalar(
+            update(ContactIdAllocator).values(
+                last_id=ContactIdAllocator.last_id + count
+            ).returning(ContactIdAllocator.last_id)
+        )
+    if last_id is None:
+        _seed_contact_ids(bind)
+        return allocate_contact_ids(bind, count)
+    return list(range(last_id - count + 1, last_id + 1))
+
+
+def shard_contact_ids(db: Session, count: int) -> Optional[List[int]]:
+    """ID для нових контактів у сесії шарда (None без шардингу - ID видає послідовність таблиці)"""
+    bind = db.info.get("contact_id_bind")
+    if bind is None:
+        return None
+    return allocate_contact_ids(bind, count)
+
+
+def shard_metadata() -> MetaData:
+    """Схема таблиць шарда: ті ж таблиці, але без зовнішніх ключів на users"""
+    metadata = MetaData()
+    for model in SHARDED_MODELS:
+        table = model.__table__.to_metadata(metadata)
+        for constraint in [c for c in table.constraints if isinstance(c, ForeignKeyConstraint)]:
+            table.constraints.discard(constraint)
+        table.foreign_keys.clear()
+        for column in table.columns:
+            column.foreign_keys.clear()
+    return metadata
+
+
+def create_shard_tables(engine: Engine):
+    """Створює таблиці контактів на шарді (для нових шардів та розробки)"""
+    shard_metadata().create_all(bind=engine)
+
+
+def _set_assignment(db: Session, owner_id: int, shard: str, moving: bool):
+    assignment = db.get(OwnerShardAssignment, owner_id, populate_existing=True)
+    if assignment is None:
+        db.add(OwnerShardAssignment(owner_id=owner_id, shard=shard, moving=moving))
+    else:
+        assignment.shard = shard
+        assignment.moving = moving
+    db.commit()
+
+
+def _owner_rows(db: Session, model, owner_id: int, exclude: Sequence[str] = ()) -> list:
+    columns = [column for column in model.__table__.columns if column.key not in exclude]
+    return [dict(row) for row in db.execute(
+        select(*columns).where(model.owner_id == owner_id)
+    ).mappings()]
+
+
+def move_owner(
+    db: Session,
+    owner_id: int,
+    target: str,
+    drain_seconds: Optional[float] = None
+) -> Dict[str, object]:
+    """
+    Переносить контакти власника на інший шард без зупинки застосунку.
+
+    1. Власник позначається ``moving`` - його записи відхиляються
+       (503 з Retry-After), читання йдуть зі старого шарда. Після паузи
+       drain_seconds запити, що вже почали запис, встигають завершитись.
+    2. Рядки власника копіюються на новий шард однією транзакцією разом з
+       ID контактів - вони глобальні (allocate_contact_ids), тож клієнти
+       нічого не помічають. Лише контакт, створений до появи лічильника,
+       може зайняти ID, який на цільовому шарді вже має інший власник:
+       такий контакт отримує новий ID, а старий записується як tombstone
+       на новому номері зміни - дельта-синхронізація бачить заміну.
+    3. Розміщення перемикається на новий шард, рядки на старому видаляються.
+
+    Повторний запуск після збою безпечний: залишки власника на цільовому
+    шарді видаляються перед копіюванням.
+
+    Args:
+        db (Session): Сесія основної бази (owner_shard_assignments)
+        owner_id (int): ID власника
+        target (str): Назва цільового шарда
+        drain_seconds (float, optional): Пауза після позначення moving
+
+    Returns:
+        Dict[str, object]: source, target, кількість перенесених контактів,
+        tombstones і контактів, що отримали новий ID
+
+    Raises:
+        ValueError: Шардинг не налаштований або невідомий цільовий шард
+    """
+    if not shards:
+        raise ValueError("CONTACT_SHARDS is not configured")
+    if target not in shards.engines:
+        raise ValueError(f"Unknown shard '{target}'")
+
+    source, moving = shards.locate(db, owner_id)
+    if source == target and not moving:
+        return {"source": source, "target": target, "contacts": 0, "tombstones": 0, "renumbered": 0}
+
+    _set_assignment(db, owner_id, source, moving=True)
+    drain = settings.contact_shard_drain_seconds if drain_seconds is None else drain_seconds
+    if drain > 0:
+        time.sleep(drain)
+
+    contacts, tombstones, taken = [], [], set()
+    with closing(shards.session(source)) as source_db, closing(shards.session(target)) as target_db:
+        if source != target:
+            state = source_db.get(ContactSyncState, owner_id)
+            contacts = _owner_rows(source_db, Contact, owner_id)
+            tombstones = _owner_rows(source_db, ContactTombstone, owner_id, exclude=("id",))
+            facets = _owner_rows(source_db, ContactFacetCount, owner_id)
+
+            for model in SHARDED_MODELS:
+                target_db.execute(delete(model).where(model.owner_id == owner_id))
+
+            ids = [row["id"] for row in contacts]
+            for start in range(0, len(ids), MOVE_ID_BATCH):
+                taken.update(target_db.scalars(
+                    select(Contact.id).where(Contact.id.in_(ids[start:start + MOVE_ID_BATCH]))
+                ))
+
+            change_seq = state.change_seq if state else 0
+            if taken:
+                change_seq += 1
+                new_ids = iter(allocate_contact_ids(db.get_bind(), len(taken)))
+                for row in contacts:
+                    if row["id"] in taken:
+                        tombstones.append({"owner_id": owner_id, "contact_id": row["id"], "sync_seq": change_seq})
+                        row.update(id=next(new_ids), sync_seq=change_seq)
+            target_db.add(ContactSyncState(
+                owner_id=owner_id,
+                change_seq=change_seq,
+                pruned_seq=state.pruned_seq if state else 0
+            ))
+
+            if contacts:
+                target_db.execute(insert(Contact), contacts)
+            if tombstones:
+                target_db.execute(insert(ContactTombstone), tombstones)
+            if facets:
+                target_db.execute(insert(ContactFacetCount), facets)
+            target_db.commit()
+
+        _set_assignment(db, owner_id, target, moving=False)
+
+        if source != target:
+            for model in SHARDED_MODELS:
+                source_db.execute(delete(model).where(model.owner_id == owner_id))
+            source_db.commit()
+
+    invalidate_contacts_cache(owner_id)
+    logger.info(f"Moved contacts of owner {owner_id} from shard {source} to {target}")
+    return {
+        "source": source,
+        "target": target,
+        "contacts": len(contacts),
+        "tombstones": len(tombstones),
+        "renumbered": len(taken)
+    }
@@ -1,15 +1,23 @@
-from fastapi import FastAPI
+import os
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
 from app.api.v1.api import api_router
 from app.database.base import Base
 from app.database.connection import engine
-from app.middleware.rate_limiter import limiter
+from app.database.sharding import OwnerMigrating
+from app.middleware.rate_limiter import RateLimitMiddleware, limiter
+from app.middleware.compression import CompressionMiddleware, build_compressors
+from app.middleware.concurrency import AIMDLimiter, ConcurrencyLimitMiddleware, parse_route_budgets
+from app.middleware.http_cache import HTTPCacheMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.sql_profiler import SQLProfilerMiddleware
+from app.middleware.tracing import TracingMiddleware
 from app.services.redis import redis_service
+from app.services.resources import lifespan
 
 # Base.metadata.create_all(bind=engine)
 
@@ -18,10 +26,51 @@ app = FastAPI(
     description="REST API for contacts management with JWT authentication",
     version=settings.app_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# CORS middleware
+# Профілювання SQL (всередині метрик - використовує їх статистику запитів)
+app.add_middleware(SQLProfilerMiddleware)
+
+# Трасування (кореневий спан запиту; без tracing_enabled - прохідне).
+# Провайдер налаштовується в lifespan (Resources.start) - вже у воркері, після fork
+app.add_middleware(TracingMiddleware)
+
+# Адаптивний ліміт одночасних запитів (всередині метрик - відхилені запити теж рахуються)
+if settings.concurrency_limit_enabled:
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        limiter=AIMDLimiter(
+            initial=settings.concurrency_initial_limit,
+            min_limit=settings.concurrency_min_limit,
+            max_limit=settings.concurrency_max_limit,
+            latency_target=settings.concurrency_latency_target_ms / 1000,
+            backoff_ratio=settings.concurrency_backoff_ratio
+        ),
+        route_budgets=parse_route_budgets(settings.concurrency_route_budgets),
+        priority_paths=[path.strip() for path in settings.concurrency_priority_paths.split(",") if path.strip()],
+        retry_after=settings.concurrency_retry_after_seconds
+    )
+
+# Rate limiting (ззовні ліміту одночасних запитів - відмова 429 не займає місце)
+app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+# Публічні відповіді з пам'яті (ззовні rate limit, всередині стиснення)
+if settings.http_cache_enabled:
+    cached_paths = [path.strip() for path in settings.http_cache_paths.split(",") if path.strip()]
+    revalidate_paths = {path.strip() for path in settings.http_cache_revalidate_paths.split(",")}
+    public_cache_control = f"public, max-age={settings.http_cache_max_age}"
+    app.add_middleware(
+        HTTPCacheMiddleware,
+        cache_control={
+            path: "no-cache" if path in revalidate_paths else public_cache_control
+            for path in cached_paths
+        }
+    )
+
+# CORS (ззовні кешу відповідей і лімітів - заголовки отримують і кешовані
+# відповіді, і 304, і 429/503; кеш зберігає відповіді без залежних від Origin заголовків)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:8080"],
@@ -30,9 +79,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Стиснення відповідей (всередині метрик - час стиснення входить у тривалість запиту)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        compressors=build_compressors(
+            [encoding.strip() for encoding in settings.compression_encodings.split(",") if encoding.strip()],
+            {
+                "gzip": settings.compression_gzip_level,
+                "br": settings.compression_brotli_quality,
+                "zstd": settings.compression_zstd_level,
+            }
+        ),
+        minimum_size=settings.compression_minimum_size,
+        content_types=[value.strip() for value in settings.compression_content_types.split(",") if value.strip()],
+        thread_threshold=settings.compression_thread_threshold
+    )
+
+# Метрики (додається останнім, щоб охоплювати весь стек middleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(OwnerMigrating)
+async def owner_migrating_handler(request: Request, exc: OwnerMigrating):
+    """Запис контактів під час перенесення власника між шардами - повторити пізніше"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Contacts are being migrated, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
 
 # Підключення роутерів
 app.include_router(api_router, prefix="/api/v1")
@@ -73,6 +148,18 @@ def health_check():
     """Перевірка здоров'я API"""
     return {"status": "healthy", "version": settings.app_version}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Метрики у форматі Prometheus"""
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Кілька воркерів (serve.py) - збираємо метрики всіх процесів
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=settings.debug)
\ No newline at end of file
+    # Сервер розробки; production - serve.py
+    uvicorn.run("app.main:app", host=settings.server_host, port=settings.server_port, reload=settings.debug)
\ No newline at end of file
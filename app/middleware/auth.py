@@ -1,12 +1,13 @@
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.deps import get_read_db
 from app.utils.auth import verify_token
 from app.crud.users import get_user_by_email
 from app.models.users import User, UserRole
 from app.services.redis import redis_service
 import logging
+from app.services.tracing import traced
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -36,9 +37,10 @@ def user_model_to_dict(user: User) -> dict:
         'updated_at': user.updated_at.isoformat() if user.updated_at else None
     }
 
+@traced()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> User:
     """Отримання поточного користувача з JWT токена (з кешуванням)"""
     credentials_exception = HTTPException(
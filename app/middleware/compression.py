@@ -0,0 +1,196 @@
+"""
+Стиснення відповідей: gzip, brotli, zstd.
+
+Кодування обирається за ``Accept-Encoding`` клієнта з урахуванням
+``q`` і порядку ``compression_encodings``. brotli і zstd доступні, коли
+встановлено пакети ``brotli`` і ``zstandard``. Без них лишається gzip зі
+стандартної бібліотеки.
+
+Стискаються тільки відповіді, що відповідають усім умовам:
+
+* тіло не менше ``compression_minimum_size`` байт;
+* media type починається з одного з ``compression_content_types``
+  (JSON, текст; зображення та архіви вже стиснені);
+* відповідь ще не має ``Content-Encoding``.
+
+Потокові відповіді (кілька повідомлень ``http.response.body``) передаються
+без змін. Тіла, більші за ``compression_thread_threshold``, стискаються в
+пулі потоків: мегабайтний експорт контактів не блокує event loop на
+десятки мілісекунд. zlib, brotli і zstd звільняють GIL на час стиснення.
+"""
+
+import gzip
+import logging
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+from app.services.metrics import COMPRESSION_BYTES
+
+logger = logging.getLogger(__name__)
+
+Compressor = Callable[[bytes], bytes]
+
+
+def _gzip(level: int) -> Compressor:
+    return lambda body: gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(level: int) -> Compressor:
+    import brotli
+    return lambda body: brotli.compress(body, quality=level)
+
+
+def _zstd(level: int) -> Compressor:
+    import zstandard
+    # ZstdCompressor не потокобезпечний - окремий на кожен виклик
+    return lambda body: zstandard.ZstdCompressor(level=level).compress(body)
+
+
+COMPRESSOR_FACTORIES = {"gzip": _gzip, "br": _brotli, "zstd": _zstd}
+
+
+def build_compressors(encodings: Sequence[str], levels: Mapping[str, int]) -> Dict[str, Compressor]:
+    """
+    Компресори в порядку переваги; кодування без встановленого пакета пропускаються.
+
+    Example:
+        >>> list(build_compressors(["br", "gzip"], {"gzip": 6, "br": 4}))
+        ['br', 'gzip']
+    """
+    compressors = {}
+    for encoding in encodings:
+        try:
+            compressors[encoding] = COMPRESSOR_FACTORIES[encoding](levels[encoding])
+        except ImportError:
+            logger.warning(f"Compression {encoding} disabled: package is not installed")
+        except KeyError:
+            raise ValueError(f"Unknown compression encoding: {encoding}") from None
+    return compressors
+
+
+def negotiate(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """
+    Кодування з найбільшим ``q``, при рівних - перше в ``available``.
+
+    Example:
+        >>> negotiate("gzip, br;q=0.8", ["br", "gzip"])
+        'gzip'
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Стискає відповіді обраним кодуванням.
+
+    Example:
+        >>> app.add_middleware(
+        ...     CompressionMiddleware,
+        ...     compressors=build_compressors(["gzip"], {"gzip": 6}),
+        ...     minimum_size=1024
+        ... )
+    """
+
+    def __init__(
+        self,
+        app,
+        compressors: Mapping[str, Compressor],
+        minimum_size: int = 1024,
+        content_types: Sequence[str] = ("application/json", "text/"),
+        thread_threshold: int = 65536
+    ):
+        self.app = app
+        self.compressors = dict(compressors)
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.thread_threshold = thread_threshold
+        # Дочірні лічильники з мітками прив'язуються один раз, а не на кожну відповідь
+        self.byte_counters = {
+            encoding: (COMPRESSION_BYTES.labels(encoding, "original"), COMPRESSION_BYTES.labels(encoding, "compressed"))
+            for encoding in self.compressors
+        }
+
+    def _accept_encoding(self, scope) -> str:
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                return value.decode("latin-1")
+        return ""
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(self.content_types)
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        compressor = self.compressors[encoding]
+        if len(body) >= self.thread_threshold:
+            return await run_in_threadpool(compressor, body)
+        return compressor(body)
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http" and self.compressors:
+            encoding = negotiate(self._accept_encoding(scope), list(self.compressors))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            # Перше повідомлення тіла - рішення, стискати чи ні
+            passthrough = True
+            headers = MutableHeaders(raw=list(start_message.get("headers", ())))
+            body = message.get("body", b"")
+            if not self._compressible(headers):
+                await send(start_message)
+                await send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send({**start_message, "headers": headers.raw})
+                await send(message)
+                return
+
+            compressed = await self._compress(encoding, body)
+            original_bytes, compressed_bytes = self.byte_counters[encoding]
+            original_bytes.inc(len(body))
+            compressed_bytes.inc(len(compressed))
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # Стиснене представлення вже не побайтово те саме
+                headers["etag"] = f"W/{etag}"
+            await send({**start_message, "headers": headers.raw})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,172 @@
+"""
+Адаптивне обмеження одночасних запитів (AIMD).
+
+Коли PostgreSQL чи Redis сповільнюються, запити накопичуються в пулі
+потоків і чекають, доки клієнти не відвалються за таймаутом. Middleware
+тримає кількість запитів в обробці в межах ліміту, який підлаштовується
+під спостережувану затримку:
+
+* запит довший за ``concurrency_latency_target_ms`` або відповідь 5xx (крім 503) -
+  ліміт множиться на ``concurrency_backoff_ratio`` (не частіше ніж раз
+  на цільову затримку, щоб одна хвиля повільних відповідей не обвалила
+  ліміт до мінімуму);
+* швидка відповідь, коли ліміт вичерпано, - ліміт зростає на ``1/limit``,
+  тобто приблизно на одиницю за "вікно" запитів.
+
+Запити понад ліміт одразу отримують ``503`` з ``Retry-After``. Шляхи
+``concurrency_priority_paths`` (health, metrics) не обмежуються. Важкі
+маршрути мають власний бюджет - частку поточного ліміту, тож масовий
+імпорт не забере всі місця в ``/users/me``.
+"""
+
+import json
+from time import monotonic, perf_counter
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.services.metrics import CONCURRENCY_LIMIT, REQUESTS_SHED
+
+
+class AIMDLimiter:
+    """
+    Ліміт одночасних запитів з адитивним збільшенням і мультиплікативним зменшенням.
+
+    Example:
+        >>> limiter = AIMDLimiter(initial=20, min_limit=5, max_limit=200, latency_target=0.25)
+        >>> limiter.try_acquire()
+        True
+        >>> limiter.release(latency=0.01, failed=False)
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff_ratio: float = 0.9
+    ):
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, failed: bool):
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+
+        if failed or latency > self.latency_target:
+            now = monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._last_decrease = now
+        elif saturated:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+
+def parse_route_budgets(value: str) -> Tuple[Tuple[str, float], ...]:
+    """
+    Бюджети маршрутів з рядка налаштувань.
+
+    Example:
+        >>> parse_route_budgets("/api/v1/contacts/bulk=0.2")
+        (('/api/v1/contacts/bulk', 0.2),)
+    """
+    budgets = []
+    for entry in filter(None, (entry.strip() for entry in value.split(","))):
+        prefix, _, share = entry.rpartition("=")
+        budgets.append((prefix.strip(), float(share)))
+    # Довший префікс перевіряється першим
+    return tuple(sorted(budgets, key=lambda budget: len(budget[0]), reverse=True))
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Відхиляє запити з 503, коли запитів в обробці більше, ніж поточний ліміт.
+
+    Example:
+        >>> app.add_middleware(
+        ...     ConcurrencyLimitMiddleware,
+        ...     limiter=AIMDLimiter(50, 5, 500, latency_target=1.0),
+        ...     route_budgets=parse_route_budgets("/api/v1/contacts/bulk=0.2")
+        ... )
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: AIMDLimiter,
+        route_budgets: Sequence[Tuple[str, float]] = (),
+        priority_paths: Sequence[str] = ("/health", "/metrics"),
+        retry_after: int = 1
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.route_budgets = tuple(route_budgets)
+        self.priority_paths = frozenset(priority_paths)
+        self.retry_after = str(retry_after)
+        self.route_in_flight: Dict[str, int] = {prefix: 0 for prefix, _ in self.route_budgets}
+
+    def _budget(self, path: str) -> Optional[Tuple[str, float]]:
+        for prefix, share in self.route_budgets:
+            if path.startswith(prefix):
+                return prefix, share
+        return None
+
+    async def _reject(self, send, reason: str):
+        REQUESTS_SHED.labels(reason).inc()
+        body = json.dumps({"detail": "Server is overloaded, retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", self.retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.priority_paths:
+            await self.app(scope, receive, send)
+            return
+
+        budget = self._budget(scope["path"])
+        if budget is not None:
+            prefix, share = budget
+            if self.route_in_flight[prefix] >= max(1, int(self.limiter.limit * share)):
+                await self._reject(send, "route_budget")
+                return
+        if not self.limiter.try_acquire():
+            await self._reject(send, "limit")
+            return
+        if budget is not None:
+            self.route_in_flight[prefix] += 1
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if budget is not None:
+                self.route_in_flight[prefix] -= 1
+            # 503 - власна відмова (шард переноситься), а не ознака перевантаження
+            failed = status_code >= 500 and status_code != 503
+            self.limiter.release(perf_counter() - started, failed=failed)
@@ -0,0 +1,166 @@
+"""
+HTTP кешування публічних відповідей.
+
+``/``, ``/health``, ``/openapi.json`` і сторінки документації не залежать
+від запиту і не змінюються до перезапуску, але раніше будувались на
+кожен запит (схема OpenAPI - десятки КБ JSON). Middleware один раз під
+час старту (``lifespan.startup.complete``) проганяє ці шляхи через
+внутрішню частину стеку, зберігає байти відповіді і далі віддає їх з
+пам'яті, не доходячи до маршрутів.
+
+Кожна така відповідь має ``ETag`` і ``Cache-Control``: публічні шляхи -
+``public, max-age=...``, тож їх забирає CDN або reverse proxy, а
+``/health`` - ``no-cache`` (копія перевіряється на кожен запит). Запит з
+``If-None-Match`` отримує ``304`` без тіла. ETag порівнюється слабко:
+``CompressionMiddleware`` робить ETag стисненої відповіді слабким
+(``W/"..."``).
+
+Без lifespan (наприклад, ``TestClient`` без ``with``) запити просто
+проходять до маршрутів.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Сильний ETag тіла відповіді.
+
+    Example:
+        >>> make_etag(b'{"status":"healthy"}')
+        '"d2d90194bf20d22c22624218b29af501"'
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабке порівняння ETag з ``If-None-Match`` (``W/"x"`` збігається з ``"x"``)"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Готова відповідь: тіло, ETag і заголовки"""
+
+    body: bytes
+    etag: str
+    content_type: bytes
+    cache_control: bytes
+    route: Optional[Any] = None  # Маршрут для міток метрик (scope["route"])
+
+    def headers(self, with_body: bool) -> List[Tuple[bytes, bytes]]:
+        headers = [(b"etag", self.etag.encode()), (b"cache-control", self.cache_control)]
+        if with_body:
+            headers += [(b"content-type", self.content_type), (b"content-length", str(len(self.body)).encode())]
+        return headers
+
+
+async def render(asgi_app, path: str, app) -> Tuple[int, Dict[bytes, bytes], bytes, Optional[Any]]:
+    """Статус, заголовки, тіло і маршрут GET ``path`` від ASGI застосунку (внутрішній запит)"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": None,
+        "server": None,
+        "app": app,
+        "state": {},
+    }
+    await asgi_app(scope, receive, send)
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], dict(start.get("headers", ())), body, scope.get("route")
+
+
+class HTTPCacheMiddleware:
+    """
+    Віддає заздалегідь відрендерені публічні відповіді з ETag і Cache-Control.
+
+    Example:
+        >>> app.add_middleware(
+        ...     HTTPCacheMiddleware,
+        ...     cache_control={"/openapi.json": "public, max-age=300", "/health": "no-cache"}
+        ... )
+    """
+
+    def __init__(self, app, cache_control: Mapping[str, str]):
+        self.app = app
+        self.cache_control = dict(cache_control)
+        self.responses: Dict[str, CachedResponse] = {}
+
+    async def prime(self, app):
+        """Рендерить шляхи через внутрішні middleware і маршрути та зберігає відповіді"""
+        for path, cache_control in self.cache_control.items():
+            try:
+                status, headers, body, route = await render(self.app, path, app)
+            except Exception as e:
+                logger.warning(f"Failed to precompute {path}: {e}")
+                continue
+            if status != 200:
+                logger.warning(f"Not caching {path}: status {status}")
+                continue
+            self.responses[path] = CachedResponse(
+                body=body,
+                etag=make_etag(body),
+                content_type=headers.get(b"content-type", b"application/json"),
+                cache_control=cache_control.encode(),
+                route=route
+            )
+        logger.info(f"Precomputed {len(self.responses)} public responses")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            async def lifespan_send(message):
+                if message["type"] == "lifespan.startup.complete":
+                    await self.prime(scope["app"])
+                await send(message)
+
+            await self.app(scope, receive, lifespan_send)
+            return
+
+        cached = None
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            cached = self.responses.get(scope["path"])
+        if cached is None:
+            await self.app(scope, receive, send)
+            return
+        if cached.route is not None:
+            scope["route"] = cached.route
+
+        if_none_match = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        if if_none_match and etag_matches(if_none_match, cached.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cached.headers(False)})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": cached.headers(True)})
+        body = cached.body if scope["method"] == "GET" else b""
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,84 @@
+"""
+Middleware збору метрик HTTP запитів.
+
+Реалізовано як чисте ASGI middleware (без ``BaseHTTPMiddleware``), щоб
+не буферизувати тіло відповіді і не створювати додаткову задачу на
+кожен запит.
+"""
+
+from time import perf_counter
+from app.database.query_stats import QueryStats, current_query_stats
+from app.services.metrics import HTTP_REQUESTS_IN_FLIGHT, route_metrics
+
+# Мітка для запитів, що не потрапили в жоден маршрут (404 тощо)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope) -> str:
+    """
+    Шаблон маршруту запиту (``/api/v1/contacts/{contact_id}``).
+
+    Старі версії FastAPI кладуть у ``scope["route"]`` копію маршруту з
+    префіксом роутера, новіші - оригінальний маршрут без префікса. У
+    другому випадку префікс відновлюється з фактичного шляху: це частина
+    шляху перед найкоротшим суфіксом, який збігається з маршрутом.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path", None)
+    if path_format is None:
+        return UNMATCHED_ROUTE
+
+    path = scope["path"]
+    path_regex = route.path_regex
+    if path_regex.match(path):
+        return path_format
+
+    index = path.rfind("/")
+    while index > 0:
+        if path_regex.match(path[index:]):
+            return path[:index] + path_format
+        index = path.rfind("/", 0, index)
+    return path_format
+
+
+class MetricsMiddleware:
+    """
+    Записує тривалість, статус, кількість і час SQL запитів за шаблоном маршруту.
+
+    Example:
+        >>> app.add_middleware(MetricsMiddleware)
+    """
+
+    def __init__(self, app, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            current_query_stats.reset(token)
+
+            metrics = route_metrics(scope["method"], route_template(scope))
+            metrics.duration.observe(elapsed)
+            metrics.requests(status_code).inc()
+            metrics.db_queries.observe(stats.count)
+            metrics.db_duration.observe(stats.duration)
@@ -1,11 +1,211 @@
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import Request
+"""
+Rate limiting з token bucket у Redis.
+
+Лічильники спільні для всіх воркерів і процесів: перевірка - один
+виклик Lua скрипта (``RedisService.take_token``). Бакет належить
+користувачу з Bearer токена, а для анонімних запитів - IP клієнта, тож
+користувачі за одним NAT не ділять ліміт.
+
+Політики маршрутів задаються в ``Settings``:
+``rate_limit_policies="POST /api/v1/auth/login=5/minute,/api/v1/contacts/*=100/minute"``.
+Метод необов'язковий, ``*`` у кінці - префікс шляху. Ліміт ``/users/me``
+береться з ``rate_limit_me_endpoint``.
+
+Кожна відповідь обмеженого маршруту має заголовки ``RateLimit-Limit``,
+``RateLimit-Remaining``, ``RateLimit-Reset`` і ``RateLimit-Policy``.
+Відмова - ``429`` з ``Retry-After``. Поки Redis недоступний, ліміт
+рахується локально в процесі (з кількома воркерами він стає м'якшим).
+"""
+
+import json
+import math
+from dataclasses import dataclass, replace
+from time import monotonic
+from typing import Dict, Optional, Sequence, Tuple
+
 from app.config import settings
+from app.services.redis import redis_service
+from app.utils.auth import verify_token
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """Ліміт маршруту: capacity запитів за period секунд (бакет на route і користувача)"""
+
+    capacity: int
+    period: int
+    route: str = ""
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RatePolicy":
+        """
+        Example:
+            >>> RatePolicy.parse("10/minute")
+            RatePolicy(capacity=10, period=60, route='')
+        """
+        count, _, period = value.strip().partition("/")
+        return cls(capacity=int(count), period=PERIODS[period.strip().rstrip("s")])
+
+
+def parse_policies(value: str) -> Tuple[Tuple[Optional[str], str, RatePolicy], ...]:
+    """Політики (метод, шлях, ліміт) з рядка налаштувань; точні шляхи - перед префіксами"""
+    policies = []
+    for entry in filter(None, (entry.strip() for entry in value.split(","))):
+        route, _, rate = entry.rpartition("=")
+        method, _, path = route.strip().rpartition(" ")
+        policy = replace(RatePolicy.parse(rate), route=route.strip())
+        policies.append((method.upper() or None, path, policy))
+    return tuple(sorted(policies, key=lambda policy: (policy[1].endswith("*"), -len(policy[1]))))
+
+
+class LocalTokenBuckets:
+    """Той самий token bucket у пам'яті процесу - запасний варіант без Redis"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float]:
+        now = monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        if key not in self._buckets and len(self._buckets) >= self.max_keys:
+            self._prune(now, capacity / refill_per_second)
+        self._buckets[key] = (tokens, now)
+        return allowed, tokens
+
+    def _prune(self, now: float, idle_seconds: float):
+        """Прибирає бакети, що вже встигли наповнитись (їх стан не потрібен)"""
+        self._buckets = {
+            key: state for key, state in self._buckets.items() if now - state[1] < idle_seconds
+        }
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+    def reset(self):
+        self._buckets.clear()
+
+
+class RateLimiter:
+    """
+    Перевірка політик маршрутів: Redis, а без нього - локальні бакети.
+
+    Example:
+        >>> limiter = RateLimiter("GET /api/v1/users/me=10/minute")
+        >>> limiter.check("user:ivan@example.com", limiter.policy_for("GET", "/api/v1/users/me"))
+        (True, 9.0)
+    """
+
+    def __init__(self, policies: str = "", enabled: bool = True):
+        self.policies = parse_policies(policies)
+        self.enabled = enabled
+        self.local = LocalTokenBuckets()
+
+    def policy_for(self, method: str, path: str) -> Optional[RatePolicy]:
+        for policy_method, policy_path, policy in self.policies:
+            if policy_method is not None and policy_method != method:
+                continue
+            if path == policy_path or (policy_path.endswith("*") and path.startswith(policy_path[:-1])):
+                return policy
+        return None
+
+    def check(self, identity: str, policy: RatePolicy) -> Tuple[bool, float]:
+        """Списує токен з бакета identity для політики; (дозволено, залишок токенів)"""
+        key = f"{policy.route}:{identity}"
+        result = redis_service.take_token(key, policy.capacity, policy.refill_per_second)
+        if result is None:
+            result = self.local.take(key, policy.capacity, policy.refill_per_second)
+        return result
+
+    def reset(self):
+        """Скидає локальні бакети (тести)"""
+        self.local.reset()
+
+
+def request_identity(scope) -> str:
+    """Користувач з Bearer токена, інакше IP клієнта"""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            subject = verify_token(token) if scheme.lower() == "bearer" and token else None
+            if subject:
+                return f"user:{subject}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def rate_limit_headers(policy: RatePolicy, tokens: float) -> Sequence[Tuple[bytes, bytes]]:
+    reset = math.ceil((policy.capacity - tokens) / policy.refill_per_second)
+    return [
+        (b"ratelimit-limit", str(policy.capacity).encode()),
+        (b"ratelimit-remaining", str(int(tokens)).encode()),
+        (b"ratelimit-reset", str(reset).encode()),
+        (b"ratelimit-policy", f"{policy.capacity};w={policy.period}".encode()),
+    ]
+
+
+class RateLimitMiddleware:
+    """
+    Застосовує політики RateLimiter до запитів.
+
+    Example:
+        >>> app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    """
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        policy = None
+        if scope["type"] == "http" and self.limiter.enabled:
+            policy = self.limiter.policy_for(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, tokens = self.limiter.check(request_identity(scope), policy)
+        headers = rate_limit_headers(policy, tokens)
+
+        if not allowed:
+            retry_after = math.ceil((1 - tokens) / policy.refill_per_second)
+            detail = f"Rate limit exceeded: {policy.capacity} per {policy.period} seconds"
+            body = json.dumps({"detail": detail}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    *headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def default_policies() -> str:
+    """Політики з налаштувань разом з лімітом /users/me"""
+    me = f"GET /api/v1/users/me={settings.rate_limit_me_endpoint}/minute"
+    return ",".join(filter(None, (me, settings.rate_limit_policies)))
 
-limiter = Limiter(key_func=get_remote_address)
 
-def get_rate_limit_for_me():
-    """Rate limit для /me ендпоінту"""
-    return f"{settings.rate_limit_me_endpoint}/minute"
\ No newline at end of file
+limiter = RateLimiter(default_policies(), enabled=settings.rate_limit_enabled)
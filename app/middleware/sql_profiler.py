@@ -0,0 +1,117 @@
+"""
+Профілювання SQL запитів у межах HTTP запиту.
+
+Вмикається для всіх запитів налаштуванням ``sql_profiling_enabled`` або
+для окремого запиту заголовком ``X-Profile-SQL: 1`` (якщо дозволено
+``sql_profiling_header_enabled``). Для профільованого запиту:
+
+* кожен SQL запит записується з тривалістю;
+* форми запитів, що повторюються ``sql_profiling_n_plus_one_threshold``
+  і більше разів, позначаються як ймовірний N+1 (ліниві завантаження
+  ``User.contacts`` / ``Contact.owner`` під час серіалізації тощо);
+* у відповідь додається заголовок ``Server-Timing``;
+* в лог пишеться JSON підсумок запиту.
+"""
+
+import json
+import logging
+from time import perf_counter
+from app.config import settings
+from app.database.query_stats import QueryStats, current_query_stats
+from app.middleware.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile-sql"
+
+
+class SQLProfilerMiddleware:
+    """
+    Чисте ASGI middleware профілювання SQL.
+
+    Має стояти всередині ``MetricsMiddleware``: воно вмикає запис запитів
+    у вже створеному об'єкті статистики, а не замінює його.
+
+    Example:
+        >>> app.add_middleware(SQLProfilerMiddleware)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _is_enabled(self, scope) -> bool:
+        if settings.sql_profiling_enabled:
+            return True
+        if not settings.sql_profiling_header_enabled:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value.lower() in (b"1", b"true", b"yes")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_query_stats.get()
+        token = None
+        if stats is None:
+            stats = QueryStats()
+            token = current_query_stats.set(stats)
+        stats.statements = []
+        status_code = 500
+        started = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._server_timing(stats, started).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_query_stats.reset(token)
+            self._log_summary(scope, stats, status_code, started)
+            stats.statements = None
+
+    @staticmethod
+    def _server_timing(stats: QueryStats, started: float) -> str:
+        """Значення заголовка Server-Timing (тривалості у мілісекундах)"""
+        total_ms = (perf_counter() - started) * 1000
+        db_ms = sum(duration for _, duration in stats.statements) * 1000
+        parts = [
+            f'db;dur={db_ms:.2f};desc="{len(stats.statements)} queries"',
+            f"app;dur={total_ms:.2f}"
+        ]
+        suspects = stats.repeated_shapes(settings.sql_profiling_n_plus_one_threshold)
+        if suspects:
+            parts.append(f'n-plus-one;desc="{len(suspects)} repeated statements"')
+        return ", ".join(parts)
+
+    @staticmethod
+    def _log_summary(scope, stats: QueryStats, status_code: int, started: float):
+        """JSON підсумок профільованого запиту в лог"""
+        suspects = stats.repeated_shapes(settings.sql_profiling_n_plus_one_threshold)
+        summary = {
+            "event": "sql_profile",
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route_template(scope),
+            "status": status_code,
+            "duration_ms": round((perf_counter() - started) * 1000, 2),
+            "queries": len(stats.statements),
+            "db_duration_ms": round(sum(duration for _, duration in stats.statements) * 1000, 2),
+            "statements": [
+                {"sql": statement, "duration_ms": round(duration * 1000, 3)}
+                for statement, duration in stats.statements
+            ],
+            "n_plus_one": [{"sql": shape, "count": count} for shape, count in suspects]
+        }
+        level = logging.WARNING if suspects else logging.INFO
+        logger.log(level, json.dumps(summary, ensure_ascii=False))
@@ -0,0 +1,59 @@
+"""
+Кореневий спан трасування для кожного HTTP запиту.
+
+Всі спани ``traced`` всередині запиту (CRUD, Redis, SMTP, Cloudinary)
+стають дочірніми до нього, а рішення про семплювання приймається один
+раз - тут.
+"""
+
+from app.middleware.metrics import route_template
+from app.services import tracing
+
+
+class TracingMiddleware:
+    """
+    Чисте ASGI middleware, що відкриває спан ``HTTP <method> <route>``.
+
+    Вхідний заголовок ``traceparent`` (W3C Trace Context) продовжує
+    трасу клієнта чи шлюзу.
+
+    Example:
+        >>> app.add_middleware(TracingMiddleware)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        tracer = tracing.get_tracer()
+        if tracer is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry.propagate import extract
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        carrier = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"HTTP {scope['method']}",
+            context=extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]}
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                span.update_name(f"HTTP {scope['method']} {route}")
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
@@ -6,7 +6,7 @@
 """
 
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Date, Text, ForeignKey, DateTime, Index, extract, false, func
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
@@ -22,15 +22,17 @@ class Contact(Base):
         id (int): Унікальний ідентифікатор контакту
         first_name (str): Ім'я контакту (обов'язкове, до 50 символів)
         last_name (str): Прізвище контакту (обов'язкове, до 50 символів)
-        email (str): Email адреса контакту (унікальна, до 100 символів)
+        email (str): Email адреса контакту (унікальна у власника, до 100 символів)
         phone_number (str): Телефонний номер контакту (до 20 символів)
         birth_date (date): Дата народження контакту
         additional_data (str, optional): Додаткові дані про контакт
         owner_id (int): ID власника контакту (зовнішній ключ)
+        sync_seq (int): Номер зміни власника, на якому контакт востаннє змінювався
         owner (relationship): Зв'язок з власником контакту
         
     Note:
-        Email адреса повинна бути унікальною в межах всієї системи.
+        Email адреса унікальна в межах контактів одного власника (без
+        урахування регістру), різні власники можуть мати той самий контакт.
         Контакти автоматично видаляються при видаленні власника.
         
     Example:
@@ -49,17 +51,19 @@ class Contact(Base):
     
     __tablename__ = "contacts"
 
-    id = Column(Integer, primary_key=True, index=True,
+    # У PostgreSQL таблиця секціонована за HASH(owner_id) міграцією f1b6e0d4a873,
+    # первинний ключ там (owner_id, id); id лишається унікальним завдяки послідовності
+    id = Column(Integer, primary_key=True,
                doc="Унікальний ідентифікатор контакту")
     
-    first_name = Column(String(50), nullable=False, index=True,
-                       doc="Ім'я контакту (обов'язкове, індексоване для пошуку)")
+    first_name = Column(String(50), nullable=False,
+                       doc="Ім'я контакту (обов'язкове)")
     
-    last_name = Column(String(50), nullable=False, index=True,
-                      doc="Прізвище контакту (обов'язкове, індексоване для пошуку)")
+    last_name = Column(String(50), nullable=False,
+                      doc="Прізвище контакту (обов'язкове)")
     
-    email = Column(String(100), unique=True, nullable=False, index=True,
-                  doc="Email адреса контакту (унікальна, індексована)")
+    email = Column(String(100), nullable=False,
+                  doc="Email адреса контакту (унікальна в межах власника без урахування регістру)")
     
     phone_number = Column(String(20), nullable=False,
                          doc="Телефонний номер контакту")
@@ -73,9 +77,32 @@ class Contact(Base):
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False,
                      doc="ID власника контакту (зовнішній ключ на users.id)")
     
+    sync_seq = Column(Integer, nullable=False, default=0, server_default="0",
+                      doc="Номер зміни власника (для дельта-синхронізації)")
+    
     owner = relationship("User", back_populates="contacts",
                         doc="Власник контакту (користувач системи)")
     
+    # Всі запити контактів обмежені власником, тому owner_id - перша колонка
+    # кожного індексу: список за іменем читається з індексу вже відсортованим,
+    # а окремі індекси по first_name/last_name лише дорожчали записи.
+    # Пошук за (owner_id, id) обслуговує первинний ключ - окремий індекс не потрібен
+    __table_args__ = (
+        Index("ix_contacts_owner_sync_seq", "owner_id", "sync_seq"),
+        Index("ix_contacts_owner_name", "owner_id", "last_name", "first_name", "id"),
+        # Ціль ON CONFLICT у create_contact/create_contacts
+        Index("uq_contacts_owner_email", "owner_id", func.lower(email), unique=True),
+        Index(
+            "ix_contacts_owner_birthday",
+            "owner_id",
+            extract("month", birth_date),
+            extract("day", birth_date)
+        ),
+    )
+    # Ідентичність рядка в ORM - (owner_id, id), як первинний ключ секціонованої
+    # таблиці: UPDATE/DELETE/refresh містять owner_id і читають одну секцію
+    __mapper_args__ = {"primary_key": [owner_id, id]}
+    
     @property
     def full_name(self) -> str:
         """
@@ -185,4 +212,142 @@ class Contact(Base):
             'owner_id': self.owner_id,
             'full_name': self.full_name,
             'age': self.age
-        }
\ No newline at end of file
+        }
+
+
+class ContactSyncState(Base):
+    """
+    Лічильник змін контактів для кожного власника.
+    
+    Кожен запис/оновлення/видалення контакту збільшує ``change_seq`` на 1,
+    тож клієнт може запитати тільки зміни після відомого йому номера.
+    
+    Attributes:
+        owner_id (int): ID власника (первинний ключ)
+        change_seq (int): Останній виданий номер зміни
+        pruned_seq (int): Найбільший номер зміни серед видалених за терміном tombstones
+    """
+    
+    __tablename__ = "contact_sync_state"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True,
+                      doc="ID власника контактів")
+    change_seq = Column(Integer, nullable=False, default=0,
+                        doc="Останній виданий номер зміни")
+    pruned_seq = Column(Integer, nullable=False, default=0, server_default="0",
+                        doc="Клієнт з меншим since має синхронізуватись повністю")
+
+
+class ContactTombstone(Base):
+    """
+    Запис про видалений контакт (tombstone) для дельта-синхронізації.
+    
+    Attributes:
+        id (int): Унікальний ідентифікатор запису
+        owner_id (int): ID власника видаленого контакту
+        contact_id (int): ID видаленого контакту
+        sync_seq (int): Номер зміни, на якому контакт видалено
+        deleted_at (datetime): Час видалення
+    """
+    
+    __tablename__ = "contact_tombstones"
+    __table_args__ = (
+        Index("ix_contact_tombstones_owner_sync_seq", "owner_id", "sync_seq"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+                      doc="ID власника видаленого контакту")
+    contact_id = Column(Integer, nullable=False,
+                        doc="ID видаленого контакту")
+    sync_seq = Column(Integer, nullable=False,
+                      doc="Номер зміни, на якому контакт видалено")
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(),
+                        doc="Час видалення контакту")
+
+
+class ContactFacetCount(Base):
+    """
+    Кількість контактів власника за першою літерою прізвища.
+    
+    Підтримується в усіх операціях запису контактів, тому загальна
+    кількість контактів та фасети A-Z читаються без сканування
+    списку контактів власника.
+    
+    Attributes:
+        owner_id (int): ID власника
+        initial (str): Перша літера прізвища у верхньому регістрі
+        count (int): Кількість контактів з цією літерою
+    """
+    
+    __tablename__ = "contact_facet_counts"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True,
+                      doc="ID власника контактів")
+    initial = Column(String(1), primary_key=True,
+                     doc="Перша літера прізвища (верхній регістр)")
+    count = Column(Integer, nullable=False, default=0,
+                   doc="Кількість контактів з цією літерою")
+
+
+class OwnerShardAssignment(Base):
+    """
+    Явне розміщення власника на шарді контактів (поверх consistent hashing).
+    
+    Рядок з'являється, коли власника переносять між шардами; без нього
+    шард визначає кільце хешів. Таблиця живе в основній базі разом з users.
+    
+    Attributes:
+        owner_id (int): ID власника (первинний ключ)
+        shard (str): Назва шарда з CONTACT_SHARDS
+        moving (bool): Іде перенесення - записи контактів власника відхиляються
+        updated_at (datetime): Час останньої зміни
+    """
+    
+    __tablename__ = "owner_shard_assignments"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True,
+                      doc="ID власника контактів")
+    shard = Column(String(50), nullable=False,
+                   doc="Назва шарда, на якому лежать контакти власника")
+    moving = Column(Boolean, nullable=False, default=False, server_default=false(),
+                    doc="Контакти власника зараз переносяться")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(),
+                        doc="Час останньої зміни розміщення")
+
+
+class ContactIdAllocator(Base):
+    """
+    Лічильник глобальних ID контактів для шардів (один рядок в основній базі).
+    
+    Послідовність кожного шарда видає ID незалежно, тож ID збігались би між
+    шардами. З CONTACT_SHARDS нові контакти отримують ID блоками з цього
+    лічильника - вони унікальні на всіх шардах і не змінюються при
+    перенесенні власника.
+    
+    Attributes:
+        id (int): Завжди 1
+        last_id (int): Останній виданий ID контакту
+    """
+    
+    __tablename__ = "contact_id_allocator"
+
+    id = Column(Integer, primary_key=True, default=1)
+    last_id = Column(Integer, nullable=False, default=0,
+                     doc="Останній виданий ID контакту")
+
+def contact_initial(last_name: Optional[str]) -> str:
+    """
+    Літера фасету для прізвища.
+    
+    Example:
+        >>> contact_initial('петренко')
+        'П'
+        >>> contact_initial('ßmith')
+        'S'
+        >>> contact_initial('')
+        '#'
+    """
+    # upper() перед зрізом: "ß".upper() == "SS" не влазить у String(1)
+    return (last_name or "").upper()[:1] or "#"
+
@@ -5,7 +5,7 @@
 включаючи ролі, аутентифікацію та управління профілями.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func, Enum
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 import enum
@@ -40,12 +40,12 @@ class User(Base):
         username (str): Ім'я користувача (унікальне)
         email (str): Email адреса (унікальна)
         hashed_password (str): Хешований пароль
-        reset_password_token (str, optional): Токен для скидання пароля
+        reset_password_token (str, optional): SHA-256 дайджест токена скидання пароля
         reset_password_expires (datetime, optional): Час закінчення дії токена скидання
         avatar_url (str, optional): URL аватара користувача
         is_verified (bool): Чи верифікований email користувача
         role (UserRole, optional): Роль користувача в системі
-        verification_token (str, optional): Токен для верифікації email
+        verification_token (str, optional): SHA-256 дайджест токена верифікації email
         created_at (datetime): Час створення запису
         updated_at (datetime, optional): Час останнього оновлення
         contacts (relationship): Зв'язок з контактами користувача
@@ -76,8 +76,8 @@ class User(Base):
                            doc="Хешований пароль користувача (bcrypt)")
     
     # Поля для скидання пароля
-    reset_password_token = Column(String(255), nullable=True,
-                                doc="Токен для скидання пароля (тимчасовий)")
+    reset_password_token = Column(String(64), nullable=True,
+                                doc="SHA-256 дайджест токена для скидання пароля (тимчасовий)")
     reset_password_expires = Column(DateTime(timezone=True), nullable=True,
                                   doc="Час закінчення дії токена скидання пароля")
     
@@ -87,8 +87,8 @@ class User(Base):
                         doc="Чи верифікований email користувача")
     role = Column(Enum(UserRole), nullable=True, default=UserRole.USER,
                  doc="Роль користувача в системі")
-    verification_token = Column(String(255), nullable=True,
-                              doc="Токен для верифікації email адреси")
+    verification_token = Column(String(64), nullable=True,
+                              doc="SHA-256 дайджест токена для верифікації email адреси")
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(),
                        doc="Час створення запису користувача")
@@ -99,6 +99,26 @@ class User(Base):
     contacts = relationship("Contact", back_populates="owner", cascade="all, delete-orphan",
                           doc="Всі контакти користувача (каскадне видалення)")
 
+    # Часткові індекси: токен мають лише одиниці користувачів, тож індекси
+    # крихітні, а пошук за токеном не сканує всю таблицю
+    __table_args__ = (
+        Index(
+            "ix_users_verification_token", "verification_token",
+            postgresql_where=verification_token.isnot(None),
+            sqlite_where=verification_token.isnot(None)
+        ),
+        Index(
+            "ix_users_reset_password_token", "reset_password_token",
+            postgresql_where=reset_password_token.isnot(None),
+            sqlite_where=reset_password_token.isnot(None)
+        ),
+        Index(
+            "ix_users_reset_password_expires", "reset_password_expires",
+            postgresql_where=reset_password_token.isnot(None),
+            sqlite_where=reset_password_token.isnot(None)
+        ),
+    )
+
     def is_admin(self) -> bool:
         """
         Перевіряє чи користувач є адміністратором.
@@ -1,6 +1,13 @@
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, Field, validator
 from datetime import date
-from typing import Optional
+from typing import List, Optional
+
+def normalize_name(value: str) -> str:
+    """Ім'я/прізвище як у відповідях API: без пробілів по краях, з великої літери"""
+    return value.strip().title()
+
+# Нормалізація полів для швидкого шляху (rows_to_json), що оминає ContactResponse
+CONTACT_FIELD_NORMALIZERS = {"first_name": normalize_name, "last_name": normalize_name}
 
 class ContactBase(BaseModel):
     first_name: str
@@ -14,7 +21,7 @@ class ContactBase(BaseModel):
     def validate_name(cls, v):
         if not v.strip():
             raise ValueError("Field should not be ampty!")
-        return v.strip().title()
+        return normalize_name(v)
 
 @validator('phone_number')
 def validate_phone(cls, v):
@@ -39,10 +46,36 @@ class ContactUpdate(BaseModel):
     def validate_name(cls, v):
         if v is not None and not v.strip():
             raise ValueError("Name cannot be empty")
-        return v.strip().title() if v else v
+        return normalize_name(v) if v else v
     
 class ContactResponse(ContactBase):
     id: int
     owner_id: int
     class Config:
         from_attributes = True
+
+class ContactPartialResponse(BaseModel):
+    """Контакт у списку з fields=: присутні лише запитані поля, id - завжди"""
+    id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    phone_number: Optional[str] = None
+    birth_date: Optional[date] = None
+    additional_data: Optional[str] = None
+    owner_id: Optional[int] = None
+
+class ContactChangesResponse(BaseModel):
+    """Зміни контактів після вказаного номера (дельта-синхронізація)"""
+    current_seq: int
+    upserts: List[ContactResponse]
+    deleted_ids: List[int]
+
+class ContactBulkCreate(BaseModel):
+    """Пакет нових контактів (дублікати email пропускаються, а не відхиляють пакет)"""
+    contacts: List[ContactCreate] = Field(..., min_length=1, max_length=500)
+
+class ContactBulkResponse(BaseModel):
+    """Результат масового створення: створені контакти та email-и пропущених дублікатів"""
+    created: List[ContactResponse]
+    duplicates: List[str]
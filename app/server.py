@@ -0,0 +1,135 @@
+"""
+Production сервер: gunicorn з uvicorn воркерами.
+
+Master процес не імпортує застосунок (``server_preload_app=False``), тож
+engine БД та пул Redis створюються в кожному воркері вже
+після fork. Якщо preload увімкнено, ``post_fork`` відкидає успадковані
+з'єднання - сокети не можна ділити між процесами.
+
+Метрики Prometheus воркерів збираються через multiprocess режим:
+``/metrics`` будь-якого воркера повертає суму по всіх.
+"""
+
+import logging
+import multiprocessing
+import glob
+import os
+import tempfile
+from typing import Any, Dict
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def default_workers() -> int:
+    """Класична формула gunicorn: 2 * CPU + 1"""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def worker_class():
+    """Uvicorn воркер з uvloop та httptools замість автовибору"""
+    from uvicorn.workers import UvicornWorker
+
+    class UvloopWorker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    return UvloopWorker
+
+
+def reset_after_fork():
+    """Відкидає з'єднання, успадковані від master (лише для preload)"""
+    from app.database.connection import engine, replicas
+    from app.database.sharding import shards
+
+    # Пул redis-py сам відкидає з'єднання чужого процесу (перевірка pid)
+    engine.dispose(close=False)
+    replicas.dispose(close=False)
+    shards.dispose(close=False)
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        reset_after_fork()
+
+
+def child_exit(server, worker):
+    """Файли метрик завершеного воркера більше не оновлюються"""
+    if os.environ.get(PROMETHEUS_MULTIPROC_ENV):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def prepare_metrics_dir(config: Settings = settings) -> str:
+    """
+    Готує каталог multiprocess метрик до запуску воркерів.
+
+    Файли метрик попереднього запуску (``*.db``) видаляються, бо зсунули б
+    лічильники. Решту вмісту каталогу не чіпаємо - його може вказати оператор.
+
+    Returns:
+        str: Шлях, експортований у PROMETHEUS_MULTIPROC_DIR
+    """
+    path = config.prometheus_multiproc_dir or tempfile.mkdtemp(prefix="contacts-metrics-")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(glob.escape(path), "*.db")):
+        os.remove(stale)
+    os.environ[PROMETHEUS_MULTIPROC_ENV] = path
+    return path
+
+
+def gunicorn_options(config: Settings = settings, **overrides) -> Dict[str, Any]:
+    """
+    Налаштування gunicorn із Settings.
+
+    Args:
+        config (Settings): Налаштування застосунку
+        **overrides: Значення, що мають пріоритет (аргументи командного рядка)
+
+    Returns:
+        Dict[str, Any]: Опції для gunicorn Config
+
+    Example:
+        >>> gunicorn_options(workers=4)["workers"]
+        4
+    """
+    options = {
+        "bind": f"{config.server_host}:{config.server_port}",
+        "workers": config.server_workers or default_workers(),
+        "keepalive": config.server_keepalive_seconds,
+        "backlog": config.server_backlog,
+        "max_requests": config.server_max_requests,
+        "max_requests_jitter": config.server_max_requests_jitter,
+        "graceful_timeout": config.server_graceful_timeout_seconds,
+        "timeout": config.server_timeout_seconds,
+        "preload_app": config.server_preload_app,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
+
+
+def run(**overrides):
+    """Запускає gunicorn master з воркерами застосунку"""
+    from gunicorn.app.base import BaseApplication
+
+    class ContactsApplication(BaseApplication):
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    prepare_metrics_dir()
+    options = gunicorn_options(worker_class=worker_class(), **overrides)
+    logger.info(f"Starting {options['workers']} workers on {options['bind']}")
+    ContactsApplication(options).run()
@@ -1,4 +1,6 @@
+import hashlib
 import logging
+from typing import Optional
 from app.services.redis import redis_service
 
 logger = logging.getLogger(__name__)
@@ -6,4 +8,25 @@ logger = logging.getLogger(__name__)
 def invalidate_user_cache(user_email: str):
     """Функція для інвалідації кешу користувача"""
     redis_service.delete_user_cache(user_email)
-    logger.debug(f"Cache invalidated for user {user_email}")
\ No newline at end of file
+    logger.debug(f"Cache invalidated for user {user_email}")
+
+def contacts_cache_key(owner_id: int, scope: str, **params) -> Optional[str]:
+    """
+    Ключ кешу відповіді зі списком контактів.
+    
+    Ключ містить поточну версію контактів власника, тому після будь-якого
+    запису (bump версії) старі відповіді більше не читаються і просто
+    відходять за TTL. Повертає None, якщо Redis недоступний.
+    """
+    version = redis_service.get_contacts_version(owner_id)
+    if version is None:
+        return None
+    
+    query = "&".join(f"{name}={params[name]}" for name in sorted(params))
+    digest = hashlib.sha1(query.encode()).hexdigest()[:16]
+    return f"contacts:{owner_id}:v{version}:{scope}:{digest}"
+
+def invalidate_contacts_cache(owner_id: int):
+    """Інвалідація всіх кешованих списків контактів власника"""
+    redis_service.bump_contacts_version(owner_id)
+    logger.debug(f"Contacts cache invalidated for owner {owner_id}")
@@ -1,16 +1,22 @@
+from functools import lru_cache
 import cloudinary
 import cloudinary.uploader
 from app.config import settings
+from app.services.tracing import traced
 
-# Ініціалізація Cloudinary
-cloudinary.config(
-    cloud_name=settings.cloudinary_name,
-    api_key=settings.cloudinary_api_key,
-    api_secret=settings.cloudinary_api_secret
-)
+@lru_cache(maxsize=1)
+def configure_cloudinary():
+    """Ініціалізація Cloudinary при першому використанні (або прогріві)"""
+    cloudinary.config(
+        cloud_name=settings.cloudinary_name,
+        api_key=settings.cloudinary_api_key,
+        api_secret=settings.cloudinary_api_secret
+    )
 
+@traced()
 def upload_avatar(file_content: bytes, filename: str) -> str:
     """Завантаження аватара в Cloudinary"""
+    configure_cloudinary()
     try:
         result = cloudinary.uploader.upload(
             file_content,
@@ -25,8 +31,10 @@ def upload_avatar(file_content: bytes, filename: str) -> str:
     except Exception as e:
         raise Exception(f"Failed to upload avatar: {str(e)}")
 
+@traced()
 def delete_avatar(public_id: str):
     """Видалення аватара з Cloudinary"""
+    configure_cloudinary()
     try:
         cloudinary.uploader.destroy(public_id)
     except Exception:
@@ -1,20 +1,26 @@
+from functools import lru_cache
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from app.config import settings
 from typing import List
+from app.services.tracing import traced
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.mail_username,
-    MAIL_PASSWORD=settings.mail_password,
-    MAIL_FROM=settings.mail_from,
-    MAIL_PORT=settings.mail_port,
-    MAIL_SERVER=settings.mail_server,
-    MAIL_FROM_NAME="Contact Management API",
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True
-)
+@lru_cache(maxsize=1)
+def get_mail_config() -> ConnectionConfig:
+    """Налаштування пошти, що перевіряються при першій відправці (або прогріві)"""
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.mail_username,
+        MAIL_PASSWORD=settings.mail_password,
+        MAIL_FROM=settings.mail_from,
+        MAIL_PORT=settings.mail_port,
+        MAIL_SERVER=settings.mail_server,
+        MAIL_FROM_NAME="Contact Management API",
+        MAIL_STARTTLS=True,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=True,
+        VALIDATE_CERTS=True
+    )
 
+@traced()
 async def send_verification_email(email: str, token: str):
     """Відправка email для верифікації"""
     verification_url = f"http://localhost:8000/api/v1/auth/verify-email?token={token}"
@@ -39,9 +45,10 @@ async def send_verification_email(email: str, token: str):
         subtype="html"
     )
     
-    fm = FastMail(conf)
+    fm = FastMail(get_mail_config())
     await fm.send_message(message)
 
+@traced()
 async def send_password_reset_email(email: str, token: str):
     """Відправка email для скидання пароля"""
     reset_url = f"http://localhost:8000/api/v1/auth/reset-password?token={token}"
@@ -68,5 +75,5 @@ async def send_password_reset_email(email: str, token: str):
         subtype="html"
     )
     
-    fm = FastMail(conf)
+    fm = FastMail(get_mail_config())
     await fm.send_message(message)
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Метрики Prometheus для API.
+
+Всі метрики створюються один раз при імпорті модуля. Дочірні метрики з
+мітками (``.labels(...)``) кешуються, тож на гарячому шляху запиту
+лишаються тільки ``observe``/``inc`` без пошуку міток і без створення
+нових об'єктів метрик.
+"""
+
+from functools import wraps
+from time import perf_counter
+from typing import Dict, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Тривалість HTTP запиту за маршрутом",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Кількість HTTP запитів за маршрутом і статусом",
+    ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Кількість HTTP запитів, що обробляються зараз",
+    multiprocess_mode="livesum"  # Сума по живих воркерах gunicorn
+)
+CONCURRENCY_LIMIT = Gauge(
+    "http_concurrency_limit",
+    "Поточний адаптивний ліміт одночасних запитів",
+    multiprocess_mode="livesum"
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Запити, відхилені з 503 через перевантаження",
+    ["reason"]
+)
+COMPRESSION_BYTES = Counter(
+    "http_response_compression_bytes_total",
+    "Байти тіла відповіді до (original) і після (compressed) стиснення",
+    ["encoding", "stage"]
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "Кількість SQL запитів на один HTTP запит",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS
+)
+DB_DURATION_PER_REQUEST = Histogram(
+    "http_request_db_duration_seconds",
+    "Сумарний час SQL запитів на один HTTP запит",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Тривалість операцій RedisService",
+    ["operation"],
+    buckets=REDIS_BUCKETS
+)
+
+
+class RouteMetrics:
+    """Заздалегідь прив'язані дочірні метрики одного маршруту"""
+
+    __slots__ = ("method", "route", "duration", "db_queries", "db_duration", "_requests")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.duration = HTTP_REQUEST_DURATION.labels(method, route)
+        self.db_queries = DB_QUERIES_PER_REQUEST.labels(method, route)
+        self.db_duration = DB_DURATION_PER_REQUEST.labels(method, route)
+        self._requests: Dict[int, Counter] = {}
+
+    def requests(self, status: int):
+        """Лічильник запитів маршруту з даним статусом"""
+        counter = self._requests.get(status)
+        if counter is None:
+            counter = self._requests[status] = HTTP_REQUESTS_TOTAL.labels(
+                self.method, self.route, str(status)
+            )
+        return counter
+
+
+_route_metrics: Dict[Tuple[str, str], RouteMetrics] = {}
+
+
+def route_metrics(method: str, route: str) -> RouteMetrics:
+    """
+    Дочірні метрики маршруту (створюються при першому запиті до маршруту).
+
+    Args:
+        method: HTTP метод
+        route: Шаблон маршруту (``/api/v1/contacts/{contact_id}``), а не
+            фактичний шлях - інакше кількість серій росте з кожним ID
+    """
+    key = (method, route)
+    metrics = _route_metrics.get(key)
+    if metrics is None:
+        metrics = _route_metrics[key] = RouteMetrics(method, route)
+    return metrics
+
+
+def observe_redis(operation: str):
+    """
+    Декоратор методу RedisService, що записує тривалість операції.
+
+    Example:
+        >>> @observe_redis("get_user_cache")
+        ... def get_user_cache(self, user_email): ...
+    """
+    histogram = REDIS_COMMAND_DURATION.labels(operation)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - started)
+        return wrapper
+
+    return decorator
@@ -1,34 +1,120 @@
-import redis
 import json
 import logging
-from typing import Optional, Any
+from time import monotonic
+from typing import TYPE_CHECKING, Optional, Any, Tuple
 from app.config import settings
+from app.services.metrics import observe_redis
+from app.services.tracing import traced
+
+if TYPE_CHECKING:
+    import redis
 
 logger = logging.getLogger(__name__)
 
+# Token bucket за один round trip: поповнення, списання токена і TTL атомарно.
+# Час береться з Redis, тож годинники воркерів не впливають на ліміт.
+# Дробові числа Lua віддає рядком - інакше Redis обрізав би їх до цілих.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + math.max(0, now - tonumber(state[2])) * rate)
+end
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, tostring(tokens)}
+"""
+
 class RedisService:
+    """
+    Доступ до Redis з лінивим підключенням.
+
+    Імпорт модуля не звертається до Redis: клієнт створюється при першому
+    використанні (або під час прогріву в lifespan застосунку). Після
+    невдалого підключення наступна спроба - не раніше ніж через
+    ``redis_retry_seconds``, щоб запити не чекали таймаут щоразу.
+    Сам пакет redis теж імпортується лише при підключенні.
+    """
+
     def __init__(self):
-        self.redis_client: Optional[redis.Redis] = None
-        self._connect()
+        self._client: Optional["redis.Redis"] = None
+        self._pool: Optional["redis.ConnectionPool"] = None
+        self._retry_at = 0.0
+        self._token_bucket = None
+
+    @property
+    def redis_client(self) -> Optional["redis.Redis"]:
+        if self._client is None and monotonic() >= self._retry_at:
+            self._connect()
+        return self._client
+
+    @redis_client.setter
+    def redis_client(self, client: Optional["redis.Redis"]):
+        self._client = client
     
     def _connect(self):
         """Підключення до Redis"""
+        import redis
+
         try:
-            self.redis_client = redis.Redis(
+            self._pool = redis.ConnectionPool(
                 host=settings.redis_host,
                 port=settings.redis_port,
                 db=settings.redis_db,
                 password=settings.redis_password,
                 decode_responses=True,
                 socket_connect_timeout=5,
-                socket_timeout=5
+                socket_timeout=5,
+                max_connections=settings.redis_max_connections
             )
+            self._client = redis.Redis(connection_pool=self._pool)
             # Перевірка з'єднання
-            self.redis_client.ping()
+            self._client.ping()
             logger.info("Successfully connected to Redis")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
-            self.redis_client = None
+            self._client = None
+            self._retry_at = monotonic() + settings.redis_retry_seconds
+
+    def prewarm(self, size: int) -> int:
+        """
+        Відкриває до size з'єднань пулу заздалегідь.
+
+        Returns:
+            int: Кількість відкритих з'єднань
+        """
+        if not self.redis_client or size <= 0:
+            return 0
+        connections = []
+        try:
+            for _ in range(size):
+                connection = self._pool.get_connection("PING")
+                connections.append(connection)
+        except Exception as e:
+            logger.warning(f"Redis pool prewarm stopped at {len(connections)} connections: {e}")
+        finally:
+            for connection in connections:
+                self._pool.release(connection)
+        return len(connections)
+
+    def close(self):
+        """Закриває з'єднання пулу; наступне використання підключиться знову"""
+        if self._pool is not None:
+            self._pool.disconnect()
+        self._client = None
+        self._pool = None
+        self._retry_at = 0.0
     
     def is_connected(self) -> bool:
         """Перевірка чи підключений Redis"""
@@ -40,6 +126,8 @@ class RedisService:
         except:
             return False
     
+    @traced()
+    @observe_redis("set_user_cache")
     def set_user_cache(self, user_email: str, user_data: dict, expire_minutes: Optional[int] = None) -> bool:
         """Кешування даних користувача"""
         if not self.is_connected():
@@ -61,6 +149,8 @@ class RedisService:
             logger.error(f"Failed to cache user {user_email}: {e}")
             return False
     
+    @traced()
+    @observe_redis("get_user_cache")
     def get_user_cache(self, user_email: str) -> Optional[dict]:
         """Отримання користувача з кешу"""
         if not self.is_connected():
@@ -81,6 +171,8 @@ class RedisService:
             logger.error(f"Failed to get user {user_email} from cache: {e}")
             return None
     
+    @traced()
+    @observe_redis("delete_user_cache")
     def delete_user_cache(self, user_email: str) -> bool:
         """Видалення користувача з кешу"""
         if not self.is_connected():
@@ -95,6 +187,120 @@ class RedisService:
             logger.error(f"Failed to delete user {user_email} from cache: {e}")
             return False
     
+    @traced()
+    @observe_redis("get_contacts_version")
+    def get_contacts_version(self, owner_id: int) -> Optional[int]:
+        """Поточна версія контактів власника (частина ключа кешу відповідей)"""
+        if not self.redis_client:
+            return None
+        
+        try:
+            version = self.redis_client.get(f"contacts_version:{owner_id}")
+            return int(version) if version else 0
+        except Exception as e:
+            logger.error(f"Failed to get contacts version for owner {owner_id}: {e}")
+            return None
+    
+    @traced()
+    @observe_redis("bump_contacts_version")
+    def bump_contacts_version(self, owner_id: int) -> bool:
+        """Атомарно збільшує версію контактів власника (інвалідує всі його кешовані відповіді)"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.incr(f"contacts_version:{owner_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to bump contacts version for owner {owner_id}: {e}")
+            return False
+    
+    @traced()
+    @observe_redis("set_primary_pin")
+    def set_primary_pin(self, subject: str, seconds: int) -> bool:
+        """Закріплює читання користувача за primary на seconds після його запису"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.setex(f"primary_pin:{subject}", seconds, 1)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to pin primary reads for {subject}: {e}")
+            return False
+    
+    @traced()
+    @observe_redis("has_primary_pin")
+    def has_primary_pin(self, subject: str) -> Optional[bool]:
+        """Чи читає користувач зараз з primary (None - Redis недоступний)"""
+        if not self.redis_client:
+            return None
+        
+        try:
+            return bool(self.redis_client.exists(f"primary_pin:{subject}"))
+        except Exception as e:
+            logger.error(f"Failed to check primary pin for {subject}: {e}")
+            return None
+    
+    @traced()
+    @observe_redis("get_response_cache")
+    def get_response_cache(self, key: str) -> Optional[bytes]:
+        """Отримання готової JSON відповіді з кешу"""
+        if not self.redis_client:
+            return None
+        
+        try:
+            cached = self.redis_client.get(key)
+            return cached.encode() if cached is not None else None
+        except Exception as e:
+            logger.error(f"Failed to get response {key} from cache: {e}")
+            return None
+    
+    @traced()
+    @observe_redis("set_response_cache")
+    def set_response_cache(self, key: str, payload: bytes, expire_seconds: Optional[int] = None) -> bool:
+        """Кешування готової JSON відповіді"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.setex(
+                name=key,
+                time=expire_seconds or settings.contacts_cache_expire_seconds,
+                value=payload
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache response {key}: {e}")
+            return False
+    
+    @traced()
+    @observe_redis("take_token")
+    def take_token(self, key: str, capacity: int, refill_per_second: float) -> Optional[Tuple[bool, float]]:
+        """
+        Списує токен з бакета rate limiter.
+
+        Returns:
+            Optional[Tuple[bool, float]]: (дозволено, залишок токенів);
+                None - Redis недоступний, рішення за локальним лімітером
+        """
+        client = self.redis_client
+        if not client:
+            return None
+
+        try:
+            if self._token_bucket is None:
+                self._token_bucket = client.register_script(TOKEN_BUCKET_SCRIPT)
+            allowed, tokens = self._token_bucket(
+                keys=[f"rate:{key}"], args=[capacity, refill_per_second], client=client
+            )
+            return bool(allowed), float(tokens)
+        except Exception as e:
+            logger.error(f"Failed to take rate limit token {key}: {e}")
+            return None
+    
+    @traced()
+    @observe_redis("clear_all_cache")
     def clear_all_cache(self) -> bool:
         """Очистка всього кешу (для розробки)"""
         if not self.is_connected():
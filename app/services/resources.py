@@ -0,0 +1,78 @@
+"""
+Ресурси застосунку під керуванням FastAPI lifespan.
+
+Імпорт модулів не відкриває з'єднань: engine БД, пул Redis, поштовий
+клієнт і Cloudinary створюються ліниво. Під час старту контейнер
+налаштовує трасування і запускає фоновий прогрів, не затримуючи прийом
+запитів. Прогрів
+підключається до Redis і відкриває ``db_pool_min_size`` та
+``redis_pool_min_size`` з'єднань. Запит, що прийшов раніше, створить
+потрібний ресурс сам. Пошта й Cloudinary не прогріваються - вони
+потрібні рідко, і їх імпорт лише сповільнив би старт.
+
+Під час зупинки сервер спершу завершує активні запити. Після цього
+контейнер зупиняє фонові задачі, закриває пули з'єднань і файл трас.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.connection import engine, prewarm_pool, replicas
+from app.database.sharding import shards
+from app.services.redis import redis_service
+from app.services.token_sweeper import start_token_sweeper, stop_token_sweeper
+from app.services.tracing import setup_tracing, shutdown_tracing
+
+logger = logging.getLogger(__name__)
+
+
+class Resources:
+    """Прогрів і закриття спільних ресурсів процесу"""
+
+    def __init__(self):
+        self._warmup: Optional[asyncio.Task] = None
+
+    def warm_up(self):
+        """Створює клієнти та відкриває мінімум з'єднань (помилки лише логуються)"""
+        database = prewarm_pool(settings.db_pool_min_size)
+        cache = redis_service.prewarm(settings.redis_pool_min_size)
+        logger.info(f"Resources warmed up: {database} DB and {cache} Redis connections")
+
+    async def start(self):
+        # Потік BatchSpanProcessor і файл трас - у процесі, що обслуговує запити
+        setup_tracing()
+        start_token_sweeper()
+        self._warmup = asyncio.get_running_loop().create_task(run_in_threadpool(self.warm_up))
+
+    async def stop(self):
+        await stop_token_sweeper()
+        if self._warmup is not None:
+            try:
+                await self._warmup
+            except Exception as e:
+                logger.warning(f"Resource warm-up failed: {e}")
+            self._warmup = None
+        redis_service.close()
+        replicas.dispose()
+        shards.dispose()
+        engine.dispose()
+        shutdown_tracing()
+        logger.info("Resources closed")
+
+
+resources = Resources()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Lifespan FastAPI: прогрів після старту, закриття пулів після зупинки"""
+    await resources.start()
+    try:
+        yield
+    finally:
+        await resources.stop()
@@ -0,0 +1,66 @@
+"""
+Періодичне очищення прострочених токенів скидання пароля.
+
+Прострочений токен і так не приймається (перевірка expires у запиті),
+але без прибирання рядки з токенами накопичуються в частковому індексі
+``ix_users_reset_password_token``, і він перестає бути крихітним.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.crud.users import clear_expired_reset_tokens
+from app.database.connection import get_db_session
+
+logger = logging.getLogger(__name__)
+
+_task: Optional[asyncio.Task] = None
+
+
+def sweep_expired_reset_tokens(batch_size: int) -> int:
+    """Один прохід прибиральника у власній сесії"""
+    db = get_db_session()
+    try:
+        return clear_expired_reset_tokens(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+async def _sweep_forever(interval: float, batch_size: int):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            cleared = await run_in_threadpool(sweep_expired_reset_tokens, batch_size)
+        except Exception as e:
+            logger.warning(f"Reset token sweep failed: {e}")
+            continue
+        if cleared:
+            logger.info(f"Cleared {cleared} expired reset tokens")
+
+
+def start_token_sweeper():
+    """Запускає прибиральника у фоновій задачі (0 в інтервалі - вимкнено)"""
+    global _task
+    interval = settings.reset_token_sweep_interval_seconds
+    if interval <= 0 or _task is not None:
+        return
+    _task = asyncio.get_running_loop().create_task(
+        _sweep_forever(interval, settings.reset_token_sweep_batch_size)
+    )
+
+
+async def stop_token_sweeper():
+    """Зупиняє фонову задачу прибиральника"""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,158 @@
+"""
+Трасування запитів через OpenTelemetry.
+
+Спани створюються навколо ``get_current_user``, CRUD функцій, методів
+``RedisService``, відправки email та завантаження аватарів, тож по
+трасі видно, куди пішов час запиту: bcrypt, PostgreSQL, Redis, SMTP чи
+Cloudinary.
+
+Налаштування (``app.config.Settings``):
+
+* ``tracing_enabled`` - вмикає трасування;
+* ``tracing_exporter`` - ``memory`` (у пам'яті процесу, для тестів),
+  ``file`` (JSON Lines у ``tracing_file_path``), ``console`` або ``otlp``
+  (потрібен пакет ``opentelemetry-exporter-otlp``);
+* ``tracing_sample_ratio`` - частка трас, що записуються. Рішення
+  приймається для кореневого спану запиту, дочірні спани його
+  успадковують, тому при високому RPS накладні витрати обмежені.
+
+Поки трасування не налаштоване, декоратор ``traced`` лише викликає
+функцію без створення спанів.
+"""
+
+import inspect
+import logging
+from functools import wraps
+from typing import Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tracer після setup_tracing() (None - трасування вимкнене)
+_tracer = None
+_provider = None
+_memory_exporter = None
+# Файл file експортера - закривається в shutdown_tracing()
+_trace_file = None
+
+
+def _create_exporter(name: str):
+    """Експортер спанів за назвою з налаштувань"""
+    global _memory_exporter, _trace_file
+
+    if name == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        _memory_exporter = InMemorySpanExporter()
+        return _memory_exporter
+    if name == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        _trace_file = open(settings.tracing_file_path, "a", encoding="utf-8")
+        # Один спан - один рядок JSON (JSON Lines), а не багаторядковий JSON
+        return ConsoleSpanExporter(
+            out=_trace_file,
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    raise ValueError(f"Unknown tracing exporter: {name}")
+
+
+def setup_tracing() -> bool:
+    """
+    Налаштовує провайдер трасування за налаштуваннями.
+
+    Returns:
+        bool: True якщо трасування увімкнене
+    """
+    global _tracer, _provider
+
+    shutdown_tracing()
+    if not settings.tracing_enabled:
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.error("Tracing enabled but opentelemetry-sdk is not installed")
+        return False
+
+    exporter = _create_exporter(settings.tracing_exporter)
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+    )
+    # Пам'ять - синхронно (спани одразу видно в тестах), решта - пакетами у фоновому потоці
+    processor = SimpleSpanProcessor if settings.tracing_exporter == "memory" else BatchSpanProcessor
+    provider.add_span_processor(processor(exporter))
+
+    _provider = provider
+    _tracer = provider.get_tracer("app")
+    logger.info(f"Tracing enabled: exporter={settings.tracing_exporter}, "
+                f"sample_ratio={settings.tracing_sample_ratio}")
+    return True
+
+
+def shutdown_tracing():
+    """Відправляє спани з черги, зупиняє провайдер і закриває файл трас"""
+    global _tracer, _provider, _trace_file
+
+    _tracer = None
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+    if _trace_file is not None:
+        _trace_file.close()
+        _trace_file = None
+
+
+def get_tracer():
+    """Поточний tracer або None, якщо трасування вимкнене"""
+    return _tracer
+
+
+def get_finished_spans() -> list:
+    """Завершені спани memory експортера (для тестів і локальної відладки)"""
+    return list(_memory_exporter.get_finished_spans()) if _memory_exporter else []
+
+
+def traced(name: Optional[str] = None):
+    """
+    Декоратор, що виконує функцію (sync чи async) всередині спану.
+
+    Args:
+        name: Назва спану (за замовчуванням ``crud.contacts.get_contacts`` -
+            модуль без префікса ``app.`` та ім'я функції)
+
+    Example:
+        >>> @traced("smtp.send_verification_email")
+        ... async def send_verification_email(email, token): ...
+    """
+
+    def decorator(func):
+        span_name = name or f"{func.__module__.removeprefix('app.')}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with _tracer.start_as_current_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.start_as_current_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -10,12 +10,15 @@ from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
+import hashlib
 import secrets
+from app.services.tracing import traced
 
 # Контекст для хешування паролів з використанням bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@traced()
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Перевіряє пароль користувача.
@@ -37,6 +40,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@traced()
 def get_password_hash(password: str) -> str:
     """
     Хешує пароль користувача для безпечного зберігання.
@@ -157,6 +161,30 @@ def generate_reset_password_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+def hash_token(token: str) -> str:
+    """
+    SHA-256 дайджест одноразового токена для зберігання в базі.
+    
+    Токени верифікації та скидання пароля відправляються користувачу як є,
+    а в базі лежить тільки їх дайджест: він має фіксовану довжину (64 hex
+    символи), тож індекс компактний, а витік таблиці users не дає робочих
+    посилань.
+    
+    Args:
+        token (str): Токен з посилання в листі
+        
+    Returns:
+        str: Шістнадцятковий SHA-256 дайджест
+        
+    Example:
+        >>> len(hash_token(generate_verification_token()))
+        64
+        >>> hash_token('token') == hash_token('token')
+        True
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_reset_password_token(email: str, expires_delta: Optional[timedelta] = None) -> str:
     """
     Створює JWT токен для скидання пароля.
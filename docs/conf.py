@@ -89,7 +89,6 @@ autodoc_mock_imports = [
     'fastapi.security',
     'fastapi.responses',
     'fastapi_mail',
-    'slowapi',
     'uvicorn',
     
     # База даних
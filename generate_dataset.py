@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Генератор великого синтетичного набору даних для тестування продуктивності
+
+Створює тисячі власників і мільйони контактів з реалістичним розподілом:
+кількість контактів на власника має довгий хвіст (логнормальний), імена та
+прізвища розподілені за Ципфом, вік - нормальний навколо 40 років.
+Заповнюються також лічильники синхронізації та фасетів, тож усі
+ендпоінти працюють на згенерованих даних так само, як на справжніх.
+
+Дані детерміновані для того самого --seed, тож плани запитів та зміни
+індексів можна порівнювати на однакових кардинальностях.
+
+Використання:
+    python generate_dataset.py [опції]
+
+Опції:
+    --owners          Кількість власників (за замовчуванням 2000)
+    --contacts        Загальна кількість контактів (за замовчуванням 1000000)
+    --seed            Seed генератора (за замовчуванням 42)
+    --database-url    URL бази (за замовчуванням з налаштувань застосунку)
+    --batch-size      Розмір пакета запису (за замовчуванням 50000)
+    --password        Пароль усіх згенерованих власників
+    --create-tables   Створити таблиці через metadata.create_all (для SQLite)
+
+На PostgreSQL рядки завантажуються через COPY, на SQLite - executemany.
+"""
+
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import date
+from itertools import accumulate
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.database.base import Base
+from app.models.contacts import contact_initial
+from app.models.users import UserRole
+from app.utils.auth import get_password_hash
+
+# Дата, від якої рахується вік (фіксована, щоб набір не залежав від дня запуску)
+REFERENCE_DATE = date(2025, 1, 1)
+
+# (кирилиця, латиниця для email) - порядок задає частоту (Ципф)
+FIRST_NAMES = [
+    ("Олександр", "oleksandr"), ("Марія", "mariia"), ("Іван", "ivan"), ("Олена", "olena"),
+    ("Андрій", "andrii"), ("Анна", "anna"), ("Дмитро", "dmytro"), ("Наталія", "nataliia"),
+    ("Сергій", "serhii"), ("Юлія", "yuliia"), ("Михайло", "mykhailo"), ("Ірина", "iryna"),
+    ("Володимир", "volodymyr"), ("Тетяна", "tetiana"), ("Петро", "petro"), ("Оксана", "oksana"),
+    ("John", "john"), ("Emma", "emma"), ("Michael", "michael"), ("Olivia", "olivia"),
+    ("Taras", "taras"), ("Sofiia", "sofiia"), ("Максим", "maksym"), ("Вікторія", "viktoriia"),
+    ("Богдан", "bohdan"), ("Катерина", "kateryna"), ("Юрій", "yurii"), ("Світлана", "svitlana"),
+    ("David", "david"), ("Sarah", "sarah"),
+]
+LAST_NAMES = [
+    ("Мельник", "melnyk"), ("Шевченко", "shevchenko"), ("Коваленко", "kovalenko"),
+    ("Бондаренко", "bondarenko"), ("Бойко", "boiko"), ("Ткаченко", "tkachenko"),
+    ("Кравченко", "kravchenko"), ("Ковальчук", "kovalchuk"), ("Коваль", "koval"),
+    ("Олійник", "oliinyk"), ("Шевчук", "shevchuk"), ("Поліщук", "polishchuk"),
+    ("Іваненко", "ivanenko"), ("Ткачук", "tkachuk"), ("Савченко", "savchenko"),
+    ("Бондар", "bondar"), ("Марченко", "marchenko"), ("Руденко", "rudenko"),
+    ("Мороз", "moroz"), ("Лисенко", "lysenko"), ("Петренко", "petrenko"),
+    ("Клименко", "klymenko"), ("Павленко", "pavlenko"), ("Кравчук", "kravchuk"),
+    ("Smith", "smith"), ("Johnson", "johnson"), ("Williams", "williams"), ("Brown", "brown"),
+    ("Andersen", "andersen"), ("Zelinski", "zelinski"), ("Яковенко", "yakovenko"),
+    ("Гончаренко", "honcharenko"), ("Юрченко", "yurchenko"), ("Дорошенко", "doroshenko"),
+    ("Frank", "frank"), ("Garcia", "garcia"), ("Nowak", "nowak"), ("Єременко", "yeremenko"),
+    ("Черненко", "chernenko"), ("Ющенко", "yushchenko"),
+]
+EMAIL_DOMAINS = ["gmail.com", "ukr.net", "i.ua", "outlook.com", "example.com"]
+PHONE_PREFIXES = ["50", "66", "67", "68", "73", "93", "95", "96", "97", "98", "99"]
+NOTES = ["Колега", "Друг сім'ї", "Сусід", "Клієнт", "Однокурсник", "Постачальник"]
+
+USER_COLUMNS = ("id", "username", "email", "hashed_password", "role", "is_verified")
+CONTACT_COLUMNS = (
+    "id", "first_name", "last_name", "email", "phone_number", "birth_date",
+    "additional_data", "owner_id", "sync_seq"
+)
+
+
+def zipf_cum_weights(size: int, exponent: float = 1.0) -> List[float]:
+    """Кумулятивні ваги Ципфа для random.choices (перший елемент найчастіший)"""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def contacts_per_owner(rng: random.Random, owners: int, total: int) -> List[int]:
+    """
+    Розподіляє total контактів між власниками з довгим хвостом.
+
+    Логнормальний розподіл (sigma=1): більшість власників має десятки-сотні
+    контактів, найбільші - у десятки разів більше за середнє.
+
+    Сума результату завжди дорівнює total.
+    """
+    weights = [rng.lognormvariate(0, 1) for _ in range(owners)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for index in rng.sample(range(owners), total - sum(counts)):
+        counts[index] += 1
+    return counts
+
+
+def random_birth_date(rng: random.Random) -> date:
+    """Дата народження: вік ~ N(40, 15) в межах 1-95 років, день рівномірно по року"""
+    age = min(95, max(1, int(rng.gauss(40, 15))))
+    year = REFERENCE_DATE.year - age
+    days_in_year = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+    return date.fromordinal(date(year, 1, 1).toordinal() + rng.randrange(days_in_year))
+
+
+class DatasetWriter:
+    """Пакетний запис рядків: COPY на PostgreSQL, executemany на інших базах"""
+
+    def __init__(self, engine):
+        self.dialect = engine.dialect.name
+        self.connection = engine.raw_connection()
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        if not rows:
+            return
+        cursor = self.connection.cursor()
+        try:
+            if self.dialect == "postgresql":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            else:
+                placeholders = ", ".join("?" for _ in columns)
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+        finally:
+            cursor.close()
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def _max_id(engine, table: str) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar()
+
+
+def _user_role_label(engine) -> str:
+    """
+    Мітка ролі USER у базі.
+
+    init.sql створює enum userrole з мітками 'user'/'admin', а create_all
+    (і SQLite) зберігає імена членів UserRole.
+    """
+    if engine.dialect.name != "postgresql":
+        return UserRole.USER.name
+    with engine.connect() as connection:
+        labels = connection.execute(text("SELECT unnest(enum_range(NULL::userrole))::text")).scalars().all()
+    return UserRole.USER.value if UserRole.USER.value in labels else UserRole.USER.name
+
+
+def generate(
+    engine,
+    owners: int,
+    contacts: int,
+    seed: int = 42,
+    batch_size: int = 50000,
+    password: str = "benchpassword123",
+    log=print
+) -> Dict[str, int]:
+    """
+    Генерує та завантажує набір даних.
+
+    Нові ID продовжують наявні, тож генератор можна запускати на
+    непорожній базі. Email контактів містять ID контакту і тому унікальні.
+
+    Returns:
+        Dict[str, int]: Кількість вставлених рядків по таблицях та діапазон ID власників
+    """
+    rng = random.Random(seed)
+    is_postgres = engine.dialect.name == "postgresql"
+    role = _user_role_label(engine)
+    verified = True if is_postgres else 1
+
+    first_user_id = _max_id(engine, "users") + 1
+    next_contact_id = _max_id(engine, "contacts") + 1
+    hashed_password = get_password_hash(password)
+    first_cum = zipf_cum_weights(len(FIRST_NAMES))
+    last_cum = zipf_cum_weights(len(LAST_NAMES), exponent=0.8)
+
+    writer = DatasetWriter(engine)
+    started = time.perf_counter()
+    try:
+        user_ids = range(first_user_id, first_user_id + owners)
+        writer.write("users", USER_COLUMNS, [
+            (user_id, f"owner{user_id}", f"owner{user_id}@example.com", hashed_password, role, verified)
+            for user_id in user_ids
+        ])
+
+        sync_rows, facet_rows, batch = [], [], []
+        written = 0
+        for user_id, count in zip(user_ids, contacts_per_owner(rng, owners, contacts)):
+            facets: Dict[str, int] = {}
+            for sync_seq in range(1, count + 1):
+                (first_name, first_latin), = rng.choices(FIRST_NAMES, cum_weights=first_cum)
+                (last_name, last_latin), = rng.choices(LAST_NAMES, cum_weights=last_cum)
+                birth_date = random_birth_date(rng)
+                batch.append((
+                    next_contact_id,
+                    first_name,
+                    last_name,
+                    f"{first_latin}.{last_latin}.{next_contact_id}@{rng.choice(EMAIL_DOMAINS)}",
+                    f"+380{rng.choice(PHONE_PREFIXES)}{rng.randrange(10 ** 7):07d}",
+                    birth_date if is_postgres else birth_date.isoformat(),
+                    rng.choice(NOTES) if rng.random() < 0.2 else None,
+                    user_id,
+                    sync_seq
+                ))
+                next_contact_id += 1
+                initial = contact_initial(last_name)
+                facets[initial] = facets.get(initial, 0) + 1
+
+                if len(batch) >= batch_size:
+                    writer.write("contacts", CONTACT_COLUMNS, batch)
+                    written += len(batch)
+                    batch = []
+                    log(f"  contacts: {written}/{contacts} ({time.perf_counter() - started:.1f}s)")
+
+            sync_rows.append((user_id, count))
+            facet_rows.extend((user_id, initial, facet_count) for initial, facet_count in facets.items())
+
+        writer.write("contacts", CONTACT_COLUMNS, batch)
+        writer.write("contact_sync_state", ("owner_id", "change_seq"), sync_rows)
+        writer.write("contact_facet_counts", ("owner_id", "initial", "count"), facet_rows)
+        writer.commit()
+    finally:
+        writer.close()
+
+    with engine.begin() as connection:
+        if is_postgres:
+            # ID вставлені явно - послідовності треба підтягнути
+            for table in ("users", "contacts"):
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT MAX(id) FROM {table}))"
+                ))
+        # Свіжа статистика, інакше планувальник оцінює таблиці як порожні
+        connection.execute(text("ANALYZE"))
+
+    return {
+        "users": owners,
+        "contacts": contacts,
+        "contact_facet_counts": len(facet_rows),
+        "first_user_id": first_user_id,
+        "last_user_id": first_user_id + owners - 1
+    }
+
+
+def parse_args(argv: Iterable[str] = None):
+    parser = argparse.ArgumentParser(description="Генератор синтетичного набору даних")
+    parser.add_argument("--owners", type=int, default=2000, help="Кількість власників")
+    parser.add_argument("--contacts", type=int, default=1_000_000, help="Загальна кількість контактів")
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора")
+    parser.add_argument("--database-url", default=None, help="URL бази (за замовчуванням з налаштувань)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Розмір пакета запису")
+    parser.add_argument("--password", default="benchpassword123", help="Пароль згенерованих власників")
+    parser.add_argument("--create-tables", action="store_true", help="Створити таблиці (metadata.create_all)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] = None) -> int:
+    args = parse_args(argv)
+    engine = create_engine(args.database_url or settings.database_url)
+
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    print(f"🔄 Генерація: {args.owners} власників, {args.contacts} контактів, seed={args.seed}")
+    started = time.perf_counter()
+    stats = generate(
+        engine,
+        owners=args.owners,
+        contacts=args.contacts,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        password=args.password
+    )
+    print(f"✅ Готово за {time.perf_counter() - started:.1f}s: {stats}")
+    print(f"   Вхід: owner{stats['first_user_id']}@example.com / {args.password}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
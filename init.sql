@@ -38,6 +38,11 @@ CREATE INDEX IF NOT EXISTS idx_contacts_first_name ON contacts(first_name);
 CREATE INDEX IF NOT EXISTS idx_contacts_last_name ON contacts(last_name);
 CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email);
 CREATE INDEX IF NOT EXISTS idx_contacts_owner_id ON contacts(owner_id);
+-- Всі запити контактів обмежені власником: owner_id - перша колонка індексів
+CREATE INDEX IF NOT EXISTS ix_contacts_owner_name ON contacts(owner_id, last_name, first_name, id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_contacts_owner_email ON contacts(owner_id, lower(email));
+CREATE INDEX IF NOT EXISTS ix_contacts_owner_birthday
+    ON contacts(owner_id, EXTRACT(month FROM birth_date), EXTRACT(day FROM birth_date));
 
 -- Тестовий адмін користувач (пароль: adminpassword)
 INSERT INTO users (username, email, hashed_password, role, is_verified) 
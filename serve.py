@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Production запуск API: gunicorn master з uvicorn воркерами (uvloop + httptools)
+
+Налаштування беруться з SERVER_* змінних середовища (див. app/config.py),
+аргументи командного рядка мають пріоритет.
+
+Використання:
+    python serve.py
+    python serve.py --workers 8 --bind 0.0.0.0:9000
+
+Для розробки з автоперезавантаженням: DEBUG=true python -m app.main
+"""
+
+import argparse
+from typing import Iterable
+
+from app.server import run
+
+
+def parse_args(argv: Iterable[str] = None):
+    parser = argparse.ArgumentParser(description="Production сервер Contact Management API")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Кількість воркерів (за замовчуванням SERVER_WORKERS або 2 * CPU + 1)")
+    parser.add_argument("--bind", default=None,
+                        help="Адреса host:port (за замовчуванням SERVER_HOST:SERVER_PORT)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] = None):
+    args = parse_args(argv)
+    run(workers=args.workers, bind=args.bind)
+
+
+if __name__ == "__main__":
+    main()
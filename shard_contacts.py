@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Керування шардами контактів
+
+Шарди задаються в CONTACT_SHARDS ("name=url,name=url"). Команди працюють з
+основною базою застосунку (users, owner_shard_assignments) та шардами.
+
+Використання:
+    python shard_contacts.py init
+    python shard_contacts.py locate OWNER_ID [OWNER_ID ...]
+    python shard_contacts.py move OWNER_ID TARGET [--drain-seconds N]
+
+Команди:
+    init      Створити таблиці контактів на всіх шардах
+    locate    Показати шард власника (і чи він зараз переноситься)
+    move      Перенести контакти власника на шард TARGET без зупинки API
+              (записи власника на час копіювання отримують 503). ID
+              контактів зберігаються; новий ID (і tombstone старого)
+              отримує лише контакт, створений до глобального лічильника
+              ID, якщо його ID на TARGET уже зайнятий
+"""
+
+import argparse
+import sys
+from typing import Iterable
+
+from app.database.connection import SessionLocal
+from app.database.sharding import create_shard_tables, move_owner, shards
+
+
+def parse_args(argv: Iterable[str] = None):
+    parser = argparse.ArgumentParser(description="Керування шардами контактів")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("init", help="Створити таблиці контактів на всіх шардах")
+
+    locate = commands.add_parser("locate", help="Показати шард власника")
+    locate.add_argument("owner_ids", type=int, nargs="+", help="ID власників")
+
+    move = commands.add_parser("move", help="Перенести власника на інший шард")
+    move.add_argument("owner_id", type=int, help="ID власника")
+    move.add_argument("target", help="Назва цільового шарда")
+    move.add_argument("--drain-seconds", type=float, default=None,
+                      help="Пауза на завершення запитів (за замовчуванням CONTACT_SHARD_DRAIN_SECONDS)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] = None) -> int:
+    args = parse_args(argv)
+    if not shards:
+        print("❌ CONTACT_SHARDS не налаштовано")
+        return 1
+
+    if args.command == "init":
+        for name, engine in shards.engines.items():
+            create_shard_tables(engine)
+            print(f"✅ {name}: таблиці контактів створено")
+        return 0
+
+    db = SessionLocal()
+    try:
+        if args.command == "locate":
+            for owner_id in args.owner_ids:
+                shard, moving = shards.locate(db, owner_id)
+                print(f"{owner_id}\t{shard}{' (moving)' if moving else ''}")
+            return 0
+
+        try:
+            stats = move_owner(db, args.owner_id, args.target, drain_seconds=args.drain_seconds)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(
+            f"✅ Власник {args.owner_id}: {stats['source']} -> {stats['target']}, "
+            f"контактів {stats['contacts']}, tombstones {stats['tombstones']}, "
+            f"нових ID {stats['renumbered']}"
+        )
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
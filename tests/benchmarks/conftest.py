@@ -0,0 +1,123 @@
+"""
+Фікстури benchmark тестів API.
+
+Бенчмарки працюють з тим самим SQLite, що й інтеграційні тести, а Redis
+замінюється на fakeredis, тож кеш користувача та кеш відповідей
+працюють як у продакшні, але без мережі.
+"""
+
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+
+pytest.importorskip("pytest_benchmark")
+
+from app.main import app
+from app.api import deps
+from app.database import connection
+from app.middleware.rate_limiter import limiter
+from app.models.contacts import Contact, ContactFacetCount, ContactSyncState, contact_initial
+from app.models.users import User, UserRole
+from app.services.redis import redis_service
+from app.utils.auth import get_password_hash, create_access_token
+
+BENCH_PASSWORD = "benchpassword123"
+BENCH_CONTACTS = 1000
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    """Сирі часи раундів - лише з --benchmark-save-data (базовій лінії досить статистик)"""
+    if not config.getoption("benchmark_save_data"):
+        for bench in output_json["benchmarks"]:
+            bench["stats"].pop("data", None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """fakeredis замість Redis для всіх модулів (спільний redis_service)"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_service, "redis_client", client)
+    return client
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    """Redis недоступний - кожен запит іде в базу"""
+    monkeypatch.setattr(redis_service, "redis_client", None)
+
+
+@pytest.fixture
+def bench_client(db_session, monkeypatch):
+    """Тестовий клієнт без rate limiting (інакше /users/me впирається в 10/minute)"""
+    def override():
+        yield db_session
+
+    monkeypatch.setattr(limiter, "enabled", False)
+    app.dependency_overrides[connection.get_db] = override
+    app.dependency_overrides[deps.get_db] = override
+    app.dependency_overrides[deps.get_read_db] = override
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def bench_user(db_session):
+    """Верифікований користувач з відомим паролем"""
+    user = User(
+        username="benchuser",
+        email="bench@example.com",
+        hashed_password=get_password_hash(BENCH_PASSWORD),
+        role=UserRole.USER,
+        is_verified=True
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def bench_credentials(bench_user):
+    """Дані для входу користувача бенчмарків"""
+    return {"email": bench_user.email, "password": BENCH_PASSWORD}
+
+
+@pytest.fixture
+def bench_headers(bench_user):
+    """Заголовки авторизації користувача бенчмарків"""
+    token = create_access_token(data={"sub": bench_user.email, "role": bench_user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def bench_contacts(db_session, bench_user):
+    """BENCH_CONTACTS контактів користувача разом з лічильниками фасетів і синхронізації"""
+    today = date.today()
+    facets = {}
+    contacts = []
+    for i in range(BENCH_CONTACTS):
+        last_name = f"Петренко{i}" if i % 3 else f"Bondar{i}"
+        contacts.append({
+            "first_name": f"Іван{i}",
+            "last_name": last_name,
+            "email": f"contact{i}@example.com",
+            "phone_number": "+380501234567",
+            # Кожен ~30-й контакт має день народження сьогодні
+            "birth_date": today.replace(year=1992) if i % 30 == 0 else date(1990, 1 + i % 12, 1 + i % 28),
+            "additional_data": None,
+            "owner_id": bench_user.id,
+            "sync_seq": i + 1
+        })
+        initial = contact_initial(last_name)
+        facets[initial] = facets.get(initial, 0) + 1
+
+    db_session.bulk_insert_mappings(Contact, contacts)
+    db_session.bulk_insert_mappings(ContactFacetCount, [
+        {"owner_id": bench_user.id, "initial": initial, "count": count}
+        for initial, count in facets.items()
+    ])
+    db_session.add(ContactSyncState(owner_id=bench_user.id, change_seq=BENCH_CONTACTS))
+    db_session.commit()
+    return BENCH_CONTACTS
@@ -0,0 +1,132 @@
+"""
+Бенчмарки гарячих шляхів API.
+
+Запуск і порівняння з базовою лінією - див. ``make bench-baseline`` та
+``make bench-compare`` (падає, якщо середній час гірший за поріг).
+"""
+
+import itertools
+import pytest
+from fastapi import status
+
+PAGE_SIZES = [10, 100, 500]
+
+
+@pytest.mark.benchmark
+class TestAuthBenchmark:
+    """Аутентифікація: bcrypt та кеш користувача"""
+
+    def test_login(self, benchmark, bench_client, bench_credentials, no_redis):
+        """Вхід - домінує вартість bcrypt"""
+        benchmark.group = "auth-login"
+
+        response = benchmark.pedantic(
+            bench_client.post, args=("/api/v1/auth/login",), kwargs={"json": bench_credentials},
+            rounds=5, iterations=1
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_users_me_cache_hit(self, benchmark, bench_client, bench_headers, fake_redis):
+        """GET /users/me з користувачем у кеші Redis"""
+        benchmark.group = "users-me"
+        bench_client.get("/api/v1/users/me", headers=bench_headers)  # прогрів кешу
+
+        response = benchmark(bench_client.get, "/api/v1/users/me", headers=bench_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_users_me_cache_miss(self, benchmark, bench_client, bench_user, bench_headers, fake_redis):
+        """GET /users/me з порожнім кешем (запит у базу + запис у кеш)"""
+        benchmark.group = "users-me"
+
+        def drop_cached_user():
+            fake_redis.delete(f"user:{bench_user.email}")
+
+        response = benchmark.pedantic(
+            bench_client.get, args=("/api/v1/users/me",), kwargs={"headers": bench_headers},
+            setup=drop_cached_user, rounds=100, iterations=1
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.benchmark
+class TestContactsReadBenchmark:
+    """Читання контактів"""
+
+    @pytest.mark.parametrize("page_size", PAGE_SIZES)
+    def test_list_contacts(self, benchmark, bench_client, bench_headers, bench_contacts, no_redis, page_size):
+        """Сторінка списку контактів без кешу відповідей"""
+        benchmark.group = f"contacts-list-{page_size}"
+
+        response = benchmark(
+            bench_client.get, "/api/v1/contacts/", params={"limit": page_size}, headers=bench_headers
+        )
+        assert len(response.json()) == page_size
+
+    @pytest.mark.parametrize("page_size", PAGE_SIZES)
+    def test_list_contacts_cached(self, benchmark, bench_client, bench_headers, bench_contacts, fake_redis, page_size):
+        """Сторінка списку контактів з кешу відповідей Redis"""
+        benchmark.group = f"contacts-list-{page_size}"
+        params = {"limit": page_size}
+        bench_client.get("/api/v1/contacts/", params=params, headers=bench_headers)  # прогрів кешу
+
+        response = benchmark(bench_client.get, "/api/v1/contacts/", params=params, headers=bench_headers)
+        assert len(response.json()) == page_size
+
+    def test_list_contacts_deep_page(self, benchmark, bench_client, bench_headers, bench_contacts, no_redis):
+        """Далека сторінка списку (OFFSET 800) - порядок за іменем береться з індексу"""
+        benchmark.group = "contacts-list-100"
+
+        response = benchmark(
+            bench_client.get, "/api/v1/contacts/", params={"skip": 800, "limit": 100}, headers=bench_headers
+        )
+        assert len(response.json()) == 100
+
+    def test_search_contacts(self, benchmark, bench_client, bench_headers, bench_contacts, no_redis):
+        """Пошук (ILIKE по імені, прізвищу та email)"""
+        benchmark.group = "contacts-search"
+
+        response = benchmark(
+            bench_client.get, "/api/v1/contacts/", params={"search": "bondar9"}, headers=bench_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()
+
+    def test_upcoming_birthdays(self, benchmark, bench_client, bench_headers, bench_contacts, no_redis):
+        """Дні народження на найближчі 7 днів"""
+        benchmark.group = "contacts-birthdays"
+
+        response = benchmark(bench_client.get, "/api/v1/contacts/birthdays/", headers=bench_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()
+
+
+@pytest.mark.benchmark
+class TestContactsWriteBenchmark:
+    """Запис контактів (лічильники синхронізації та фасетів, інвалідація кешу)"""
+
+    def test_create_contact(self, benchmark, bench_client, bench_headers, bench_contacts, fake_redis, test_contact_data):
+        """Створення контакту"""
+        benchmark.group = "contacts-write"
+        counter = itertools.count()
+
+        def create():
+            payload = {**test_contact_data, "email": f"new{next(counter)}@example.com"}
+            return bench_client.post("/api/v1/contacts/", json=payload, headers=bench_headers)
+
+        response = benchmark(create)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_update_contact(self, benchmark, bench_client, bench_headers, bench_contacts, fake_redis):
+        """Оновлення контакту зі зміною прізвища (перенос між фасетами)"""
+        benchmark.group = "contacts-write"
+        contact_id = bench_client.get(
+            "/api/v1/contacts/", params={"limit": 1}, headers=bench_headers
+        ).json()[0]["id"]
+        last_names = itertools.cycle(["Андрієнко", "Бойко"])
+
+        response = benchmark(
+            lambda: bench_client.put(
+                f"/api/v1/contacts/{contact_id}", json={"last_name": next(last_names)}, headers=bench_headers
+            )
+        )
+        assert response.status_code == status.HTTP_200_OK
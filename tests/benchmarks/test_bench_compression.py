@@ -0,0 +1,59 @@
+import pytest
+from datetime import date
+
+pytest.importorskip("pytest_benchmark")
+
+from app.crud.contacts import CONTACT_RESPONSE_FIELDS
+from app.middleware.compression import COMPRESSOR_FACTORIES
+from app.utils.serialization import ORJSONResponse, rows_to_json
+
+ROW_COUNTS = [100, 5000]
+
+# Рівні від швидкого до щільного для кожного кодування
+LEVELS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 1), ("br", 4), ("br", 11), ("zstd", 1), ("zstd", 3), ("zstd", 19)]
+
+
+def contact_list_body(count: int) -> bytes:
+    """JSON списку контактів, як його віддає GET /api/v1/contacts/"""
+    contacts = [
+        {
+            "id": i,
+            "first_name": f"Іван{i}",
+            "last_name": f"Петренко{i}",
+            "email": f"user{i}@example.com",
+            "phone_number": "+380501234567",
+            "birth_date": date(1990, 1 + i % 12, 1 + i % 28),
+            "additional_data": "Тестовий контакт" if i % 2 else None,
+            "owner_id": 1
+        }
+        for i in range(count)
+    ]
+    rows = [tuple(contact[field] for field in CONTACT_RESPONSE_FIELDS) for contact in contacts]
+    return ORJSONResponse(rows_to_json(rows, CONTACT_RESPONSE_FIELDS)).body
+
+
+def compressor(encoding: str, level: int):
+    try:
+        return COMPRESSOR_FACTORIES[encoding](level)
+    except ImportError:
+        pytest.skip(f"{encoding} package is not installed")
+
+
+@pytest.mark.benchmark
+class TestCompressionBenchmark:
+    """Трафік проти CPU: розмір стисненої відповіді та час стиснення"""
+
+    @pytest.mark.parametrize("count", ROW_COUNTS)
+    @pytest.mark.parametrize("encoding, level", LEVELS)
+    def test_compress_contact_list(self, benchmark, count, encoding, level):
+        """Час стиснення; розмір і ступінь стиснення - в extra_info"""
+        body = contact_list_body(count)
+        compress = compressor(encoding, level)
+        benchmark.group = f"compression-{count}"
+
+        compressed = benchmark(compress, body)
+
+        benchmark.extra_info["original_bytes"] = len(body)
+        benchmark.extra_info["compressed_bytes"] = len(compressed)
+        benchmark.extra_info["ratio"] = round(len(body) / len(compressed), 2)
+        assert len(compressed) < len(body)
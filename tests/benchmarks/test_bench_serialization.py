@@ -0,0 +1,80 @@
+import pytest
+from datetime import date
+from typing import List
+
+pytest.importorskip("pytest_benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.crud.contacts import CONTACT_RESPONSE_FIELDS
+from app.models.contacts import Contact
+from app.schemas.contacts import CONTACT_FIELD_NORMALIZERS, ContactResponse
+from app.utils.serialization import ORJSONResponse, rows_to_json
+
+ROW_COUNTS = [100, 500, 5000]
+
+contact_list_adapter = TypeAdapter(List[ContactResponse])
+
+
+def make_contacts(count: int) -> List[Contact]:
+    """ORM об'єкти контактів, як їх повертав get_contacts"""
+    return [
+        Contact(
+            id=i,
+            first_name=f"Іван{i}",
+            last_name=f"Петренко{i}",
+            email=f"user{i}@example.com",
+            phone_number="+380501234567",
+            birth_date=date(1990, 1 + i % 12, 1 + i % 28),
+            additional_data="Тестовий контакт" if i % 2 else None,
+            owner_id=1
+        )
+        for i in range(count)
+    ]
+
+
+def make_rows(count: int) -> List[tuple]:
+    """Кортежі колонок, як їх повертає get_contact_rows"""
+    return [
+        tuple(getattr(contact, field) for field in CONTACT_RESPONSE_FIELDS)
+        for contact in make_contacts(count)
+    ]
+
+
+def pydantic_path(contacts: List[Contact]) -> bytes:
+    """Шлях FastAPI за замовчуванням: валідація from_attributes + jsonable_encoder + json"""
+    validated = contact_list_adapter.validate_python(contacts, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def fast_path(rows: List[tuple]) -> bytes:
+    """Швидкий шлях: кортежі колонок + orjson"""
+    return ORJSONResponse(rows_to_json(rows, CONTACT_RESPONSE_FIELDS, CONTACT_FIELD_NORMALIZERS)).body
+
+
+@pytest.mark.benchmark
+class TestContactListSerializationBenchmark:
+    """Порівняння серіалізації списку контактів: Pydantic vs orjson"""
+
+    @pytest.mark.parametrize("count", ROW_COUNTS)
+    def test_pydantic_path(self, benchmark, count):
+        contacts = make_contacts(count)
+        benchmark.group = f"contact-list-serialization-{count}"
+        body = benchmark(pydantic_path, contacts)
+        assert body.startswith(b"[")
+
+    @pytest.mark.parametrize("count", ROW_COUNTS)
+    def test_orjson_fast_path(self, benchmark, count):
+        rows = make_rows(count)
+        benchmark.group = f"contact-list-serialization-{count}"
+        body = benchmark(fast_path, rows)
+        assert body.startswith(b"[")
+
+    def test_paths_produce_same_json(self):
+        """Обидва шляхи повертають однаковий JSON"""
+        import json
+
+        contacts = make_contacts(10)
+        assert json.loads(pydantic_path(contacts)) == json.loads(fast_path(make_rows(10)))
@@ -0,0 +1,45 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)$")
+
+
+def cold_import():
+    """Новий процес, що імпортує app.main з -X importtime (як холодний старт воркера)"""
+    env = {key: value for key, value in os.environ.items() if not key.startswith("COV_CORE")}
+    env.setdefault("MAIL_FROM", "noreply@example.com")
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, env=env, check=True
+    ).stderr
+
+
+def top_level_imports(report: str, limit: int = 10):
+    """Найдорожчі прямі імпорти app.main (кумулятивно, мс)"""
+    totals = {}
+    for line in report.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 3:
+            totals[match.group(4)] = int(match.group(2)) / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit])
+
+
+@pytest.mark.benchmark
+class TestStartupBenchmark:
+    """Час холодного старту процесу API"""
+
+    def test_cold_import_app_main(self, benchmark):
+        """Імпорт app.main у новому процесі; найдорожчі модулі - в extra_info"""
+        report = benchmark.pedantic(cold_import, rounds=5, iterations=1)
+
+        benchmark.extra_info["top_imports_ms"] = top_level_imports(report)
+        assert "app.main" in report
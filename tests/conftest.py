@@ -9,8 +9,11 @@ import os
 from unittest.mock import Mock
 
 from app.main import app
+from app.middleware.rate_limiter import limiter
 from app.database.base import Base
 from app.database.connection import get_db
+from app.api import deps
+from app.api.deps import get_read_db
 from app.models.users import User, UserRole
 from app.models.contacts import Contact
 from app.utils.auth import get_password_hash, create_access_token
@@ -64,6 +67,9 @@ def override_get_db(db_session):
 def client(db_session):
     """Створює тестовий клієнт FastAPI"""
     app.dependency_overrides[get_db] = override_get_db(db_session)
+    app.dependency_overrides[deps.get_db] = override_get_db(db_session)
+    app.dependency_overrides[get_read_db] = override_get_db(db_session)
+    limiter.reset()
     
     with TestClient(app) as test_client:
         yield test_client
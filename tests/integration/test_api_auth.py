@@ -172,7 +172,7 @@ class TestAuthAPI:
     def test_verify_email_success(self, client, db_session, mock_all_external_services):
         """Тест успішної верифікації email"""
         from app.models.users import User, UserRole
-        from app.utils.auth import get_password_hash
+        from app.utils.auth import get_password_hash, hash_token
         
         # Створюємо користувача з токеном верифікації
         user = User(
@@ -181,7 +181,7 @@ class TestAuthAPI:
             hashed_password=get_password_hash("password123"),
             role=UserRole.USER,
             is_verified=False,
-            verification_token="valid_token_123"
+            verification_token=hash_token("valid_token_123")
         )
         db_session.add(user)
         db_session.commit()
@@ -196,6 +196,32 @@ class TestAuthAPI:
         assert user.is_verified is True
         assert user.verification_token is None
     
+    def test_verify_email_pins_reads_to_primary(self, client, db_session, monkeypatch, mock_all_external_services):
+        """Тест що після верифікації читання користувача йдуть на primary"""
+        from unittest.mock import Mock
+        from app.models.users import User, UserRole
+        from app.utils.auth import get_password_hash, hash_token
+        
+        pin = Mock()
+        monkeypatch.setattr("app.api.v1.endpoints.auth.pin_primary_reads", pin)
+        db_session.add(User(
+            username="testuser",
+            email="test@example.com",
+            hashed_password=get_password_hash("password123"),
+            role=UserRole.USER,
+            is_verified=False,
+            verification_token=hash_token("valid_token_123")
+        ))
+        db_session.commit()
+        
+        client.get("/api/v1/auth/verify-email?token=invalid_token")
+        pin.assert_not_called()
+        
+        response = client.get("/api/v1/auth/verify-email?token=valid_token_123")
+        
+        assert response.status_code == status.HTTP_200_OK
+        pin.assert_called_once_with("test@example.com")
+    
     def test_verify_email_invalid_token(self, client, mock_all_external_services):
         """Тест верифікації email з невалідним токеном"""
         response = client.get("/api/v1/auth/verify-email?token=invalid_token")
@@ -260,13 +286,14 @@ class TestAuthAPI:
     
     def test_reset_password_valid_token(self, client, db_session, create_test_user, mock_all_external_services):
         """Тест скидання пароля з валідним токеном"""
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
+        from app.utils.auth import hash_token
         
         # Встановлюємо токен скидання пароля
         reset_token = "valid_reset_token_123"
-        expires_at = datetime.now(datetime.timezone.utc()) + timedelta(hours=1)
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         
-        create_test_user.reset_password_token = reset_token
+        create_test_user.reset_password_token = hash_token(reset_token)
         create_test_user.reset_password_expires = expires_at
         db_session.commit()
         
@@ -299,13 +326,14 @@ class TestAuthAPI:
     
     def test_reset_password_expired_token(self, client, db_session, create_test_user, mock_all_external_services):
         """Тест скидання пароля з простроченим токеном"""
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
+        from app.utils.auth import hash_token
         
         # Встановлюємо прострочений токен
         reset_token = "expired_token_123"
-        expires_at = datetime.now(datetime.timezone.utc()) - timedelta(hours=1)
+        expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
         
-        create_test_user.reset_password_token = reset_token
+        create_test_user.reset_password_token = hash_token(reset_token)
         create_test_user.reset_password_expires = expires_at
         db_session.commit()
         
@@ -321,12 +349,13 @@ class TestAuthAPI:
     
     def test_verify_reset_token_valid(self, client, db_session, create_test_user, mock_all_external_services):
         """Тест перевірки валідного токена скидання пароля"""
-        from datetime import datetime, timedelta
+        from datetime import datetime, timedelta, timezone
+        from app.utils.auth import hash_token
         
         reset_token = "valid_token_123"
-        expires_at = datetime.now(datetime.timezone.utc()) + timedelta(hours=1)
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         
-        create_test_user.reset_password_token = reset_token
+        create_test_user.reset_password_token = hash_token(reset_token)
         create_test_user.reset_password_expires = expires_at
         db_session.commit()
         
@@ -391,7 +420,24 @@ class TestAuthAPI:
 class TestAuthAPIFlow:
     """Тести для повного flow аутентифікації"""
     
-    def test_complete_registration_and_login_flow(self, client, mock_all_external_services):
+    @pytest.fixture
+    def sent_tokens(self, monkeypatch):
+        """Перехоплює токени з листів (у базі зберігаються лише дайджести)"""
+        tokens = {}
+        
+        async def send_verification_email(email: str, token: str):
+            tokens["verification"] = token
+            return True
+        
+        async def send_password_reset_email(email: str, token: str):
+            tokens["reset"] = token
+            return True
+        
+        monkeypatch.setattr("app.api.v1.endpoints.auth.send_verification_email", send_verification_email)
+        monkeypatch.setattr("app.api.v1.endpoints.auth.send_password_reset_email", send_password_reset_email)
+        return tokens
+    
+    def test_complete_registration_and_login_flow(self, client, sent_tokens, mock_all_external_services):
         """Тест повного циклу: реєстрація -> верифікація -> вхід"""
         # 1. Реєстрація
         user_data = {
@@ -412,17 +458,8 @@ class TestAuthAPIFlow:
         login_response = client.post("/api/v1/auth/login", json=login_data)
         assert login_response.status_code == status.HTTP_200_OK
         
-        # 3. Верифікація email (симулюємо)
-        # У реальності токен прийшов би в email, тут симулюємо його знаходження
-        from app.models.users import User
-        from app.database.connection import SessionLocal
-        
-        db = SessionLocal()
-        try:
-            user = db.query(User).filter(User.email == user_data["email"]).first()
-            token = user.verification_token
-        finally:
-            db.close()
+        # 3. Верифікація email токеном з перехопленого листа
+        token = sent_tokens["verification"]
         
         verify_response = client.get(f"/api/v1/auth/verify-email?token={token}")
         assert verify_response.status_code == status.HTTP_200_OK
@@ -431,7 +468,7 @@ class TestAuthAPIFlow:
         final_login_response = client.post("/api/v1/auth/login", json=login_data)
         assert final_login_response.status_code == status.HTTP_200_OK
     
-    def test_complete_password_reset_flow(self, client, create_test_user, mock_all_external_services):
+    def test_complete_password_reset_flow(self, client, create_test_user, sent_tokens, mock_all_external_services):
         """Тест повного циклу скидання пароля"""
         # 1. Запит скидання пароля
         request_data = {"email": create_test_user.email}
@@ -439,16 +476,8 @@ class TestAuthAPIFlow:
         forgot_response = client.post("/api/v1/auth/forgot-password", json=request_data)
         assert forgot_response.status_code == status.HTTP_200_OK
         
-        # 2. Отримуємо токен скидання з бази
-        from app.database.connection import SessionLocal
-        
-        db = SessionLocal()
-        try:
-            db.refresh(create_test_user)
-            reset_token = create_test_user.reset_password_token
-        finally:
-            db.close()
-        
+        # 2. Токен скидання з перехопленого листа
+        reset_token = sent_tokens.get("reset")
         assert reset_token is not None
         
         # 3. Перевіряємо токен
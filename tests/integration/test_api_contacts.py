@@ -74,6 +74,36 @@ class TestContactsAPI:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "already in the system" in response.json()["detail"]
     
+    def test_create_contact_duplicate_email_case_insensitive(self, client, auth_headers, test_contact_data, mock_all_external_services):
+        """Тест дубліката email, що відрізняється тільки регістром"""
+        assert client.post("/api/v1/contacts/", json=test_contact_data, headers=auth_headers).status_code == 201
+        
+        duplicate = {**test_contact_data, "email": test_contact_data["email"].upper()}
+        response = client.post("/api/v1/contacts/", json=duplicate, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "already in the system" in response.json()["detail"]
+    
+    def test_create_contacts_bulk(self, client, auth_headers, test_contact_data, mock_all_external_services):
+        """Тест масового створення з дублікатами"""
+        client.post("/api/v1/contacts/", json=test_contact_data, headers=auth_headers)
+        batch = [
+            {**test_contact_data, "email": "bulk1@example.com"},
+            test_contact_data,
+            {**test_contact_data, "email": "bulk2@example.com"}
+        ]
+        
+        response = client.post("/api/v1/contacts/bulk", json={"contacts": batch}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert [contact["email"] for contact in data["created"]] == ["bulk1@example.com", "bulk2@example.com"]
+        assert all(contact["id"] for contact in data["created"])
+        assert data["duplicates"] == [test_contact_data["email"]]
+        
+        listed = client.get("/api/v1/contacts/", headers=auth_headers).json()
+        assert len(listed) == 3
+    
     def test_create_contact_invalid_data(self, client, auth_headers, mock_all_external_services):
         """Тест створення контакту з невалідними даними"""
         invalid_data = {
@@ -241,6 +271,26 @@ class TestContactsAPI:
         # Email залишається той самий
         assert data["email"] == create_test_contact.email
     
+    def test_update_contact_duplicate_email(self, client, auth_headers, test_contact_data, mock_all_external_services):
+        """Тест зміни email на email іншого контакту власника"""
+        client.post("/api/v1/contacts/", json=test_contact_data, headers=auth_headers)
+        other = client.post(
+            "/api/v1/contacts/",
+            json={**test_contact_data, "email": "other@example.com"},
+            headers=auth_headers
+        ).json()
+        
+        response = client.put(
+            f"/api/v1/contacts/{other['id']}",
+            json={"email": test_contact_data["email"].upper()},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "already in the system" in response.json()["detail"]
+        # Відкат не зсуває лічильник змін
+        assert client.get("/api/v1/contacts/changes", headers=auth_headers).json()["current_seq"] == 2
+    
     def test_update_contact_not_found(self, client, auth_headers, mock_all_external_services):
         """Тест оновлення неіснуючого контакту"""
         update_data = {"first_name": "Оновлене"}
@@ -382,6 +432,155 @@ class TestContactsAPI:
         assert "tomorrow@example.com" in emails
         assert "nextweek@example.com" in emails
         assert "future@example.com" not in emails
+    
+    def test_get_contacts_served_from_response_cache(self, client, auth_headers, test_data_factory, monkeypatch, mock_all_external_services):
+        """Тест кешу відповідей: повторний запит не йде в базу, запис інвалідує кеш"""
+        from unittest.mock import Mock
+        
+        store = {}
+        versions = {}
+        cache = Mock()
+        cache.get_contacts_version.side_effect = lambda owner_id: versions.get(owner_id, 0)
+        cache.bump_contacts_version.side_effect = lambda owner_id: versions.update({owner_id: versions.get(owner_id, 0) + 1})
+        cache.get_response_cache.side_effect = store.get
+        cache.set_response_cache.side_effect = lambda key, payload: store.update({key: payload})
+        monkeypatch.setattr("app.services.cache_utils.redis_service", cache)
+        monkeypatch.setattr("app.api.v1.endpoints.contacts.redis_service", cache)
+        
+        from app.api.v1.endpoints import contacts as contacts_endpoints
+        db_calls = []
+        real_get_contact_rows = contacts_endpoints.get_contact_rows
+        monkeypatch.setattr(
+            contacts_endpoints, "get_contact_rows",
+            lambda *args, **kwargs: db_calls.append(kwargs) or real_get_contact_rows(*args, **kwargs)
+        )
+        
+        assert client.get("/api/v1/contacts/", headers=auth_headers).json() == []
+        assert client.get("/api/v1/contacts/", headers=auth_headers).json() == []
+        assert len(db_calls) == 1
+        
+        client.post("/api/v1/contacts/", json=test_data_factory.create_contact_data(), headers=auth_headers)
+        data = client.get("/api/v1/contacts/", headers=auth_headers).json()
+        assert len(data) == 1
+        assert len(db_calls) == 2
+        assert len(store) == 2
+    
+    def test_get_contacts_from_replica_not_cached(self, client, auth_headers, db_session, monkeypatch, mock_all_external_services):
+        """Тест що сторінка, прочитана з репліки, не потрапляє в кеш відповідей"""
+        from unittest.mock import Mock
+        
+        cache = Mock()
+        cache.get_contacts_version.return_value = 3
+        cache.get_response_cache.return_value = None
+        monkeypatch.setattr("app.services.cache_utils.redis_service", cache)
+        monkeypatch.setattr("app.api.v1.endpoints.contacts.redis_service", cache)
+        monkeypatch.setitem(db_session.info, "replica", True)
+        
+        assert client.get("/api/v1/contacts/", headers=auth_headers).json() == []
+        assert client.get("/api/v1/contacts/birthdays/", headers=auth_headers).json() == []
+        cache.set_response_cache.assert_not_called()
+    
+    def test_get_contacts_documents_partial_model(self, client):
+        """Тест що схема списку не обіцяє полів, яких fields= може не повернути"""
+        schema = client.get("/openapi.json").json()
+        items = schema["paths"]["/api/v1/contacts/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["items"]
+        
+        assert items["$ref"].endswith("/ContactPartialResponse")
+        assert schema["components"]["schemas"]["ContactPartialResponse"]["required"] == ["id"]
+    
+    def test_get_contacts_with_fields(self, client, auth_headers, create_test_user, db_session, mock_all_external_services):
+        """Тест вибірки тільки потрібних полів (fields=)"""
+        from app.models.contacts import Contact
+        
+        db_session.add(Contact(
+            first_name="Іван",
+            last_name="Петренко",
+            email="ivan@example.com",
+            phone_number="+380501234567",
+            birth_date=date(1990, 5, 15),
+            additional_data="Дуже довгий текст",
+            owner_id=create_test_user.id
+        ))
+        db_session.commit()
+        
+        response = client.get("/api/v1/contacts/?fields=last_name,first_name", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert list(data[0].keys()) == ["first_name", "last_name", "id"]
+        assert data[0]["last_name"] == "Петренко"
+    
+    def test_get_contacts_names_normalized_like_response_model(self, client, auth_headers, create_test_user, db_session, mock_all_external_services):
+        """Тест що швидкий шлях списку нормалізує імена так само, як ContactResponse"""
+        from app.models.contacts import Contact
+        
+        contact = Contact(
+            first_name=" іван ",
+            last_name="петренко",
+            email="ivan@example.com",
+            phone_number="+380501234567",
+            birth_date=date(1990, 5, 15),
+            owner_id=create_test_user.id
+        )
+        db_session.add(contact)
+        db_session.commit()
+        
+        listed = client.get("/api/v1/contacts/", headers=auth_headers).json()[0]
+        single = client.get(f"/api/v1/contacts/{contact.id}", headers=auth_headers).json()
+        
+        assert (listed["first_name"], listed["last_name"]) == ("Іван", "Петренко")
+        assert listed == single
+    
+    def test_get_contacts_with_unknown_field(self, client, auth_headers, mock_all_external_services):
+        """Тест невідомого поля у fields="""
+        response = client.get("/api/v1/contacts/?fields=first_name,password", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "password" in response.json()["detail"]
+    
+    def test_get_contacts_total_count_and_facets(self, client, auth_headers, test_data_factory, mock_all_external_services):
+        """Тест заголовків X-Total-Count та X-Facet-Counts"""
+        from urllib.parse import parse_qs
+        
+        for i, last_name in enumerate(["Петренко", "Андрієнко", "Павленко"]):
+            client.post(
+                "/api/v1/contacts/",
+                json=test_data_factory.create_contact_data(last_name=last_name, email=f"c{i}@example.com"),
+                headers=auth_headers
+            )
+        
+        response = client.get("/api/v1/contacts/?limit=1&include_total=true&include_facets=true", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 1
+        assert response.headers["X-Total-Count"] == "3"
+        assert parse_qs(response.headers["X-Facet-Counts"]) == {"А": ["1"], "П": ["2"]}
+        
+        plain = client.get("/api/v1/contacts/", headers=auth_headers)
+        assert "X-Total-Count" not in plain.headers
+    
+    def test_get_contact_changes_since(self, client, auth_headers, test_data_factory, mock_all_external_services):
+        """Тест дельта-синхронізації через /contacts/changes"""
+        first = client.post("/api/v1/contacts/", json=test_data_factory.create_contact_data(), headers=auth_headers).json()
+        second = client.post(
+            "/api/v1/contacts/",
+            json=test_data_factory.create_contact_data(email="second@example.com"),
+            headers=auth_headers
+        ).json()
+        
+        response = client.get("/api/v1/contacts/changes?since=0", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["current_seq"] == 2
+        assert len(data["upserts"]) == 2
+        
+        client.delete(f"/api/v1/contacts/{second['id']}", headers=auth_headers)
+        
+        data = client.get(f"/api/v1/contacts/changes?since={data['current_seq']}", headers=auth_headers).json()
+        assert data["current_seq"] == 3
+        assert data["upserts"] == []
+        assert data["deleted_ids"] == [second["id"]]
+        assert first["id"] not in data["deleted_ids"]
 
 
 @pytest.mark.integration
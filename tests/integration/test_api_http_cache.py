@@ -0,0 +1,21 @@
+import pytest
+from fastapi import status
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestHTTPCacheAPI:
+    """Інтеграційні тести кешу публічних відповідей у стеку middleware"""
+
+    def test_cached_responses_carry_cors_headers(self, client):
+        """Тест що відповідь з кешу і 304 мають CORS заголовки для Origin запиту"""
+        origin = {"Origin": "http://localhost:3000"}
+
+        response = client.get("/health", headers=origin)
+        revalidated = client.get("/health", headers={**origin, "If-None-Match": response.headers["etag"]})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+        for cached in (response, revalidated):
+            assert cached.headers["access-control-allow-origin"] == "http://localhost:3000"
+            assert "Origin" in cached.headers["vary"]
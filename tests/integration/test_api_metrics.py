@@ -0,0 +1,101 @@
+import json
+import logging
+import pytest
+from fastapi import status
+from prometheus_client import REGISTRY
+
+
+def _sample(name, **labels):
+    """Значення метрики з глобального реєстру (0 якщо серії ще немає)"""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestMetricsAPI:
+    """Інтеграційні тести для метрик Prometheus"""
+
+    def test_metrics_endpoint(self, client):
+        """Тест формату відповіді /metrics"""
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "http_request_duration_seconds" in response.text
+        assert "http_requests_in_flight" in response.text
+
+    def test_metrics_use_route_template(self, client, auth_headers, test_contact_data, mock_all_external_services):
+        """Тест міток за шаблоном маршруту та підрахунку SQL запитів"""
+        contact_id = client.post("/api/v1/contacts/", json=test_contact_data, headers=auth_headers).json()["id"]
+        route = "/api/v1/contacts/{contact_id}"
+        labels = {"method": "GET", "route": route}
+        before_requests = _sample("http_requests_total", status="200", **labels)
+        before_queries = _sample("http_request_db_queries_sum", **labels)
+
+        response = client.get(f"/api/v1/contacts/{contact_id}", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert _sample("http_requests_total", status="200", **labels) == before_requests + 1
+        assert _sample("http_request_db_queries_sum", **labels) > before_queries
+        assert _sample(
+            "http_requests_total", method="GET",
+            route=f"/api/v1/contacts/{contact_id}", status="200"
+        ) == 0
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestSQLProfilerAPI:
+    """Інтеграційні тести для профілювання SQL"""
+
+    def test_profile_header_adds_server_timing(self, client, auth_headers, monkeypatch, caplog, mock_all_external_services):
+        """Тест заголовка Server-Timing та JSON підсумку в лозі"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "sql_profiling_header_enabled", True)
+
+        with caplog.at_level(logging.INFO, logger="app.middleware.sql_profiler"):
+            response = client.get("/api/v1/contacts/", headers={**auth_headers, "X-Profile-SQL": "1"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'db;dur=' in response.headers["server-timing"]
+        summary = json.loads(caplog.records[-1].getMessage())
+        assert summary["event"] == "sql_profile"
+        assert summary["route"] == "/api/v1/contacts/"
+        assert summary["queries"] == len(summary["statements"]) > 0
+
+    def test_profile_header_ignored_when_disabled(self, client, auth_headers, mock_all_external_services):
+        """Тест що без дозволу заголовок X-Profile-SQL ігнорується"""
+        response = client.get("/api/v1/contacts/", headers={**auth_headers, "X-Profile-SQL": "1"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "server-timing" not in response.headers
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestTracingAPI:
+    """Інтеграційні тести для трасування"""
+
+    def test_request_trace_contains_auth_and_crud_spans(self, client, auth_headers, monkeypatch, mock_all_external_services):
+        """Тест що спани запиту зібрані в одну трасу під кореневим спаном"""
+        pytest.importorskip("opentelemetry.sdk")
+        from app.config import settings
+        from app.services import tracing
+
+        monkeypatch.setattr(settings, "tracing_enabled", True)
+        monkeypatch.setattr(settings, "tracing_exporter", "memory")
+        monkeypatch.setattr(settings, "tracing_sample_ratio", 1.0)
+        tracing.setup_tracing()
+        try:
+            response = client.get("/api/v1/contacts/", headers=auth_headers)
+            spans = {span.name: span for span in tracing.get_finished_spans()}
+        finally:
+            monkeypatch.undo()
+            tracing.setup_tracing()
+
+        assert response.status_code == status.HTTP_200_OK
+        root = spans["HTTP GET /api/v1/contacts/"]
+        assert root.attributes["http.status_code"] == 200
+        for name in ("middleware.auth.get_current_user", "crud.contacts.get_contact_rows"):
+            assert spans[name].context.trace_id == root.context.trace_id
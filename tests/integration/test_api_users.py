@@ -125,6 +125,20 @@ class TestUsersAPI:
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     
+    def test_read_users_admin(self, client, admin_headers, create_test_user, create_test_admin, mock_all_external_services):
+        """Тест списку користувачів для адміністратора"""
+        response = client.get("/api/v1/users/", headers=admin_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        emails = {user["email"] for user in response.json()}
+        assert emails == {create_test_user.email, create_test_admin.email}
+    
+    def test_read_users_forbidden_user(self, client, auth_headers, mock_all_external_services):
+        """Тест що звичайний користувач не бачить список користувачів"""
+        response = client.get("/api/v1/users/", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
     def test_update_user_role_success_admin(self, client, admin_headers, create_test_user, mock_all_external_services):
         """Тест успішної зміни ролі користувача адміністратором"""
         role_data = {"role": "admin"}
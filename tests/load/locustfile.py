@@ -0,0 +1,91 @@
+"""
+Навантажувальний сценарій Locust для гарячих шляхів API.
+
+Потрібен запущений API з PostgreSQL та Redis (наприклад,
+``docker-compose -f docker-compose.test.yaml up -d test-db test-redis``)
+і верифікований користувач з контактами. Дані для входу беруться з
+``LOAD_TEST_EMAIL`` / ``LOAD_TEST_PASSWORD``.
+
+Запуск без UI (див. ``make load-test``)::
+
+    locust -f tests/load/locustfile.py --headless -u 50 -r 10 -t 1m \\
+           --host http://localhost:8000 --csv reports/load
+"""
+
+import itertools
+import os
+import random
+import uuid
+from locust import HttpUser, between, task
+
+LOAD_TEST_EMAIL = os.getenv("LOAD_TEST_EMAIL", "bench@example.com")
+LOAD_TEST_PASSWORD = os.getenv("LOAD_TEST_PASSWORD", "benchpassword123")
+PAGE_SIZES = [10, 50, 100, 500]
+SEARCH_TERMS = ["ivan", "petr", "bond", "@example.com", "0501"]
+
+
+class ContactsUser(HttpUser):
+    """Користувач, що переглядає, шукає та редагує свої контакти"""
+
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        response = self.client.post(
+            "/api/v1/auth/login",
+            json={"email": LOAD_TEST_EMAIL, "password": LOAD_TEST_PASSWORD},
+            name="/auth/login"
+        )
+        response.raise_for_status()
+        self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        self.contact_ids = []
+        self.last_names = itertools.cycle(["Андрієнко", "Бойко", "Коваленко"])
+
+    @task(10)
+    def list_contacts(self):
+        response = self.client.get(
+            "/api/v1/contacts/",
+            params={"limit": random.choice(PAGE_SIZES)},
+            name="/contacts/?limit=[size]"
+        )
+        if response.ok and not self.contact_ids:
+            self.contact_ids = [contact["id"] for contact in response.json()[:20]]
+
+    @task(5)
+    def users_me(self):
+        self.client.get("/api/v1/users/me", name="/users/me")
+
+    @task(4)
+    def search_contacts(self):
+        self.client.get(
+            "/api/v1/contacts/",
+            params={"search": random.choice(SEARCH_TERMS)},
+            name="/contacts/?search=[term]"
+        )
+
+    @task(2)
+    def upcoming_birthdays(self):
+        self.client.get("/api/v1/contacts/birthdays/", name="/contacts/birthdays/")
+
+    @task(1)
+    def create_contact(self):
+        self.client.post(
+            "/api/v1/contacts/",
+            json={
+                "first_name": "Load",
+                "last_name": "Test",
+                "email": f"load-{uuid.uuid4().hex}@example.com",
+                "phone_number": "+380501234567",
+                "birth_date": "1990-05-15"
+            },
+            name="/contacts/ [create]"
+        )
+
+    @task(1)
+    def update_contact(self):
+        if not self.contact_ids:
+            return
+        self.client.put(
+            f"/api/v1/contacts/{random.choice(self.contact_ids)}",
+            json={"last_name": next(self.last_names)},
+            name="/contacts/[id] [update]"
+        )
@@ -0,0 +1,72 @@
+"""
+Фікстури перевірки планів запитів.
+
+Плани мають сенс тільки на PostgreSQL з реалістичною кількістю рядків,
+тому тести запускаються лише коли ``PLAN_CHECK_DATABASE_URL`` вказує на
+PostgreSQL зі схемою застосунку (``alembic upgrade head``). Порожня база
+заповнюється ``generate_dataset.generate`` з фіксованим seed, тож плани
+відтворюються між запусками. Наявні дані не змінюються.
+"""
+
+import os
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+PLAN_CHECK_DATABASE_URL = os.getenv("PLAN_CHECK_DATABASE_URL")
+PLAN_DATASET_OWNERS = int(os.getenv("PLAN_DATASET_OWNERS", "2000"))
+PLAN_DATASET_CONTACTS = int(os.getenv("PLAN_DATASET_CONTACTS", "200000"))
+
+
+@pytest.fixture(scope="session")
+def plan_engine():
+    """Engine бази для EXPLAIN (пропуск, якщо вона не налаштована)"""
+    if not PLAN_CHECK_DATABASE_URL or not PLAN_CHECK_DATABASE_URL.startswith("postgresql"):
+        pytest.skip("PLAN_CHECK_DATABASE_URL не вказує на PostgreSQL")
+
+    engine = create_engine(PLAN_CHECK_DATABASE_URL)
+    if not inspect(engine).has_table("contacts"):
+        engine.dispose()
+        pytest.skip("У базі PLAN_CHECK_DATABASE_URL немає схеми, виконайте alembic upgrade head")
+
+    with engine.connect() as connection:
+        empty = connection.execute(text("SELECT NOT EXISTS (SELECT 1 FROM contacts)")).scalar()
+    if empty:
+        from generate_dataset import generate
+        generate(engine, owners=PLAN_DATASET_OWNERS, contacts=PLAN_DATASET_CONTACTS, seed=42, log=lambda _: None)
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def plan_context(plan_engine):
+    """Параметри CRUD викликів: власник з найбільшою кількістю контактів та його дані"""
+    with plan_engine.connect() as connection:
+        owner_id = connection.execute(text(
+            "SELECT owner_id FROM contacts GROUP BY owner_id ORDER BY COUNT(*) DESC, owner_id LIMIT 1"
+        )).scalar()
+        user = connection.execute(
+            text("SELECT email, username FROM users WHERE id = :id"), {"id": owner_id}
+        ).one()
+        contact_id, last_name = connection.execute(
+            text("SELECT id, last_name FROM contacts WHERE owner_id = :id ORDER BY id LIMIT 1"),
+            {"id": owner_id}
+        ).one()
+
+    return {
+        "owner_id": owner_id,
+        "email": user.email,
+        "username": user.username,
+        "contact_id": contact_id,
+        "search": last_name[:4]
+    }
+
+
+@pytest.fixture
+def plan_connection(plan_engine):
+    """З'єднання з зовнішньою транзакцією, що відкочується після тесту"""
+    connection = plan_engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
@@ -0,0 +1,171 @@
+"""
+Захоплення SQL з CRUD функцій та розбір планів ``EXPLAIN (FORMAT JSON)``.
+
+CRUD функція виконується в сесії поверх зовнішньої транзакції, що в
+кінці відкочується, тож база не змінюється. Кожен SELECT/INSERT/UPDATE/
+DELETE, який функція надіслала драйверу, потім пояснюється на тому самому
+з'єднанні з тими самими параметрами.
+"""
+
+import difflib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.database.connection import SessionLocal
+from app.database.query_stats import statement_shape
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+EXPLAINED_VERBS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+@dataclass
+class CapturedQuery:
+    """Запит, надісланий драйверу, та його план"""
+
+    statement: str
+    parameters: object
+    plan: Optional[dict] = None
+    explain_error: Optional[str] = None
+
+
+@dataclass
+class CrudCapture:
+    """Результат запуску CRUD функції: запити та виняток, якщо він був"""
+
+    name: str
+    queries: List[CapturedQuery] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+    def nodes(self) -> Iterator[dict]:
+        for query in self.queries:
+            if query.plan is not None:
+                yield from walk_plan(query.plan)
+
+    def seq_scans(self) -> Set[str]:
+        """Таблиці, що читаються повним скануванням"""
+        return {node["Relation Name"] for node in self.nodes() if node["Node Type"] == "Seq Scan"}
+
+    def used_indexes(self) -> Set[str]:
+        """Індекси, які використовує хоча б один запит"""
+        return {node["Index Name"] for node in self.nodes() if "Index Name" in node}
+
+    def snapshot(self) -> str:
+        """Текстовий знімок: форма SQL та дерево плану без вартостей"""
+        blocks = []
+        for query in self.queries:
+            lines = [statement_shape(query.statement)]
+            if query.plan is not None:
+                lines.extend(plan_shape(query.plan))
+            else:
+                lines.append(f"-> EXPLAIN failed: {query.explain_error}")
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks) + "\n"
+
+
+def walk_plan(node: dict) -> Iterator[dict]:
+    """Всі вузли плану в порядку обходу в глибину"""
+    yield node
+    for child in node.get("Plans", ()):
+        yield from walk_plan(child)
+
+
+def plan_shape(node: dict, depth: int = 0) -> List[str]:
+    """
+    Дерево плану як рядки ``-> <вузол> on <таблиця> using <індекс>``.
+
+    Вартості й оцінки рядків не потрапляють у знімок - вони змінюються
+    разом зі статистикою, а форма плану має бути стабільною.
+    """
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    lines = [f"{'  ' * depth}-> {label}"]
+    for child in node.get("Plans", ()):
+        lines.extend(plan_shape(child, depth + 1))
+    return lines
+
+
+def capture_crud(connection, name: str, call: Callable[[Session], object]) -> CrudCapture:
+    """
+    Запускає ``call(session)`` і пояснює кожен надісланий ним запит.
+
+    Виняток з CRUD функції не перериває захоплення - він зберігається в
+    ``error``, а вже надіслані запити все одно пояснюються.
+    """
+    capture = CrudCapture(name)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINED_VERBS):
+            # Для executemany достатньо плану першого набору параметрів
+            capture.queries.append(CapturedQuery(statement, parameters[0] if executemany else parameters))
+
+    # Ті ж опції сесії, що й у production (autoflush=False), лише на з'єднанні тесту
+    session = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        call(session)
+    except Exception as exc:  # noqa: BLE001 - знімок потрібен і для функцій, що падають
+        capture.error = exc
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+        session.close()
+
+    for query in capture.queries:
+        # Запит, що впав у самій функції, впаде і в EXPLAIN - не даємо йому зламати транзакцію
+        savepoint = connection.begin_nested()
+        try:
+            query.plan = explain(connection, query.statement, query.parameters)
+        except DBAPIError as exc:
+            savepoint.rollback()
+            query.explain_error = str(exc.orig).splitlines()[0]
+        else:
+            savepoint.commit()
+    return capture
+
+
+def explain(connection, statement: str, parameters) -> dict:
+    """Кореневий вузол ``EXPLAIN (FORMAT JSON)`` для запиту драйвера"""
+    result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def compare_snapshot(name: str, actual: str) -> Optional[str]:
+    """
+    Порівнює знімок плану з ``snapshots/<name>.txt``.
+
+    З ``PLAN_SNAPSHOT_UPDATE=1`` знімок записується або перезаписується.
+    Без нього відсутній знімок - помилка: інакше нова функція без знімка
+    в репозиторії проходила б перевірку, нічого не перевіряючи.
+
+    Returns:
+        Optional[str]: unified diff, якщо план змінився або знімка немає, інакше None
+    """
+    path = SNAPSHOT_DIR / f"{name}.txt"
+    if os.getenv("PLAN_SNAPSHOT_UPDATE") == "1":
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+        path.write_text(actual, encoding="utf-8")
+        return None
+    if not path.exists():
+        return f"snapshots/{name}.txt is missing, actual plan:\n{actual}"
+
+    expected = path.read_text(encoding="utf-8")
+    if expected == actual:
+        return None
+    return "".join(difflib.unified_diff(
+        expected.splitlines(keepends=True),
+        actual.splitlines(keepends=True),
+        fromfile=f"snapshots/{name}.txt",
+        tofile=f"{name} (actual)"
+    ))
+
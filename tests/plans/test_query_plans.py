@@ -0,0 +1,108 @@
+"""
+Регресійні перевірки планів запитів CRUD функцій.
+
+Для кожної функції з ``app/crud/contacts.py`` та ``app/crud/users.py``
+перевіряється, що її запити не сканують повністю ``contacts``/``users``,
+а форма планів порівнюється зі знімком у ``tests/plans/snapshots``.
+
+Запуск - ``make test-plans``, оновлення знімків після навмисної зміни
+індексів чи запитів - ``make test-plans-update``.
+"""
+
+import pytest
+from datetime import date
+
+from app.crud import contacts as crud_contacts
+from app.crud import users as crud_users
+from app.models.users import UserRole
+from app.schemas.contacts import ContactCreate, ContactUpdate
+from app.schemas.users import UserCreate, UserRoleUpdate, UserUpdate
+from plan_harness import capture_crud, compare_snapshot
+
+pytestmark = pytest.mark.plans
+
+OWNER_TABLES = {"contacts", "users"}
+MISSING_TOKEN = "plan-check-missing-token"
+
+SCENARIOS = {
+    "contacts.get_contact": lambda db, ctx: crud_contacts.get_contact(db, ctx["contact_id"], ctx["owner_id"]),
+    "contacts.get_contacts": lambda db, ctx: crud_contacts.get_contacts(db, ctx["owner_id"]),
+    "contacts.get_contacts_search": lambda db, ctx: crud_contacts.get_contacts(
+        db, ctx["owner_id"], search=ctx["search"]),
+    "contacts.get_contact_rows": lambda db, ctx: crud_contacts.get_contact_rows(
+        db, ctx["owner_id"], skip=50, limit=50),
+    "contacts.create_contact": lambda db, ctx: crud_contacts.create_contact(db, ContactCreate(
+        first_name="План", last_name="Перевірка", email="plan-check@example.com",
+        phone_number="+380501234567", birth_date=date(1990, 5, 15)
+    ), ctx["owner_id"]),
+    "contacts.create_contacts": lambda db, ctx: crud_contacts.create_contacts(db, [
+        ContactCreate(
+            first_name="План", last_name=last_name, email=f"plan-check-{last_name}@example.com",
+            phone_number="+380501234567", birth_date=date(1990, 5, 15)
+        )
+        for last_name in ("Бойко", "Мороз")
+    ], ctx["owner_id"]),
+    "contacts.update_contact": lambda db, ctx: crud_contacts.update_contact(
+        db, ctx["contact_id"], ContactUpdate(last_name="Яковенко"), ctx["owner_id"]),
+    "contacts.delete_contact": lambda db, ctx: crud_contacts.delete_contact(
+        db, ctx["contact_id"], ctx["owner_id"]),
+    "contacts.get_contact_facets": lambda db, ctx: crud_contacts.get_contact_facets(db, ctx["owner_id"]),
+    "contacts.count_contacts": lambda db, ctx: crud_contacts.count_contacts(db, ctx["owner_id"]),
+    "contacts.get_contact_changes": lambda db, ctx: crud_contacts.get_contact_changes(
+        db, ctx["owner_id"], since=1),
+    "contacts.get_contacts_with_upcoming_birthdays": lambda db, ctx: crud_contacts.get_contacts_with_upcoming_birthdays(
+        db, ctx["owner_id"]),
+    "contacts.get_upcoming_birthday_rows": lambda db, ctx: crud_contacts.get_upcoming_birthday_rows(
+        db, ctx["owner_id"]),
+    "users.get_user_by_email": lambda db, ctx: crud_users.get_user_by_email(db, ctx["email"]),
+    "users.get_user_by_username": lambda db, ctx: crud_users.get_user_by_username(db, ctx["username"]),
+    "users.get_user_by_id": lambda db, ctx: crud_users.get_user_by_id(db, ctx["owner_id"]),
+    "users.get_all_users": lambda db, ctx: crud_users.get_all_users(db),
+    "users.create_user": lambda db, ctx: crud_users.create_user(db, UserCreate(
+        username="plancheck", email="plan-check@example.com", password="plancheck123"
+    )),
+    "users.register_user": lambda db, ctx: crud_users.register_user(db, UserCreate(
+        username="plancheck", email="plan-check@example.com", password="plancheck123"
+    ), "plan-check-hash", MISSING_TOKEN),
+    "users.registration_conflict": lambda db, ctx: crud_users.registration_conflict(
+        db, ctx["email"], ctx["username"]),
+    "users.authenticate_user": lambda db, ctx: crud_users.authenticate_user(
+        db, ctx["email"], "wrong-password"),
+    "users.update_user": lambda db, ctx: crud_users.update_user(
+        db, ctx["owner_id"], UserUpdate(username="plancheck")),
+    "users.update_user_role": lambda db, ctx: crud_users.update_user_role(
+        db, ctx["owner_id"], UserRoleUpdate(role=UserRole.ADMIN)),
+    "users.update_user_avatar": lambda db, ctx: crud_users.update_user_avatar(
+        db, ctx["owner_id"], "https://example.com/avatar.jpg"),
+    "users.create_password_reset_token": lambda db, ctx: crud_users.create_password_reset_token(
+        db, ctx["email"]),
+    "users.verify_user_email": lambda db, ctx: crud_users.verify_user_email(
+        db, MISSING_TOKEN),
+    "users.reset_user_password": lambda db, ctx: crud_users.reset_user_password(
+        db, MISSING_TOKEN, "newpassword123"),
+    "users.verify_reset_token": lambda db, ctx: crud_users.verify_reset_token(
+        db, MISSING_TOKEN),
+    "users.clear_expired_reset_tokens": lambda db, ctx: crud_users.clear_expired_reset_tokens(db),
+}
+
+# Сторінка всіх користувачів читає users по порядку - Seq Scan з LIMIT тут очікуваний
+SEQ_SCAN_ALLOWED = {"users.get_all_users": {"users"}}
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_no_seq_scan(plan_connection, plan_context, name):
+    """Запити функції читають contacts/users тільки через індекси"""
+    capture = capture_crud(plan_connection, name, lambda db: SCENARIOS[name](db, plan_context))
+
+    assert capture.queries, f"{name} не надіслала жодного запиту"
+    scanned = capture.seq_scans() & (OWNER_TABLES - SEQ_SCAN_ALLOWED.get(name, set()))
+    assert not scanned, f"{name}: Seq Scan on {sorted(scanned)}\n\n{capture.snapshot()}"
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_plan_snapshot(plan_connection, plan_context, name):
+    """Форма планів збігається зі збереженим знімком"""
+    capture = capture_crud(plan_connection, name, lambda db: SCENARIOS[name](db, plan_context))
+
+    diff = compare_snapshot(name, capture.snapshot())
+    assert diff is None, f"План {name} змінився або не має знімка (PLAN_SNAPSHOT_UPDATE=1 записує знімок):\n{diff}"
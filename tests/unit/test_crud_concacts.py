@@ -1,15 +1,20 @@
 import pytest
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
+from app.config import settings
 from app.crud.contacts import (
     get_contact,
     get_contacts,
     create_contact,
+    create_contacts,
     update_contact,
     delete_contact,
-    get_contacts_with_upcoming_birthdays
+    get_contacts_with_upcoming_birthdays,
+    get_contact_changes,
+    get_contact_facets,
+    count_contacts
 )
 from app.schemas.contacts import ContactCreate, ContactUpdate
-from app.models.contacts import Contact
+from app.models.contacts import Contact, ContactTombstone, contact_initial
 
 
 @pytest.mark.unit
@@ -354,4 +359,154 @@ class TestContactCRUD:
         assert user1_contacts[0].owner_id == create_test_user.id
         assert user2_contacts[0].owner_id == user2.id
         assert user1_contacts[0].email == "contact1@example.com"
-        assert user2_contacts[0].email == "contact2@example.com"
\ No newline at end of file
+        assert user2_contacts[0].email == "contact2@example.com"
+
+    def test_get_contact_changes_tracks_create_update_delete(self, db_session, create_test_user):
+        """Тест дельта-синхронізації: створення, оновлення та видалення"""
+        owner_id = create_test_user.id
+        first = create_contact(db_session, ContactCreate(
+            first_name="Перший",
+            last_name="Контакт",
+            email="first@example.com",
+            phone_number="+380501234567",
+            birth_date=date(1990, 5, 15)
+        ), owner_id)
+        second = create_contact(db_session, ContactCreate(
+            first_name="Другий",
+            last_name="Контакт",
+            email="second@example.com",
+            phone_number="+380671234567",
+            birth_date=date(1985, 12, 25)
+        ), owner_id)
+        
+        current_seq, upserts, deleted_ids = get_contact_changes(db_session, owner_id, since=0)
+        assert current_seq == 2
+        assert {c.id for c in upserts} == {first.id, second.id}
+        assert deleted_ids == []
+        
+        update_contact(db_session, first.id, ContactUpdate(first_name="Змінений"), owner_id)
+        delete_contact(db_session, second.id, owner_id)
+        
+        current_seq, upserts, deleted_ids = get_contact_changes(db_session, owner_id, since=2)
+        assert current_seq == 4
+        assert [c.id for c in upserts] == [first.id]
+        assert deleted_ids == [second.id]
+        
+        # Клієнт вже синхронізований - змін немає
+        assert get_contact_changes(db_session, owner_id, since=4) == (4, [], [])
+
+    def test_old_tombstones_are_pruned(self, db_session, create_test_user, monkeypatch):
+        """Тест що старі tombstones видаляються, а клієнт з давнім since отримує None"""
+        monkeypatch.setattr(settings, "contact_tombstone_retention_days", 30)
+        owner_id = create_test_user.id
+        contacts = [
+            create_contact(db_session, ContactCreate(
+                first_name="Контакт",
+                last_name=f"Номер{i}",
+                email=f"pruned{i}@example.com",
+                phone_number="+380501234567",
+                birth_date=date(1990, 5, 15)
+            ), owner_id)
+            for i in range(3)
+        ]
+        
+        delete_contact(db_session, contacts[0].id, owner_id)
+        db_session.query(ContactTombstone).update({"deleted_at": datetime.now(timezone.utc) - timedelta(days=31)})
+        db_session.commit()
+        delete_contact(db_session, contacts[1].id, owner_id)
+        
+        assert [t.sync_seq for t in db_session.query(ContactTombstone)] == [5]
+        assert get_contact_changes(db_session, owner_id, since=3) is None
+        current_seq, _, deleted_ids = get_contact_changes(db_session, owner_id, since=4)
+        assert current_seq == 5
+        assert deleted_ids == [contacts[1].id]
+
+    def test_contact_counts_and_facets(self, db_session, create_test_user):
+        """Тест лічильників: загальна кількість та фасети за першою літерою прізвища"""
+        owner_id = create_test_user.id
+        created = []
+        for i, last_name in enumerate(["Петренко", "Павленко", "Коваленко"]):
+            created.append(create_contact(db_session, ContactCreate(
+                first_name="Іван",
+                last_name=last_name,
+                email=f"contact{i}@example.com",
+                phone_number="+380501234567",
+                birth_date=date(1990, 5, 15)
+            ), owner_id))
+        
+        assert count_contacts(db_session, owner_id) == (3, True)
+        assert get_contact_facets(db_session, owner_id) == {"К": 1, "П": 2}
+        
+        update_contact(db_session, created[0].id, ContactUpdate(last_name="Андрієнко"), owner_id)
+        delete_contact(db_session, created[2].id, owner_id)
+        
+        assert count_contacts(db_session, owner_id) == (2, True)
+        assert get_contact_facets(db_session, owner_id) == {"А": 1, "П": 1}
+        assert count_contacts(db_session, owner_id, search="Павл") == (1, True)
+
+    @pytest.mark.parametrize("last_name, initial", [
+        ("петренко", "П"),
+        ("ßmith", "S"),
+        ("", "#"),
+        (None, "#"),
+    ])
+    def test_contact_initial_fits_one_character(self, last_name, initial):
+        """Тест що літера фасету завжди один символ ("ß".upper() == "SS")"""
+        assert contact_initial(last_name) == initial
+
+    def test_create_contact_duplicate_email_per_owner(self, db_session, create_test_user, create_test_admin):
+        """Тест унікальності email в межах власника (без урахування регістру)"""
+        contact_data = ContactCreate(
+            first_name="Іван",
+            last_name="Петренко",
+            email="ivan@example.com",
+            phone_number="+380501234567",
+            birth_date=date(1990, 5, 15)
+        )
+        assert create_contact(db_session, contact_data, create_test_user.id) is not None
+        
+        duplicate = contact_data.model_copy(update={"email": "IVAN@example.com"})
+        assert create_contact(db_session, duplicate, create_test_user.id) is None
+        # Дублікат не зсуває лічильники синхронізації та фасетів
+        assert get_contact_changes(db_session, create_test_user.id, since=0)[0] == 1
+        assert get_contact_facets(db_session, create_test_user.id) == {"П": 1}
+        
+        # Інший власник може мати контакт з тим самим email
+        assert create_contact(db_session, contact_data, create_test_admin.id) is not None
+
+    def test_create_contacts_skips_duplicates(self, db_session, create_test_user):
+        """Тест масового створення: дублікати у власника та в самому пакеті пропускаються"""
+        owner_id = create_test_user.id
+        create_contact(db_session, ContactCreate(
+            first_name="Наявний",
+            last_name="Контакт",
+            email="existing@example.com",
+            phone_number="+380501234567",
+            birth_date=date(1990, 5, 15)
+        ), owner_id)
+        
+        batch = [
+            ContactCreate(
+                first_name="Іван",
+                last_name=last_name,
+                email=email,
+                phone_number="+380501234567",
+                birth_date=date(1990, 5, 15)
+            )
+            for last_name, email in [
+                ("Петренко", "one@example.com"),
+                ("Коваленко", "Existing@example.com"),
+                ("Павленко", "two@example.com"),
+                ("Бойко", "ONE@example.com")
+            ]
+        ]
+        created, duplicates = create_contacts(db_session, batch, owner_id)
+        
+        assert [row.email for row in created] == ["one@example.com", "two@example.com"]
+        assert duplicates == ["Existing@example.com", "ONE@example.com"]
+        assert count_contacts(db_session, owner_id) == (3, True)
+        assert get_contact_facets(db_session, owner_id) == {"К": 1, "П": 2}
+        
+        current_seq, upserts, _ = get_contact_changes(db_session, owner_id, since=1)
+        assert sorted(contact.email for contact in upserts) == ["one@example.com", "two@example.com"]
+        assert current_seq == 4
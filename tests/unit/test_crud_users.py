@@ -1,5 +1,5 @@
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app.crud.users import (
     get_user_by_email,
     get_user_by_username,
@@ -12,11 +12,15 @@ from app.crud.users import (
     update_user_avatar,
     create_password_reset_token,
     reset_user_password,
-    verify_reset_token
+    verify_reset_token,
+    refresh_verification_token,
+    clear_expired_reset_tokens,
+    register_user,
+    registration_conflict
 )
 from app.schemas.users import UserCreate, UserUpdate, UserRoleUpdate
 from app.models.users import User, UserRole
-from app.utils.auth import get_password_hash
+from app.utils.auth import get_password_hash, hash_token
 
 
 @pytest.mark.unit
@@ -81,6 +85,29 @@ class TestUserCRUD:
         assert created_user.verification_token is not None
         assert created_user.hashed_password != user_data.password  # Пароль має бути хешований
     
+    def test_register_user_success(self, db_session):
+        """Тест реєстрації одним INSERT"""
+        user_data = UserCreate(username="newuser", email="newuser@example.com", password="password123")
+        
+        user = register_user(db_session, user_data, get_password_hash("password123"), "signup-token")
+        
+        assert user is not None
+        assert user.id is not None
+        assert user.created_at is not None
+        assert user.verification_token == hash_token("signup-token")
+        assert authenticate_user(db_session, "newuser@example.com", "password123") is not None
+    
+    def test_register_user_conflict(self, db_session, create_test_user):
+        """Тест реєстрації з зайнятими email або username"""
+        taken_email = UserCreate(username="other", email=create_test_user.email, password="password123")
+        taken_username = UserCreate(username=create_test_user.username, email="other@example.com", password="password123")
+        
+        assert register_user(db_session, taken_email, "hashed", "token") is None
+        assert register_user(db_session, taken_username, "hashed", "token") is None
+        assert registration_conflict(db_session, taken_email.email, taken_email.username) == "email"
+        assert registration_conflict(db_session, taken_username.email, taken_username.username) == "username"
+        assert registration_conflict(db_session, "free@example.com", "free") is None
+    
     def test_authenticate_user_valid_credentials(self, db_session, create_test_user, test_user_data):
         """Тест аутентифікації з валідними credentials"""
         user = authenticate_user(
@@ -111,7 +138,7 @@ class TestUserCRUD:
             email="test@example.com",
             hashed_password=get_password_hash("password123"),
             role=UserRole.USER,
-            verification_token="valid_token_123",
+            verification_token=hash_token("valid_token_123"),
             is_verified=False
         )
         db_session.add(user)
@@ -120,7 +147,7 @@ class TestUserCRUD:
         # Верифікуємо email
         result = verify_user_email(db_session, "valid_token_123")
         
-        assert result is True
+        assert result is user
         
         # Перевіряємо, що користувач верифікований
         db_session.refresh(user)
@@ -130,7 +157,7 @@ class TestUserCRUD:
     def test_verify_user_email_invalid_token(self, db_session):
         """Тест верифікації email з невалідним токеном"""
         result = verify_user_email(db_session, "invalid_token")
-        assert result is False
+        assert result is None
     
     def test_update_user_success(self, db_session, create_test_user):
         """Тест успішного оновлення користувача"""
@@ -183,12 +210,15 @@ class TestUserCRUD:
     
     def test_create_password_reset_token_existing_user(self, db_session, create_test_user):
         """Тест створення токена скидання пароля для існуючого користувача"""
-        user = create_password_reset_token(db_session, create_test_user.email)
+        issued = create_password_reset_token(db_session, create_test_user.email)
         
-        assert user is not None
-        assert user.reset_password_token is not None
+        assert issued is not None
+        user, token = issued
+        # У базі лише дайджест, сирий токен повертається для листа
+        assert user.reset_password_token == hash_token(token)
         assert user.reset_password_expires is not None
-        assert user.reset_password_expires > datetime.now(datetime.timezone.utc())
+        # SQLite повертає час без часового поясу
+        assert user.reset_password_expires.replace(tzinfo=None) > datetime.utcnow()
     
     def test_create_password_reset_token_not_existing_user(self, db_session):
         """Тест створення токена скидання пароля для неіснуючого користувача"""
@@ -199,9 +229,9 @@ class TestUserCRUD:
         """Тест скидання пароля з валідним токеном"""
         # Створюємо токен скидання
         reset_token = "valid_reset_token"
-        expires_at = datetime.now(datetime.timezone.utc()) + timedelta(hours=1)
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         
-        create_test_user.reset_password_token = reset_token
+        create_test_user.reset_password_token = hash_token(reset_token)
         create_test_user.reset_password_expires = expires_at
         db_session.commit()
         
@@ -225,9 +255,9 @@ class TestUserCRUD:
         """Тест скидання пароля з просроченим токеном"""
         # Створюємо прострочений токен
         reset_token = "expired_token"
-        expires_at = datetime.now(datetime.timezone.utc()) - timedelta(hours=1)
+        expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
         
-        create_test_user.reset_password_token = reset_token
+        create_test_user.reset_password_token = hash_token(reset_token)
         create_test_user.reset_password_expires = expires_at
         db_session.commit()
         
@@ -238,9 +268,9 @@ class TestUserCRUD:
     def test_verify_reset_token_valid(self, db_session, create_test_user):
         """Тест перевірки валідного токена скидання"""
         reset_token = "valid_reset_token"
-        expires_at = datetime.now(datetime.timezone.utc()) + timedelta(hours=1)
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         
-        create_test_user.reset_password_token = reset_token
+        create_test_user.reset_password_token = hash_token(reset_token)
         create_test_user.reset_password_expires = expires_at
         db_session.commit()
         
@@ -251,4 +281,34 @@ class TestUserCRUD:
     def test_verify_reset_token_invalid(self, db_session):
         """Тест перевірки невалідного токена скидання"""
         user = verify_reset_token(db_session, "invalid_token")
-        assert user is None
\ No newline at end of file
+        assert user is None
+    
+    def test_refresh_verification_token(self, db_session, create_test_user):
+        """Тест видачі нового токена верифікації"""
+        old_digest = create_test_user.verification_token
+        
+        token = refresh_verification_token(db_session, create_test_user)
+        
+        assert create_test_user.verification_token == hash_token(token)
+        assert create_test_user.verification_token != old_digest
+        assert verify_user_email(db_session, token) is create_test_user
+    
+    def test_clear_expired_reset_tokens(self, db_session):
+        """Тест пакетного очищення прострочених токенів скидання"""
+        now = datetime.now(timezone.utc)
+        for i, expires in enumerate([now - timedelta(hours=2)] * 3 + [now + timedelta(hours=1)]):
+            db_session.add(User(
+                username=f"sweep{i}",
+                email=f"sweep{i}@example.com",
+                hashed_password="hashed",
+                role=UserRole.USER,
+                reset_password_token=hash_token(f"reset-{i}"),
+                reset_password_expires=expires
+            ))
+        db_session.commit()
+        
+        assert clear_expired_reset_tokens(db_session, batch_size=2) == 3
+        
+        remaining = db_session.query(User).filter(User.reset_password_token.isnot(None)).all()
+        assert [user.username for user in remaining] == ["sweep3"]
+        assert verify_reset_token(db_session, "reset-3") is not None
\ No newline at end of file
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import text
+from starlette.requests import Request
+
+from app.api import deps
+from app.database.replicas import ReplicaSet, reads_pinned_to_primary
+from app.utils.auth import create_access_token
+
+
+def make_request(subject=None):
+    """Запит з Bearer токеном subject (або без авторизації)"""
+    headers = []
+    if subject:
+        headers.append((b"authorization", f"Bearer {create_access_token({'sub': subject})}".encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.fixture
+def replica_files(tmp_path):
+    """Дві SQLite "репліки", що відрізняються вмістом"""
+    urls = []
+    for name in ("replica0", "replica1"):
+        url = f"sqlite:///{tmp_path / name}.db"
+        replica = ReplicaSet([url])
+        with replica.engines[0].begin() as connection:
+            connection.execute(text("CREATE TABLE node (name TEXT)"))
+            connection.execute(text("INSERT INTO node VALUES (:name)"), {"name": name})
+        replica.dispose()
+        urls.append(url)
+    return urls
+
+
+def node_name(connection):
+    return connection.execute(text("SELECT name FROM node")).scalar()
+
+
+@pytest.mark.unit
+class TestReplicaSet:
+    """Тести вибору реплік"""
+
+    def test_round_robin(self, replica_files):
+        """Тест почергового вибору реплік"""
+        replicas = ReplicaSet(replica_files)
+        names = []
+        for _ in range(4):
+            with replicas.connect() as connection:
+                names.append(node_name(connection))
+
+        assert names == ["replica0", "replica1", "replica0", "replica1"]
+        replicas.dispose()
+
+    def test_unavailable_replica_fails_over(self, replica_files, tmp_path):
+        """Тест що недоступна репліка виключається з ротації"""
+        broken = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        replicas = ReplicaSet([broken, replica_files[1]], retry_seconds=60)
+
+        for _ in range(3):
+            with replicas.connect() as connection:
+                assert node_name(connection) == "replica1"
+        assert replicas.healthy() == [1]
+
+        replicas.mark_down(1)
+        assert replicas.connect() is None
+        replicas.dispose()
+
+
+@pytest.mark.unit
+class TestReadRouting:
+    """Тести маршрутизації читаючих сесій"""
+
+    def test_reads_go_to_replica(self, replica_files, monkeypatch):
+        """Тест читання з репліки, якщо користувач нещодавно не писав"""
+        monkeypatch.setattr(deps, "replicas", ReplicaSet(replica_files[:1]))
+        monkeypatch.setattr("app.database.replicas.redis_service", Mock(has_primary_pin=Mock(return_value=False)))
+
+        session_dependency = deps.get_read_db(make_request("reader@example.com"))
+        db = next(session_dependency)
+        assert node_name(db) == "replica0"
+        session_dependency.close()
+
+    def test_pinned_reads_go_to_primary(self, replica_files, monkeypatch):
+        """Тест read-your-writes: після запису читання йдуть на primary"""
+        replicas = ReplicaSet(replica_files[:1])
+        replicas.connect = Mock()
+        monkeypatch.setattr(deps, "replicas", replicas)
+        monkeypatch.setattr("app.database.replicas.redis_service", Mock(has_primary_pin=Mock(return_value=True)))
+
+        session_dependency = deps.get_read_db(make_request("writer@example.com"))
+        next(session_dependency)
+        session_dependency.close()
+
+        replicas.connect.assert_not_called()
+
+    def test_pin_without_redis_prefers_primary(self, monkeypatch):
+        """Тест що без Redis читання автора запиту йдуть на primary"""
+        monkeypatch.setattr("app.database.replicas.redis_service", Mock(has_primary_pin=Mock(return_value=None)))
+
+        assert reads_pinned_to_primary("writer@example.com") is True
+        assert reads_pinned_to_primary(None) is False
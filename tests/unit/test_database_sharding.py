@@ -0,0 +1,136 @@
+import pytest
+from datetime import date
+from sqlalchemy import func, select
+
+from app.crud.contacts import create_contact, delete_contact, get_contact_changes, get_contacts, count_contacts
+from app.database import sharding
+from app.database.sharding import HashRing, OwnerMigrating, ShardRouter, create_shard_tables, move_owner
+from app.models.contacts import Contact, OwnerShardAssignment
+from app.schemas.contacts import ContactCreate
+
+
+def contact_data(index):
+    return ContactCreate(
+        first_name="Іван",
+        last_name=f"Петренко{index}",
+        email=f"ivan{index}@example.com",
+        phone_number="+380501234567",
+        birth_date=date(1990, 5, 15)
+    )
+
+
+def shard_count(router, shard, owner_id):
+    with router.session(shard) as session:
+        return session.scalar(select(func.count()).select_from(Contact).where(Contact.owner_id == owner_id))
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    """Два SQLite шарди замість CONTACT_SHARDS"""
+    router = ShardRouter({name: f"sqlite:///{tmp_path / name}.db" for name in ("shard0", "shard1")})
+    for engine in router.engines.values():
+        create_shard_tables(engine)
+    monkeypatch.setattr(sharding, "shards", router)
+    yield router
+    router.dispose()
+
+
+@pytest.mark.unit
+class TestHashRing:
+    """Тести кільця consistent hashing"""
+
+    def test_adding_shard_moves_only_to_new_shard(self):
+        """Тест що новий шард забирає власників тільки собі"""
+        before = HashRing(["shard0", "shard1"])
+        after = HashRing(["shard0", "shard1", "shard2"])
+
+        moved = [owner for owner in range(1000) if before.shard_for(owner) != after.shard_for(owner)]
+
+        assert {after.shard_for(owner) for owner in moved} == {"shard2"}
+        assert 200 < len(moved) < 470
+        assert {before.shard_for(owner) for owner in range(1000)} == {"shard0", "shard1"}
+
+
+@pytest.mark.unit
+class TestContactSharding:
+    """Тести маршрутизації CRUD контактів на шарди"""
+
+    def test_crud_routed_to_owner_shard(self, db_session, create_test_user, router):
+        """Тест що контакти пишуться і читаються з шарда власника"""
+        owner_id = create_test_user.id
+        home = router.ring.shard_for(owner_id)
+        other = ({"shard0", "shard1"} - {home}).pop()
+
+        contact = create_contact(db_session, contact_data(1), owner_id)
+
+        assert contact.id is not None
+        assert shard_count(router, home, owner_id) == 1
+        assert shard_count(router, other, owner_id) == 0
+        assert db_session.query(Contact).count() == 0
+        assert [c.email for c in get_contacts(db_session, owner_id)] == ["ivan1@example.com"]
+        assert count_contacts(db_session, owner_id) == (1, True)
+
+    def test_move_owner(self, db_session, create_test_user, router):
+        """Тест перенесення власника зі збереженням ID контактів"""
+        owner_id = create_test_user.id
+        source = router.ring.shard_for(owner_id)
+        target = ({"shard0", "shard1"} - {source}).pop()
+        kept = [create_contact(db_session, contact_data(index), owner_id) for index in range(3)]
+        delete_contact(db_session, kept.pop().id, owner_id)
+        seq_before, _, _ = get_contact_changes(db_session, owner_id)
+
+        stats = move_owner(db_session, owner_id, target, drain_seconds=0)
+
+        assert (stats["source"], stats["target"], stats["contacts"]) == (source, target, 2)
+        assert (stats["tombstones"], stats["renumbered"]) == (1, 0)
+        assert shard_count(router, source, owner_id) == 0
+        assert shard_count(router, target, owner_id) == 2
+        assert router.locate(db_session, owner_id) == (target, False)
+        assert {c.id for c in get_contacts(db_session, owner_id)} == {c.id for c in kept}
+        # Для клієнтів перенесення непомітне
+        assert get_contact_changes(db_session, owner_id, since=seq_before) == (seq_before, [], [])
+        assert count_contacts(db_session, owner_id) == (2, True)
+
+    def test_contact_ids_unique_across_shards(self, db_session, create_test_user, create_test_admin, router):
+        """Тест що ID нових контактів видає спільний лічильник, а не послідовність шарда"""
+        owners = [create_test_user.id, create_test_admin.id]
+        for owner_id, shard in zip(owners, ("shard0", "shard1")):
+            db_session.add(OwnerShardAssignment(owner_id=owner_id, shard=shard))
+        db_session.commit()
+
+        ids = [create_contact(db_session, contact_data(index), owner).id for index, owner in enumerate(owners)]
+
+        assert ids[1] == ids[0] + 1
+
+    def test_move_owner_renumbers_legacy_id_collision(self, db_session, create_test_user, router):
+        """Тест що контакт зі старим ID, зайнятим на цільовому шарді, отримує новий ID і tombstone"""
+        owner_id = create_test_user.id
+        source = router.ring.shard_for(owner_id)
+        target = ({"shard0", "shard1"} - {source}).pop()
+        kept = [create_contact(db_session, contact_data(index), owner_id) for index in range(2)]
+        seq_before, _, _ = get_contact_changes(db_session, owner_id)
+        # Контакт іншого власника, створений послідовністю шарда до появи лічильника
+        with router.session(target) as session:
+            session.add(Contact(id=kept[0].id, owner_id=999, **contact_data(9).model_dump()))
+            session.commit()
+
+        stats = move_owner(db_session, owner_id, target, drain_seconds=0)
+
+        assert (stats["contacts"], stats["tombstones"], stats["renumbered"]) == (2, 1, 1)
+        current_seq, upserts, deleted_ids = get_contact_changes(db_session, owner_id, since=seq_before)
+        assert current_seq == seq_before + 1
+        assert [c.email for c in upserts] == [kept[0].email]
+        assert upserts[0].id not in {c.id for c in kept}
+        assert deleted_ids == [kept[0].id]
+        assert kept[1].id in {c.id for c in get_contacts(db_session, owner_id)}
+
+    def test_writes_rejected_while_moving(self, db_session, create_test_user, router):
+        """Тест що під час перенесення записи відхиляються, а читання працюють"""
+        owner_id = create_test_user.id
+        create_contact(db_session, contact_data(1), owner_id)
+        db_session.add(OwnerShardAssignment(owner_id=owner_id, shard=router.ring.shard_for(owner_id), moving=True))
+        db_session.commit()
+
+        with pytest.raises(OwnerMigrating):
+            create_contact(db_session, contact_data(2), owner_id)
+        assert len(get_contacts(db_session, owner_id)) == 1
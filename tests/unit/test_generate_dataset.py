@@ -0,0 +1,47 @@
+import random
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.database.base import Base
+from generate_dataset import generate, contacts_per_owner
+
+
+def _load(path, seed):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    generate(engine, owners=20, contacts=2000, seed=seed, batch_size=500, log=lambda message: None)
+    return engine
+
+
+@pytest.mark.unit
+class TestGenerateDataset:
+    """Тести генератора синтетичного набору даних"""
+
+    def test_contacts_per_owner_sums_to_total(self):
+        """Тест що розподіл контактів зберігає загальну кількість"""
+        counts = contacts_per_owner(random.Random(1), 100, 12345)
+
+        assert sum(counts) == 12345
+        assert len(counts) == 100
+
+    def test_generate_fills_counters_consistently(self, tmp_path):
+        """Тест лічильників синхронізації та фасетів"""
+        engine = _load(tmp_path / "dataset.db", seed=7)
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM users")).scalar() == 20
+            assert connection.execute(text("SELECT COUNT(*) FROM contacts")).scalar() == 2000
+            assert connection.execute(text("SELECT SUM(count) FROM contact_facet_counts")).scalar() == 2000
+            mismatched = connection.execute(text(
+                "SELECT COUNT(*) FROM contact_sync_state s WHERE s.change_seq != "
+                "(SELECT COUNT(*) FROM contacts c WHERE c.owner_id = s.owner_id)"
+            )).scalar()
+            assert mismatched == 0
+
+    def test_generate_is_reproducible(self, tmp_path):
+        """Тест що той самий seed дає ті самі дані"""
+        query = text("SELECT first_name, last_name, email, birth_date, owner_id FROM contacts ORDER BY id")
+
+        with _load(tmp_path / "first.db", seed=3).connect() as first, \
+                _load(tmp_path / "second.db", seed=3).connect() as second:
+            assert first.execute(query).fetchall() == second.execute(query).fetchall()
@@ -0,0 +1,90 @@
+import gzip
+import json
+import pytest
+
+from app.middleware.compression import CompressionMiddleware, build_compressors, negotiate
+
+LARGE_JSON = json.dumps([{"id": i, "email": f"user{i}@example.com"} for i in range(200)]).encode()
+
+
+def json_app(body: bytes, content_type: bytes = b"application/json"):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(body)).encode()),
+                (b"etag", b'"abc"'),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def request(app, accept_encoding: bytes = b"gzip"):
+    """Заголовки і тіло відповіді middleware"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding)]}
+    await app(scope, None, send)
+    return dict(messages[0]["headers"]), messages[1]["body"]
+
+
+def middleware(inner, **kwargs):
+    return CompressionMiddleware(inner, build_compressors(["gzip"], {"gzip": 6}), **kwargs)
+
+
+@pytest.mark.unit
+class TestNegotiate:
+    """Тести вибору кодування за Accept-Encoding"""
+
+    def test_quality_and_server_preference(self):
+        """Тест що більший q перемагає, а при рівних - порядок сервера"""
+        assert negotiate("gzip, br", ["zstd", "br", "gzip"]) == "br"
+        assert negotiate("gzip, br;q=0.5", ["br", "gzip"]) == "gzip"
+        assert negotiate("*", ["br", "gzip"]) == "br"
+        assert negotiate("gzip;q=0, identity", ["gzip"]) is None
+        assert negotiate("", ["gzip"]) is None
+
+    def test_unknown_encoding_rejected(self):
+        """Тест помилки конфігурації з невідомим кодуванням"""
+        with pytest.raises(ValueError):
+            build_compressors(["lzma"], {})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCompressionMiddleware:
+    """Тести стиснення відповідей"""
+
+    async def test_compresses_large_json(self):
+        """Тест стиснення великої JSON відповіді та оновлення заголовків"""
+        headers, body = await request(middleware(json_app(LARGE_JSON)))
+
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"content-length"] == str(len(body)).encode()
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert headers[b"etag"] == b'W/"abc"'
+        assert gzip.decompress(body) == LARGE_JSON
+
+    async def test_compresses_in_thread_above_threshold(self):
+        """Тест що великі тіла стискаються тим самим кодуванням через пул потоків"""
+        headers, body = await request(middleware(json_app(LARGE_JSON), thread_threshold=1))
+
+        assert gzip.decompress(body) == LARGE_JSON
+
+    @pytest.mark.parametrize("body, content_type, accept_encoding", [
+        (b"{}", b"application/json", b"gzip"),
+        (LARGE_JSON, b"image/png", b"gzip"),
+        (LARGE_JSON, b"application/json", b"identity"),
+    ])
+    async def test_skips_small_binary_or_unaccepted(self, body, content_type, accept_encoding):
+        """Тест що малі, вже стиснені типи та відповіді без Accept-Encoding не стискаються"""
+        headers, sent = await request(middleware(json_app(body, content_type)), accept_encoding)
+
+        assert b"content-encoding" not in headers
+        assert sent == body
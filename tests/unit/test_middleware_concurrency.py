@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+
+from app.middleware.concurrency import AIMDLimiter, ConcurrencyLimitMiddleware, parse_route_budgets
+
+
+class BlockingApp:
+    """ASGI застосунок, що тримає запити, доки не встановлено release"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def request(app, path):
+    """Статус і заголовки відповіді middleware на GET path"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "method": "GET", "path": path}, None, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+@pytest.mark.unit
+class TestAIMDLimiter:
+    """Тести адаптивного ліміту"""
+
+    def test_backoff_on_slow_response_and_growth_when_saturated(self):
+        """Тест зменшення ліміту на повільній відповіді та зростання під навантаженням"""
+        limiter = AIMDLimiter(initial=10, min_limit=2, max_limit=20, latency_target=0.1)
+
+        assert limiter.try_acquire()
+        limiter.release(latency=0.5, failed=False)
+        assert limiter.limit == pytest.approx(9.0)
+
+        # Друге зменшення в межах того ж вікна ігнорується
+        assert limiter.try_acquire()
+        limiter.release(latency=0.5, failed=False)
+        assert limiter.limit == pytest.approx(9.0)
+
+        for _ in range(9):
+            assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        limiter.release(latency=0.01, failed=False)
+        assert limiter.limit == pytest.approx(9.0 + 1 / 9)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestConcurrencyLimitMiddleware:
+    """Тести відхилення запитів понад ліміт"""
+
+    async def test_sheds_over_limit_but_serves_priority_paths(self):
+        """Тест 503 з Retry-After понад ліміт і пропуску /health"""
+        inner = BlockingApp()
+        limiter = AIMDLimiter(initial=2, min_limit=1, max_limit=10, latency_target=10)
+        app = ConcurrencyLimitMiddleware(inner, limiter, retry_after=3)
+
+        held = [asyncio.create_task(request(app, "/api/v1/contacts/")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        status, headers = await request(app, "/api/v1/users/me")
+        assert (status, headers[b"retry-after"]) == (503, b"3")
+
+        health = asyncio.create_task(request(app, "/health"))
+        inner.release.set()
+        assert (await health)[0] == 200
+        assert [(await task)[0] for task in held] == [200, 200]
+        assert limiter.in_flight == 0
+
+    async def test_route_budget_keeps_room_for_other_routes(self):
+        """Тест що важкий маршрут не забирає весь ліміт"""
+        inner = BlockingApp()
+        limiter = AIMDLimiter(initial=10, min_limit=1, max_limit=10, latency_target=10)
+        app = ConcurrencyLimitMiddleware(
+            inner, limiter, route_budgets=parse_route_budgets("/api/v1/contacts/bulk=0.2")
+        )
+
+        held = [asyncio.create_task(request(app, "/api/v1/contacts/bulk")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert (await request(app, "/api/v1/contacts/bulk"))[0] == 503
+        me = asyncio.create_task(request(app, "/api/v1/users/me"))
+        inner.release.set()
+        assert (await me)[0] == 200
+        await asyncio.gather(*held)
@@ -0,0 +1,88 @@
+import pytest
+
+from app.middleware.http_cache import HTTPCacheMiddleware, etag_matches, make_etag
+
+
+class CountingApp:
+    """ASGI застосунок з lifespan, що рахує HTTP запити"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await send({"type": "lifespan.startup.complete"})
+            return
+        self.calls += 1
+        status = 200 if scope["path"] != "/missing" else 404
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"status":"healthy"}'})
+
+
+async def request(app, path, headers=(), method="GET"):
+    """Статус, заголовки і тіло відповіді"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "headers": list(headers)}, None, send)
+    return messages[0]["status"], dict(messages[0]["headers"]), messages[1]["body"]
+
+
+async def started(app):
+    """Прогін lifespan startup (рендер кешованих шляхів)"""
+    async def send(message):
+        pass
+
+    await app({"type": "lifespan", "app": None}, None, send)
+
+
+@pytest.mark.unit
+class TestETag:
+    """Тести порівняння ETag"""
+
+    def test_weak_comparison(self):
+        """Тест що W/ не впливає на збіг, а список і * підтримуються"""
+        etag = make_etag(b"body")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches(f'"other", {etag}', f"W/{etag}")
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestHTTPCacheMiddleware:
+    """Тести відповідей з пам'яті"""
+
+    async def test_serves_precomputed_response_and_304(self):
+        """Тест що шлях рендериться раз при старті, а повторні запити отримують ETag і 304"""
+        inner = CountingApp()
+        app = HTTPCacheMiddleware(inner, {"/health": "no-cache", "/missing": "public, max-age=60"})
+        await started(app)
+        assert inner.calls == 2
+
+        status, headers, body = await request(app, "/health")
+        assert (status, body) == (200, b'{"status":"healthy"}')
+        assert headers[b"cache-control"] == b"no-cache"
+        assert headers[b"etag"] == make_etag(body).encode()
+
+        status, headers, body = await request(app, "/health", [(b"if-none-match", headers[b"etag"])])
+        assert (status, body) == (304, b"")
+
+        assert (await request(app, "/health", method="HEAD"))[2] == b""
+        assert inner.calls == 2
+
+    async def test_uncached_paths_pass_through(self):
+        """Тест що некешовані шляхи, не-200 відповіді та POST доходять до застосунку"""
+        inner = CountingApp()
+        app = HTTPCacheMiddleware(inner, {"/missing": "public, max-age=60"})
+        await started(app)
+
+        assert (await request(app, "/missing"))[0] == 404
+        assert b"etag" not in (await request(app, "/contacts"))[1]
+        await request(app, "/missing", method="POST")
+        assert inner.calls == 4
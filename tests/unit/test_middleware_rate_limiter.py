@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from app.middleware.rate_limiter import RateLimitMiddleware, RateLimiter, RatePolicy, request_identity
+from app.services.redis import RedisService
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def request(app, method, path, client="10.0.0.1"):
+    """Статус і заголовки відповіді middleware"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": (client, 1234)}
+    await app(scope, None, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Тести політик і локального token bucket"""
+
+    def test_policy_for_prefers_exact_path_and_method(self):
+        """Тест вибору політики: точний шлях перед префіксом, метод враховується"""
+        limiter = RateLimiter("/api/v1/contacts/*=100/minute,POST /api/v1/contacts/bulk=2/hour")
+
+        assert limiter.policy_for("POST", "/api/v1/contacts/bulk") == RatePolicy(
+            2, 3600, "POST /api/v1/contacts/bulk"
+        )
+        assert limiter.policy_for("GET", "/api/v1/contacts/bulk").capacity == 100
+        assert limiter.policy_for("GET", "/api/v1/users/me") is None
+
+    def test_local_fallback_when_redis_unavailable(self):
+        """Тест що без Redis ліміт рахується в пам'яті процесу"""
+        limiter = RateLimiter("/api/v1/users/me=2/minute")
+        policy = limiter.policy_for("GET", "/api/v1/users/me")
+
+        with patch("app.middleware.rate_limiter.redis_service.take_token", return_value=None):
+            results = [limiter.check("user:a", policy)[0] for _ in range(3)]
+            other = limiter.check("user:b", policy)[0]
+
+        assert results == [True, True, False]
+        assert other is True
+
+    def test_identity_from_bearer_token(self):
+        """Тест що бакет належить користувачу з токена, а не IP"""
+        scope = {"headers": [(b"authorization", b"Bearer token")], "client": ("10.0.0.1", 1)}
+
+        with patch("app.middleware.rate_limiter.verify_token", return_value="ivan@example.com"):
+            assert request_identity(scope) == "user:ivan@example.com"
+        with patch("app.middleware.rate_limiter.verify_token", return_value=None):
+            assert request_identity(scope) == "ip:10.0.0.1"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRateLimitMiddleware:
+    """Тести відповіді 429 і заголовків RateLimit"""
+
+    async def test_headers_and_429(self):
+        """Тест заголовків на успішній відповіді та 429 з Retry-After"""
+        app = RateLimitMiddleware(ok_app, RateLimiter("GET /api/v1/users/me=1/minute"))
+
+        with patch("app.middleware.rate_limiter.redis_service.take_token", return_value=None):
+            status, headers = await request(app, "GET", "/api/v1/users/me")
+            assert status == 200
+            assert headers[b"ratelimit-remaining"] == b"0"
+            assert headers[b"ratelimit-policy"] == b"1;w=60"
+
+            status, headers = await request(app, "GET", "/api/v1/users/me")
+            assert status == 429
+            assert headers[b"retry-after"] == b"60"
+
+            assert (await request(app, "POST", "/api/v1/users/me"))[0] == 200
+
+
+@pytest.mark.unit
+class TestTakeToken:
+    """Тести виклику Lua скрипта token bucket"""
+
+    def test_take_token_runs_script_once_registered(self):
+        """Тест що скрипт реєструється один раз і результат розбирається"""
+        service = RedisService()
+        script = Mock(return_value=[1, "4.5"])
+        client = Mock()
+        client.register_script.return_value = script
+        service.redis_client = client
+
+        assert service.take_token("GET /me:user:a", 5, 0.5) == (True, 4.5)
+        assert service.take_token("GET /me:user:a", 5, 0.5) == (True, 4.5)
+
+        client.register_script.assert_called_once()
+        script.assert_called_with(keys=["rate:GET /me:user:a"], args=[5, 0.5], client=client)
+
+    def test_take_token_without_redis(self):
+        """Тест що без Redis повертається None (локальний лімітер)"""
+        service = RedisService()
+
+        with patch.object(RedisService, "_connect"):
+            assert service.take_token("key", 5, 0.5) is None
@@ -0,0 +1,34 @@
+import pytest
+from app.database.query_stats import QueryStats, statement_shape
+
+
+@pytest.mark.unit
+class TestQueryStats:
+    """Тести для статистики SQL запитів"""
+
+    def test_statement_shape_collapses_in_lists(self):
+        """Тест однакової форми для IN списків різної довжини"""
+        short = statement_shape("SELECT * FROM contacts WHERE id IN (?, ?)")
+        long = statement_shape("SELECT *\n  FROM contacts WHERE id IN (%(id_1)s, %(id_2)s, %(id_3)s)")
+
+        assert short == "SELECT * FROM contacts WHERE id IN (?...)"
+        assert long == short
+
+    def test_repeated_shapes_flags_n_plus_one(self):
+        """Тест виявлення повторюваних запитів"""
+        stats = QueryStats(record_statements=True)
+        stats.record("SELECT * FROM users WHERE id = ?", 0.001)
+        for _ in range(3):
+            stats.record("SELECT * FROM contacts WHERE owner_id = ?", 0.002)
+
+        assert stats.count == 4
+        assert stats.repeated_shapes(3) == [("SELECT * FROM contacts WHERE owner_id = ?", 3)]
+
+    def test_statements_not_recorded_by_default(self):
+        """Тест що без профілювання тексти запитів не зберігаються"""
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.001)
+
+        assert stats.count == 1
+        assert stats.statements is None
+        assert stats.repeated_shapes(1) == []
@@ -0,0 +1,57 @@
+import os
+import pytest
+
+from app.config import Settings
+from app.server import PROMETHEUS_MULTIPROC_ENV, default_workers, gunicorn_options, prepare_metrics_dir
+
+
+@pytest.mark.unit
+class TestServerOptions:
+    """Тести налаштувань production сервера"""
+
+    def test_options_from_settings(self):
+        """Тест що опції gunicorn беруться з Settings"""
+        config = Settings(
+            server_port=9000,
+            server_workers=3,
+            server_keepalive_seconds=10,
+            server_max_requests=500,
+            server_max_requests_jitter=50
+        )
+
+        options = gunicorn_options(config)
+
+        assert options["bind"] == "0.0.0.0:9000"
+        assert options["workers"] == 3
+        assert options["keepalive"] == 10
+        assert (options["max_requests"], options["max_requests_jitter"]) == (500, 50)
+        assert options["preload_app"] is False
+
+    def test_overrides_and_default_workers(self):
+        """Тест пріоритету аргументів і кількості воркерів за замовчуванням"""
+        options = gunicorn_options(Settings(server_workers=0), workers=None, bind="127.0.0.1:8001")
+
+        assert options["workers"] == default_workers()
+        assert options["bind"] == "127.0.0.1:8001"
+
+    def test_prepare_metrics_dir_removes_stale_metrics(self, tmp_path, monkeypatch):
+        """Тест що з каталогу видаляються лише файли метрик попереднього запуску"""
+        path = tmp_path / "metrics"
+        path.mkdir()
+        (path / "counter_123.db").write_bytes(b"stale")
+        (path / "README").write_text("keep")
+        (path / "nested").mkdir()
+        # setenv, а не delenv: відсутню змінну monkeypatch не прибрав би після тесту
+        monkeypatch.setenv(PROMETHEUS_MULTIPROC_ENV, "")
+
+        assert prepare_metrics_dir(Settings(prometheus_multiproc_dir=str(path))) == str(path)
+        assert sorted(os.listdir(path)) == ["README", "nested"]
+        assert os.environ[PROMETHEUS_MULTIPROC_ENV] == str(path)
+
+    def test_prepare_metrics_dir_creates_missing(self, tmp_path, monkeypatch):
+        """Тест що відсутній каталог метрик створюється"""
+        path = tmp_path / "missing" / "metrics"
+        monkeypatch.setenv(PROMETHEUS_MULTIPROC_ENV, "")
+
+        assert prepare_metrics_dir(Settings(prometheus_multiproc_dir=str(path))) == str(path)
+        assert path.is_dir()
@@ -1,16 +1,24 @@
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 import io
+import sys
 
 from app.services.redis import RedisService
 from app.services.cloudinary import upload_avatar, delete_avatar
 
 
+@pytest.fixture
+def mock_redis(monkeypatch):
+    """Підміняє пакет redis, який RedisService імпортує при підключенні"""
+    module = Mock()
+    monkeypatch.setitem(sys.modules, "redis", module)
+    return module
+
+
 @pytest.mark.unit
 class TestRedisService:
     """Тести для Redis сервісу"""
     
-    @patch('app.services.redis.redis')
     def test_redis_service_connect_success(self, mock_redis):
         """Тест успішного підключення до Redis"""
         mock_redis_client = Mock()
@@ -22,7 +30,6 @@ class TestRedisService:
         assert service.redis_client == mock_redis_client
         mock_redis_client.ping.assert_called_once()
     
-    @patch('app.services.redis.redis')
     def test_redis_service_connect_failure(self, mock_redis):
         """Тест невдалого підключення до Redis"""
         mock_redis.Redis.side_effect = Exception("Connection failed")
@@ -31,6 +38,27 @@ class TestRedisService:
         
         assert service.redis_client is None
     
+    def test_redis_service_connects_lazily(self, mock_redis):
+        """Тест що Redis не підключається при створенні сервісу"""
+        service = RedisService()
+        
+        mock_redis.ConnectionPool.assert_not_called()
+        assert service.redis_client == mock_redis.Redis.return_value
+        mock_redis.ConnectionPool.assert_called_once()
+    
+    def test_redis_service_retry_delay_after_failure(self, mock_redis):
+        """Тест що після невдалого підключення наступна спроба відкладається"""
+        mock_redis.Redis.return_value.ping.side_effect = Exception("Connection refused")
+        service = RedisService()
+        
+        assert service.redis_client is None
+        assert service.redis_client is None
+        assert mock_redis.Redis.call_count == 1
+        
+        service.close()
+        mock_redis.Redis.return_value.ping.side_effect = None
+        assert service.redis_client == mock_redis.Redis.return_value
+    
     def test_is_connected_true(self):
         """Тест перевірки з'єднання (підключений)"""
         service = RedisService()
@@ -169,6 +197,31 @@ class TestRedisService:
         
         assert result is False
 
+    
+    def test_bump_contacts_version(self):
+        """Тест інвалідації кешу контактів через версію власника"""
+        service = RedisService()
+        service.redis_client = Mock()
+        
+        assert service.bump_contacts_version(7) is True
+        service.redis_client.incr.assert_called_once_with("contacts_version:7")
+    
+    def test_get_contacts_version_defaults_to_zero(self):
+        """Тест версії контактів, якої ще немає в Redis"""
+        service = RedisService()
+        service.redis_client = Mock()
+        service.redis_client.get.return_value = None
+        
+        assert service.get_contacts_version(7) == 0
+    
+    def test_response_cache_not_connected(self):
+        """Тест кешу відповідей коли Redis не підключений"""
+        service = RedisService()
+        service.redis_client = None
+        
+        assert service.get_contacts_version(7) is None
+        assert service.get_response_cache("contacts:7:v1:list:abc") is None
+        assert service.set_response_cache("contacts:7:v1:list:abc", b"[]") is False
 
 @pytest.mark.unit
 class TestCloudinaryService:
@@ -309,4 +362,100 @@ class TestCacheUtils:
         
         invalidate_user_cache("test@example.com")
         
-        mock_redis_service.delete_user_cache.assert_called_once_with("test@example.com")
\ No newline at end of file
+        mock_redis_service.delete_user_cache.assert_called_once_with("test@example.com")
+
+@pytest.fixture
+def memory_tracing(monkeypatch):
+    """Вмикає трасування з memory експортером і повним семплюванням"""
+    pytest.importorskip("opentelemetry.sdk")
+    from app.config import settings
+    from app.services import tracing
+
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_exporter", "memory")
+    monkeypatch.setattr(settings, "tracing_sample_ratio", 1.0)
+    tracing.setup_tracing()
+    yield tracing
+    monkeypatch.undo()
+    tracing.setup_tracing()
+
+
+@pytest.mark.unit
+class TestTracing:
+    """Тести для трасування"""
+
+    def test_traced_without_setup_calls_function(self):
+        """Тест що без налаштування декоратор лише викликає функцію"""
+        from app.services.tracing import traced, get_tracer
+
+        @traced()
+        def add(a, b):
+            return a + b
+
+        assert get_tracer() is None
+        assert add(2, 3) == 5
+
+    def test_tracing_configured_in_lifespan(self, monkeypatch):
+        """Тест що провайдер створює старт застосунку, а не імпорт app.main"""
+        pytest.importorskip("opentelemetry.sdk")
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import app
+        from app.services import tracing
+
+        monkeypatch.setattr(settings, "tracing_enabled", True)
+        monkeypatch.setattr(settings, "tracing_exporter", "memory")
+        assert tracing.get_tracer() is None
+
+        with TestClient(app):
+            assert tracing.get_tracer() is not None
+        assert tracing.get_tracer() is None
+
+    def test_file_exporter_writes_json_lines_and_closes(self, tmp_path, monkeypatch):
+        """Тест що file експортер пише один спан на рядок і закриває файл при зупинці"""
+        pytest.importorskip("opentelemetry.sdk")
+        import json
+        from app.config import settings
+        from app.services import tracing
+
+        path = tmp_path / "traces.jsonl"
+        monkeypatch.setattr(settings, "tracing_enabled", True)
+        monkeypatch.setattr(settings, "tracing_exporter", "file")
+        monkeypatch.setattr(settings, "tracing_file_path", str(path))
+        monkeypatch.setattr(settings, "tracing_sample_ratio", 1.0)
+        tracing.setup_tracing()
+        trace_file = tracing._trace_file
+
+        @tracing.traced("first")
+        def first():
+            return second()
+
+        @tracing.traced("second")
+        def second():
+            return "ok"
+
+        assert first() == "ok"
+        tracing.shutdown_tracing()
+
+        assert trace_file.closed
+        assert tracing.get_tracer() is None
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert sorted(json.loads(line)["name"] for line in lines) == ["first", "second"]
+
+    def test_traced_records_nested_spans(self, memory_tracing):
+        """Тест назв спанів та вкладеності (sync і async)"""
+        import asyncio
+
+        @memory_tracing.traced("outer")
+        def outer():
+            return asyncio.run(inner())
+
+        @memory_tracing.traced()
+        async def inner():
+            return "ok"
+
+        assert outer() == "ok"
+
+        outer_span, = [span for span in memory_tracing.get_finished_spans() if span.name == "outer"]
+        inner_span, = [span for span in memory_tracing.get_finished_spans() if span.name.endswith("<locals>.inner")]
+        assert inner_span.parent.span_id == outer_span.context.span_id
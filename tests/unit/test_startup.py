@@ -0,0 +1,42 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Пакети, які не повинні завантажуватись при старті процесу API
+LAZY_MODULES = ("fastapi_mail", "cloudinary", "redis")
+
+# Бюджет імпорту app.main (секунди); на повільних машинах CI можна підняти
+IMPORT_BUDGET_SECONDS = float(os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", "2.0"))
+
+
+def import_app_main():
+    """Імпортує app.main у чистому процесі з -X importtime (без покриття pytest-cov)"""
+    env = {key: value for key, value in os.environ.items() if not key.startswith("COV_CORE")}
+    env.setdefault("MAIL_FROM", "noreply@example.com")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys, app.main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, env=env, check=True
+    )
+    cumulative = re.search(r"\|\s*(\d+) \| app\.main$", result.stderr, re.MULTILINE)
+    return int(cumulative.group(1)) / 1e6, result.stdout.strip()
+
+
+@pytest.mark.unit
+class TestStartupBudget:
+    """Регресії часу старту процесу API"""
+
+    def test_import_within_budget_and_lazy_services(self):
+        """Тест що app.main імпортується в межах бюджету без рідко потрібних пакетів"""
+        seconds, loaded = import_app_main()
+
+        assert loaded == "[]", f"Imported at startup: {loaded}"
+        assert seconds < IMPORT_BUDGET_SECONDS, (
+            f"app.main import took {seconds:.2f}s, budget {IMPORT_BUDGET_SECONDS}s"
+        )